@@ -0,0 +1,287 @@
+"""
+FUNÇÕES EM LOTE (VETORIZADAS)
+
+As funções calculo_imc (prog02.py) e calculo_hora_extra (prog03.py) recebem um valor por vez. Para arquivos com
+milhões de funcionários, chamar a função para cada linha é lento, pois cada chamada passa pelo interpretador.
+
+Aqui temos versões em lote, que recebem sequências (listas, tuplas, array) ou arrays do NumPy e retornam um array
+com todos os resultados:
+
+- se o NumPy estiver instalado, o cálculo é feito de uma vez sobre o array inteiro;
+- sem o NumPy, o resultado é um array('d') da biblioteca padrão.
+
+Os resultados são idênticos bit a bit aos das funções originais: as duas versões fazem as mesmas operações de
+ponto flutuante (IEEE 754 de 64 bits), na mesma ordem. As versões em lote sempre retornam float, enquanto
+calculo_hora_extra retorna int quando as duas entradas são inteiras (ex: calculo_hora_extra(56, 3) == 168): o
+benchmark converte o resultado escalar para float antes de comparar.
+
+Também temos um comando que lê um CSV em blocos, aplica o cálculo e grava um novo CSV com a coluna do resultado:
+    python calculos_em_lote.py imc funcionarios.csv saida.csv --colunas altura peso
+    python calculos_em_lote.py hora_extra folha.csv saida.csv --colunas valor_hora qtde_horas_extras
+
+E um benchmark comparando a versão escalar com a versão em lote:
+    python calculos_em_lote.py --benchmark 1000000
+"""
+
+import argparse
+import csv
+import operator
+import random
+import sys
+import time
+
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from prog02 import calculo_imc
+from prog03 import calculo_hora_extra
+
+try:
+    import numpy as np
+except ImportError:  # O NumPy é opcional.
+    np = None
+
+TAMANHO_BLOCO = 50000
+
+
+def _como_array(valores: Sequence[float], usar_numpy: bool):
+    if usar_numpy:
+        if np is None:
+            raise ImportError("O NumPy não está instalado.")
+        return np.asarray(valores, dtype=np.float64)
+    # Sem o NumPy, listas, tuplas e arrays são percorridos diretamente (sem uma cópia intermediária).
+    return valores if isinstance(valores, (list, tuple, array)) else list(valores)
+
+
+def calculo_imc_lote(alturas: Sequence[float], pesos: Sequence[float], usar_numpy: Optional[bool] = None):
+    """
+    Versão em lote de calculo_imc: peso / (altura * altura) para cada par.
+
+    Args:
+        alturas (Sequence[float]): Alturas, em metros.
+        pesos (Sequence[float]): Pesos, em quilos (mesma quantidade de alturas).
+        usar_numpy (Optional[bool]): Força (True) ou desliga (False) o NumPy. Por padrão, usa se estiver instalado.
+
+    Returns:
+        numpy.ndarray | array: Os IMCs, na mesma ordem.
+
+    Raises:
+        ValueError: Se as sequências tiverem tamanhos diferentes.
+        ZeroDivisionError: Se alguma altura for zero (mesmo comportamento de calculo_imc).
+    """
+    usar_numpy = np is not None if usar_numpy is None else usar_numpy
+    alturas = _como_array(alturas, usar_numpy)
+    pesos = _como_array(pesos, usar_numpy)
+    if len(alturas) != len(pesos):
+        raise ValueError(f"Quantidades diferentes de alturas ({len(alturas)}) e pesos ({len(pesos)}).")
+
+    if usar_numpy:
+        quadrados = alturas * alturas
+        if not quadrados.all():
+            raise ZeroDivisionError(f"Altura zero na posição {int(np.flatnonzero(quadrados == 0)[0])}.")
+        return pesos / quadrados
+
+    # map com as funções do módulo operator evita executar bytecode Python para cada elemento.
+    return array("d", map(operator.truediv, pesos, map(operator.mul, alturas, alturas)))
+
+
+def calculo_hora_extra_lote(
+        valores_hora: Sequence[float],
+        qtdes_horas_extras: Optional[Sequence[float]] = None,
+        usar_numpy: Optional[bool] = None
+    ):
+    """
+    Versão em lote de calculo_hora_extra: valor_hora * qtde_horas_extras para cada par.
+
+    Args:
+        valores_hora (Sequence[float]): Valores da hora.
+        qtdes_horas_extras (Optional[Sequence[float]]): Quantidades de horas extras. Se None, todas são 0 (mesmo
+                                                        padrão de calculo_hora_extra).
+        usar_numpy (Optional[bool]): Força (True) ou desliga (False) o NumPy. Por padrão, usa se estiver instalado.
+
+    Returns:
+        numpy.ndarray | array: Os valores das horas extras, na mesma ordem.
+
+    Raises:
+        ValueError: Se as sequências tiverem tamanhos diferentes.
+    """
+    usar_numpy = np is not None if usar_numpy is None else usar_numpy
+    valores_hora = _como_array(valores_hora, usar_numpy)
+    if qtdes_horas_extras is None:
+        qtdes_horas_extras = np.zeros(len(valores_hora)) if usar_numpy else array("d", bytes(8 * len(valores_hora)))
+    else:
+        qtdes_horas_extras = _como_array(qtdes_horas_extras, usar_numpy)
+
+    if len(valores_hora) != len(qtdes_horas_extras):
+        raise ValueError(
+            f"Quantidades diferentes de valores ({len(valores_hora)}) e horas extras ({len(qtdes_horas_extras)})."
+        )
+
+    if usar_numpy:
+        return valores_hora * qtdes_horas_extras
+    return array("d", map(operator.mul, valores_hora, qtdes_horas_extras))
+
+
+# Para cada cálculo: (função em lote, função escalar, nomes padrão das colunas de entrada, coluna de saída,
+# valores padrão das colunas de entrada quando a célula estiver vazia).
+CALCULOS: Dict[str, Tuple[Callable, Callable, Tuple[str, str], str, Tuple[Optional[float], Optional[float]]]] = {
+    "imc": (calculo_imc_lote, calculo_imc, ("altura", "peso"), "imc", (None, None)),
+    "hora_extra": (
+        calculo_hora_extra_lote, calculo_hora_extra, ("valor_hora", "qtde_horas_extras"), "valor_hora_extra",
+        (None, 0.0)
+    ),
+}
+
+
+def _converter(texto: str, padrao: Optional[float], numero_linha: int, coluna: str) -> float:
+    texto = texto.strip()
+    if not texto and padrao is not None:
+        return padrao
+    try:
+        return float(texto.replace(",", "."))
+    except ValueError:
+        raise ValueError(f"Linha {numero_linha}: valor inválido na coluna '{coluna}': {texto!r}") from None
+
+
+def processar_csv(
+        calculo: str,
+        entrada: str,
+        saida: str,
+        colunas: Optional[Sequence[str]] = None,
+        coluna_saida: Optional[str] = None,
+        delimitador: str = ";",
+        tamanho_bloco: int = TAMANHO_BLOCO,
+        usar_numpy: Optional[bool] = None
+    ) -> int:
+    """
+    Lê o CSV de entrada em blocos, aplica o cálculo em lote e grava as linhas com uma coluna a mais.
+
+    Apenas um bloco fica na memória por vez, então arquivos de qualquer tamanho podem ser processados.
+    Os resultados são gravados com repr(float), que preserva o valor exato (bit a bit) ao ler o arquivo de volta.
+
+    Args:
+        calculo (str): "imc" ou "hora_extra".
+        entrada (str): Caminho do CSV de entrada (com cabeçalho).
+        saida (str): Caminho do CSV de saída.
+        colunas (Optional[Sequence[str]]): Nomes das duas colunas de entrada (padrão: os nomes dos parâmetros).
+        coluna_saida (Optional[str]): Nome da coluna do resultado.
+        delimitador (str): Delimitador dos dois arquivos.
+        tamanho_bloco (int): Quantidade de linhas calculadas por vez.
+        usar_numpy (Optional[bool]): Veja calculo_imc_lote.
+
+    Returns:
+        int: Quantidade de linhas processadas.
+
+    Raises:
+        ValueError: Se o cálculo não existir, se alguma coluna não for encontrada ou se algum valor for inválido.
+    """
+    if calculo not in CALCULOS:
+        raise ValueError(f"Cálculo desconhecido: {calculo} (opções: {', '.join(CALCULOS)})")
+    funcao_lote, _, colunas_padrao, coluna_saida_padrao, padroes = CALCULOS[calculo]
+    colunas = tuple(colunas or colunas_padrao)
+    coluna_saida = coluna_saida or coluna_saida_padrao
+
+    total = 0
+    with open(entrada, newline="", encoding="utf-8") as f_entrada, \
+            open(saida, "w", newline="", encoding="utf-8") as f_saida:
+        reader = csv.reader(f_entrada, delimiter=delimitador)
+        writer = csv.writer(f_saida, delimiter=delimitador)
+
+        cabecalho = next(reader, None)
+        if cabecalho is None:
+            raise ValueError(f"Arquivo vazio: {entrada}")
+        nomes = [nome.strip().lower() for nome in cabecalho]
+        try:
+            indices = [nomes.index(coluna.lower()) for coluna in colunas]
+        except ValueError:
+            raise ValueError(f"O CSV deve conter as colunas: {', '.join(colunas)}") from None
+        writer.writerow(cabecalho + [coluna_saida])
+
+        numero_linha = 1
+        while True:
+            linhas: List[List[str]] = []
+            valores: Tuple[List[float], List[float]] = ([], [])
+            for linha in reader:
+                numero_linha += 1
+                if not linha:
+                    continue
+                for lista, indice, coluna, padrao in zip(valores, indices, colunas, padroes):
+                    texto = linha[indice] if indice < len(linha) else ""
+                    lista.append(_converter(texto, padrao, numero_linha, coluna))
+                linhas.append(linha)
+                if len(linhas) >= tamanho_bloco:
+                    break
+
+            if not linhas:
+                break
+
+            resultados = funcao_lote(*valores, usar_numpy=usar_numpy)
+            resultados = resultados.tolist()
+            writer.writerows(linha + [repr(resultado)] for linha, resultado in zip(linhas, resultados))
+            total += len(linhas)
+
+    return total
+
+
+def benchmark(quantidade: int, semente: int = 42) -> None:
+    """Compara o tempo das versões escalar e em lote e verifica se os resultados são idênticos."""
+    rng = random.Random(semente)
+    alturas = [round(rng.uniform(1.4, 2.1), 2) for _ in range(quantidade)]
+    pesos = [round(rng.uniform(40, 150), 1) for _ in range(quantidade)]
+    horas = [rng.randint(0, 40) for _ in range(quantidade)]
+
+    entradas = {"imc": (alturas, pesos), "hora_extra": (pesos, horas)}
+    modos = [("array", False)] + ([("numpy", True)] if np is not None else [])
+
+    for nome, (funcao_lote, funcao_escalar, *_) in CALCULOS.items():
+        a, b = entradas[nome]
+
+        inicio = time.perf_counter()
+        esperado = [funcao_escalar(x, y) for x, y in zip(a, b)]
+        tempo_escalar = time.perf_counter() - inicio
+        print(f"{nome.ljust(10)} escalar {tempo_escalar:8.3f}s")
+
+        for modo, usar_numpy in modos:
+            # A conversão da lista para array faz parte do custo da versão em lote.
+            inicio = time.perf_counter()
+            resultado = funcao_lote(a, b, usar_numpy=usar_numpy)
+            tempo = time.perf_counter() - inicio
+            # float() explícito: o resultado escalar de int * int é int (o lote retorna float).
+            identico = array("d", map(float, esperado)).tobytes() == array("d", resultado).tobytes()
+            print(f"{nome.ljust(10)} {modo.ljust(7)} {tempo:8.3f}s  {tempo_escalar / tempo:6.1f}x  "
+                  f"idêntico: {'sim' if identico else 'NÃO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cálculo de IMC e hora extra em lote")
+    parser.add_argument("calculo", nargs="?", choices=list(CALCULOS))
+    parser.add_argument("entrada", nargs="?", help="CSV de entrada")
+    parser.add_argument("saida", nargs="?", help="CSV de saída")
+    parser.add_argument("--colunas", nargs=2, metavar=("COLUNA1", "COLUNA2"), help="Colunas de entrada")
+    parser.add_argument("--coluna-saida", help="Nome da coluna do resultado")
+    parser.add_argument("--delimitador", default=";")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--sem-numpy", action="store_true", help="Não utiliza o NumPy, mesmo se instalado")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Compara as versões com N valores aleatórios")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    if not (args.calculo and args.entrada and args.saida):
+        parser.error("informe o cálculo, o arquivo de entrada e o arquivo de saída (ou --benchmark N)")
+
+    try:
+        total = processar_csv(
+            args.calculo, args.entrada, args.saida, args.colunas, args.coluna_saida, args.delimitador,
+            args.tamanho_bloco, False if args.sem_numpy else None
+        )
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{total} linha(s) processada(s) -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Entrada e Saída(I/O) de arquivos em Python.
+
+Exportação de tabelas do banco de dados para arquivos .csv
+
+No prog04.py escrevemos arquivos CSV a partir de listas que estão na memória. Aqui fazemos o caminho inverso: lemos
+uma tabela do db.sqlite3 (tb_cursos, tb_notas, tb_estatisticas_*, etc) ou o resultado de uma consulta qualquer e
+escrevemos em um arquivo CSV.
+
+Para que o consumo de memória seja constante, independente do tamanho da tabela, os registros são lidos com
+fetchmany() em blocos e cada bloco é escrito com writerows(). Opcionalmente o arquivo pode ser compactado com gzip,
+também em modo streaming.
+
+Exemplos de uso:
+    python exporta_tabela.py --tabela tb_cursos saida/cursos.csv
+    python exporta_tabela.py --tabela tb_notas saida/notas.csv.gz --gzip
+    python exporta_tabela.py --consulta "SELECT nome, nota1 FROM tb_notas WHERE nota1 > ?" --parametro 5 saida/n1.csv
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sqlite3
+
+from typing import Optional, Sequence
+
+# Quantidade de registros lidos do banco a cada chamada de fetchmany().
+TAMANHO_BLOCO = 10000
+
+
+def lista_tabelas(connection: sqlite3.Connection) -> list:
+    """Retorna os nomes das tabelas existentes no banco de dados."""
+    cursor = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")
+    return [nome for (nome,) in cursor.fetchall()]
+
+
+def consulta_da_tabela(connection: sqlite3.Connection, tabela: str) -> str:
+    """
+    Monta o comando SELECT para exportar uma tabela inteira.
+
+    Como o nome de uma tabela não pode ser passado através de placeholders (?), verificamos se a tabela realmente
+    existe no banco antes de montar o comando, o que também evita SQL injection.
+
+    Raises:
+        ValueError: Se a tabela não existir no banco de dados.
+    """
+    if tabela not in lista_tabelas(connection):
+        raise ValueError(f"Tabela '{tabela}' não encontrada no banco de dados.")
+
+    return f'SELECT * FROM "{tabela}"'
+
+
+def exporta_consulta(
+        connection: sqlite3.Connection,
+        consulta: str,
+        caminho_arquivo: str,
+        parametros: Sequence = (),
+        compactar: bool = False,
+        tamanho_bloco: int = TAMANHO_BLOCO
+    ) -> int:
+    """
+    Executa a consulta e escreve o resultado em um arquivo CSV, bloco a bloco.
+
+    Args:
+        connection (sqlite3.Connection): Conexão com o banco de dados.
+        consulta (str): Comando SELECT que será exportado.
+        caminho_arquivo (str): Caminho do arquivo CSV que será gerado.
+        parametros (Sequence): Valores para os placeholders (?) da consulta.
+        compactar (bool): Se True, o arquivo é compactado com gzip enquanto é escrito.
+        tamanho_bloco (int): Quantidade de registros lidos a cada fetchmany().
+
+    Returns:
+        int: A quantidade de registros exportados.
+    """
+    cursor = connection.cursor()
+    cursor.execute(consulta, tuple(parametros))
+
+    # cursor.description possui uma tupla para cada coluna do resultado, onde o primeiro item é o nome da coluna.
+    colunas = [descricao[0] for descricao in cursor.description]
+
+    # gzip.open em modo texto ('wt') compacta os dados à medida que são escritos, sem precisar manter o arquivo
+    # inteiro na memória.
+    if compactar:
+        arquivo = gzip.open(caminho_arquivo, 'wt', encoding="utf-8", newline="")
+    else:
+        arquivo = open(caminho_arquivo, 'w', encoding="utf-8", newline="")
+
+    quantidade = 0
+    with arquivo:
+        arquivo_csv = csv.writer(arquivo, delimiter=';')
+        arquivo_csv.writerow(colunas)
+
+        while True:
+            registros = cursor.fetchmany(tamanho_bloco)
+            if not registros:
+                break
+
+            arquivo_csv.writerows(registros)
+            quantidade += len(registros)
+
+    cursor.close()
+    return quantidade
+
+
+def exporta_tabela(
+        connection: sqlite3.Connection,
+        tabela: str,
+        caminho_arquivo: str,
+        compactar: bool = False,
+        tamanho_bloco: int = TAMANHO_BLOCO
+    ) -> int:
+    """Exporta todos os registros de uma tabela para um arquivo CSV. Veja exporta_consulta()."""
+    return exporta_consulta(
+        connection,
+        consulta_da_tabela(connection, tabela),
+        caminho_arquivo,
+        compactar=compactar,
+        tamanho_bloco=tamanho_bloco
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Exporta uma tabela ou consulta do db.sqlite3 para CSV")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--tabela", help="Nome da tabela que será exportada")
+    origem.add_argument("--consulta", help="Comando SELECT que será exportado")
+    parser.add_argument("arquivo", help="Caminho do arquivo CSV de saída")
+    parser.add_argument("--parametro", action="append", default=[], help="Valor para um placeholder (?) da consulta")
+    parser.add_argument("--banco", default=os.path.join(os.getcwd(), "db.sqlite3"), help="Caminho do banco de dados")
+    parser.add_argument("--gzip", action="store_true", help="Compacta o arquivo de saída com gzip")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="Registros lidos a cada fetchmany()")
+    args = parser.parse_args(argv)
+
+    pasta_saida = os.path.dirname(os.path.abspath(args.arquivo))
+    if not os.path.exists(pasta_saida):
+        os.makedirs(pasta_saida)
+
+    connection = sqlite3.connect(args.banco)
+    try:
+        if args.tabela:
+            quantidade = exporta_tabela(connection, args.tabela, args.arquivo, args.gzip, args.bloco)
+        else:
+            quantidade = exporta_consulta(
+                connection, args.consulta, args.arquivo, args.parametro, args.gzip, args.bloco
+            )
+    finally:
+        connection.close()
+
+    print(f"{quantidade} registros exportados para {args.arquivo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Entrada e Saída(I/O) de arquivos em Python.
+
+Relatório de usuários (usuarios.csv) com escrita em lote
+
+A função formata_saida do prog03.py faz quatro chamadas de print() por usuário e recebe todas as colunas do arquivo,
+inclusive a senha, através do desempacotamento **linha. Para arquivos com milhões de usuários, o custo das chamadas de
+sistema e da criação dos dicionários passa a dominar o tempo de execução.
+
+Aqui lemos apenas as colunas que aparecem no relatório (projeção) e acumulamos o texto formatado em um buffer grande,
+que é escrito na saída em blocos. O formato "texto" gera exatamente a mesma saída do prog03.py e o formato "tsv" gera
+uma linha por usuário, com os campos separados por tabulação.
+
+Exemplo de uso:
+    python relatorio_usuarios.py arquivos/usuarios.csv --formato tsv > usuarios.tsv
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+from operator import itemgetter
+from typing import Iterable, Iterator, List, TextIO
+
+# Colunas que são realmente utilizadas no relatório. As demais (password, gender, id, username) nunca são lidas.
+COLUNAS_RELATORIO = ("first_name", "last_name", "birth_date", "email")
+
+# Os rótulos são calculados apenas uma vez, ao invés de chamar ljust() a cada usuário.
+ROTULO_NOME = f"{'Nome'.ljust(21)} "
+ROTULO_NASCIMENTO = f"{'Data de Nascimento'.ljust(21)} "
+ROTULO_EMAIL = f"{'Email'.ljust(21)} "
+SEPARADOR = '-' * 50
+
+# Quantidade aproximada de caracteres acumulados antes de cada escrita na saída.
+TAMANHO_BUFFER = 1024 * 1024
+
+
+def ler_colunas_projetadas(arquivo: TextIO, colunas: Iterable[str] = COLUNAS_RELATORIO) -> Iterator[tuple]:
+    """
+    Lê o CSV com csv.reader e retorna apenas as colunas informadas, na ordem informada.
+
+    Args:
+        arquivo (TextIO): Arquivo CSV já aberto, com cabeçalho na primeira linha.
+        colunas (Iterable[str]): Nomes das colunas que devem ser retornadas.
+
+    Returns:
+        Iterator[tuple]: Uma tupla por linha do CSV, contendo apenas as colunas projetadas.
+
+    Raises:
+        ValueError: Se alguma das colunas não existir no cabeçalho do arquivo.
+    """
+    arquivo_csv = csv.reader(arquivo, delimiter=';')
+
+    cabecalho = next(arquivo_csv, None)
+    if cabecalho is None:
+        return
+
+    colunas = tuple(colunas)
+    faltando = [coluna for coluna in colunas if coluna not in cabecalho]
+    if faltando:
+        raise ValueError(f"O CSV deve conter as colunas: {faltando}")
+
+    # itemgetter com vários índices retorna uma tupla, sem precisar montar um dicionário para cada linha.
+    projecao = itemgetter(*(cabecalho.index(coluna) for coluna in colunas))
+
+    for linha in arquivo_csv:
+        yield projecao(linha)
+
+
+def formata_texto(first_name: str, last_name: str, birth_date: str, email: str) -> str:
+    """Formata um usuário no mesmo layout da função formata_saida do prog03.py."""
+    return (
+        f"{ROTULO_NOME}{first_name} {last_name}\n"
+        f"{ROTULO_NASCIMENTO}{birth_date}\n"
+        f"{ROTULO_EMAIL}{email}\n"
+        f"{SEPARADOR}\n"
+    )
+
+
+def formata_tsv(first_name: str, last_name: str, birth_date: str, email: str) -> str:
+    """Formata um usuário como uma linha TSV."""
+    return f"{first_name}\t{last_name}\t{birth_date}\t{email}\n"
+
+
+FORMATOS = {
+    "texto": formata_texto,
+    "tsv": formata_tsv,
+}
+
+
+def renderiza_relatorio(
+        registros: Iterable[tuple],
+        saida: TextIO,
+        formato: str = "texto",
+        tamanho_buffer: int = TAMANHO_BUFFER
+    ) -> int:
+    """
+    Formata os registros e escreve o resultado na saída em blocos de aproximadamente tamanho_buffer caracteres.
+
+    Args:
+        registros (Iterable[tuple]): Tuplas (first_name, last_name, birth_date, email).
+        saida (TextIO): Arquivo ou stream onde o relatório será escrito.
+        formato (str): "texto" (mesmo formato do prog03.py) ou "tsv".
+        tamanho_buffer (int): Quantidade de caracteres acumulados antes de cada escrita.
+
+    Returns:
+        int: A quantidade de usuários escritos.
+
+    Raises:
+        ValueError: Se o formato informado não existir.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' desconhecido. Utilize um dos formatos: {list(FORMATOS)}")
+
+    formatar = FORMATOS[formato]
+
+    if formato == "tsv":
+        saida.write("\t".join(COLUNAS_RELATORIO) + "\n")
+
+    buffer: List[str] = []
+    tamanho_atual = 0
+    quantidade = 0
+
+    for registro in registros:
+        texto = formatar(*registro)
+        buffer.append(texto)
+        tamanho_atual += len(texto)
+        quantidade += 1
+
+        # Apenas uma chamada de write() para cada bloco, ao invés de quatro print() por usuário.
+        if tamanho_atual >= tamanho_buffer:
+            saida.write("".join(buffer))
+            buffer.clear()
+            tamanho_atual = 0
+
+    if buffer:
+        saida.write("".join(buffer))
+
+    saida.flush()
+    return quantidade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório de usuários a partir do arquivo usuarios.csv")
+    parser.add_argument(
+        "arquivo",
+        nargs="?",
+        default=os.path.join(os.getcwd(), "arquivos", "usuarios.csv"),
+        help="Caminho do arquivo CSV de usuários (padrão: arquivos/usuarios.csv)"
+    )
+    parser.add_argument("--formato", choices=tuple(FORMATOS), default="texto")
+    parser.add_argument("--buffer", type=int, default=TAMANHO_BUFFER, help="Tamanho do buffer de saída em caracteres")
+    args = parser.parse_args()
+
+    with open(args.arquivo, mode='r', encoding="utf-8", newline="") as arquivo:
+        renderiza_relatorio(ler_colunas_projetadas(arquivo), sys.stdout, args.formato, args.buffer)
+
+
+if __name__ == "__main__":
+    main()
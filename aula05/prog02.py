@@ -2,13 +2,29 @@ import pymysql
 import pymysql.cursors
 import requests
 import os
+import importlib.util
 
 from dotenv import load_dotenv
+from pathlib import Path
 
 load_dotenv()
 
+# instrumentacao.py fica na pasta exercicios (tempo das etapas e contadores, variável PROWAY_INSTRUMENTACAO).
+# A pasta não é um pacote: o módulo é carregado pelo caminho do arquivo.
+CAMINHO_INSTRUMENTACAO = Path(__file__).resolve().parent.parent / "exercicios" / "instrumentacao.py"
+
+
+def carregar_instrumentacao():
+    spec = importlib.util.spec_from_file_location("instrumentacao", CAMINHO_INSTRUMENTACAO)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
 if __name__ == "__main__":
 
+    execucao = carregar_instrumentacao().iniciar_execucao("aula05_prog02")
+
     connection = pymysql.connect(
         user=os.getenv("DATABASE_USER"),
         password=os.getenv("DATABASE_PASSWORD"),
@@ -37,9 +53,11 @@ if __name__ == "__main__":
     url = "https://api.coinlore.net/api"
 
     crypto_id = input("Informe o código da moeda: ")
-    response = requests.get(
-        f"{url}/ticker?id={crypto_id}"
-    )
+    with execucao.etapa("download_http"):
+        response = requests.get(
+            f"{url}/ticker?id={crypto_id}"
+        )
+    execucao.contar("bytes_baixados", len(response.content))
 
     ticker_info = response.json()[0]
 
@@ -48,16 +66,19 @@ if __name__ == "__main__":
         VALUES
         (%s, %s, %s, %s)"""
     
-    cursor.execute(
-        command,
-        (
-            ticker_info.get("symbol"),
-            ticker_info.get("name"),
-            ticker_info.get("price_usd"),
-            ticker_info.get("market_cap_usd"),
+    with execucao.etapa("gravacao_banco"):
+        cursor.execute(
+            command,
+            (
+                ticker_info.get("symbol"),
+                ticker_info.get("name"),
+                ticker_info.get("price_usd"),
+                ticker_info.get("market_cap_usd"),
+            )
         )
-    )
 
-    connection.commit()
+        connection.commit()
+
+    execucao.finalizar()
 
     print(ticker_info)
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+Relacionamento entre tabelas - camada de acesso a dados do blog
+
+O arquivo relacionamentos.sql define as tabelas usuarios, perfis, postagens, categorias e a tabela associativa
+postagens_categorias. Aqui temos o mesmo esquema no SQLite e as funções para carregar as postagens junto com
+o perfil do autor e as categorias.
+
+O problema N+1: se buscarmos as postagens com uma consulta e depois, para cada postagem, buscarmos as suas
+categorias com outra consulta, para exibir 50 postagens executamos 51 consultas. Aqui as postagens são
+carregadas com um número fixo de consultas:
+
+1. uma consulta com INNER JOIN entre postagens e usuarios e LEFT JOIN com perfis (1:1);
+2. uma consulta com as categorias de TODAS as postagens carregadas, utilizando WHERE postagem_id IN (...).
+
+Além disso, a SessaoBlog mantém um "mapa de identidade" (identity map): dentro de uma mesma sessão
+(normalmente uma requisição), cada usuário, categoria e postagem é representado por um único objeto, mesmo
+que apareça em várias postagens, e não é carregado de novo.
+
+Exemplo de uso:
+    python blog_dados.py
+"""
+
+import sqlite3
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# O SQLite aceita no máximo 999 parâmetros (?) por comando em versões antigas, então os IN (...) são
+# divididos em lotes.
+LIMITE_PARAMETROS = 900
+
+# Esquema do relacionamentos.sql adaptado para o SQLite:
+# - INT PRIMARY KEY AUTO_INCREMENT vira INTEGER PRIMARY KEY (que já gera o id automaticamente);
+# - DATETIME DEFAULT CURRENT_TIMESTAMP() vira TEXT DEFAULT CURRENT_TIMESTAMP ('AAAA-MM-DD HH:MM:SS');
+# - criamos índices nas chaves estrangeiras, que o MySQL cria automaticamente e o SQLite não.
+SCHEMA_BLOG = """
+CREATE TABLE IF NOT EXISTS usuarios(
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    senha TEXT NOT NULL,
+    criado_em TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS perfis(
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    data_de_nascimento DATE NULL,
+    genero TEXT NULL,
+    FOREIGN KEY(id) REFERENCES usuarios(id)
+);
+
+CREATE TABLE IF NOT EXISTS postagens(
+    id INTEGER PRIMARY KEY,
+    usuario_id INTEGER NOT NULL,
+    titulo TEXT NOT NULL,
+    texto TEXT NOT NULL,
+    criado_em TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(usuario_id) REFERENCES usuarios(id)
+);
+CREATE INDEX IF NOT EXISTS idx_postagens_usuario_id ON postagens(usuario_id);
+
+CREATE TABLE IF NOT EXISTS categorias(
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS postagens_categorias(
+    postagem_id INTEGER NOT NULL,
+    categoria_id INTEGER NOT NULL,
+    PRIMARY KEY(postagem_id, categoria_id),
+    FOREIGN KEY(postagem_id) REFERENCES postagens(id),
+    FOREIGN KEY(categoria_id) REFERENCES categorias(id)
+);
+CREATE INDEX IF NOT EXISTS idx_postagens_categorias_categoria_id ON postagens_categorias(categoria_id);
+"""
+
+
+@dataclass(eq=False)
+class Perfil:
+    id: int
+    nome: str
+    data_de_nascimento: Optional[str]
+    genero: Optional[str]
+
+
+@dataclass(eq=False)
+class Usuario:
+    # A senha nunca é carregada pela camada de acesso.
+    id: int
+    email: str
+    criado_em: str
+    perfil: Optional[Perfil] = None
+
+
+@dataclass(eq=False)
+class Categoria:
+    id: int
+    nome: str
+
+
+@dataclass(eq=False)
+class Postagem:
+    id: int
+    titulo: str
+    texto: str
+    criado_em: str
+    autor: Usuario
+    categorias: List[Categoria] = field(default_factory=list)
+
+
+def conectar(caminho: str = ":memory:") -> sqlite3.Connection:
+    """Abre a conexão com o banco e liga a verificação de chaves estrangeiras (desligada por padrão no SQLite)."""
+    connection = sqlite3.connect(caminho)
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
+
+def criar_schema(connection: sqlite3.Connection) -> None:
+    """Cria as tabelas do blog, caso ainda não existam."""
+    connection.executescript(SCHEMA_BLOG)
+
+
+def popular_exemplo(connection: sqlite3.Connection) -> None:
+    """Insere os mesmos dados de exemplo do relacionamentos.sql."""
+    cursor = connection.cursor()
+    cursor.executemany(
+        "INSERT INTO usuarios(email, senha) VALUES (?, ?)",
+        [
+            ("joao.silva@email.com", "joao123"),
+            ("maria.batista@email.com", "maria123"),
+            ("barbara.barreto@email.com", "barbara123"),
+        ]
+    )
+    cursor.executemany(
+        "INSERT INTO perfis(id, nome, data_de_nascimento, genero) VALUES (?, ?, ?, ?)",
+        [
+            (1, "João da Silva", "1980-11-17", "Masculino"),
+            (2, "Maria Batista", None, "Feminino"),
+        ]
+    )
+    cursor.executemany(
+        "INSERT INTO postagens(usuario_id, titulo, texto) VALUES (?, ?, ?)",
+        [
+            (1, "A linguagem Python", "Python é especialmente usada em dados."),
+            (1, "A linguagem Assembly", "Assembly é utilizado em baixo nível."),
+            (2, "A linguagem Java", "Java é largamento utilizado."),
+        ]
+    )
+    cursor.executemany(
+        "INSERT INTO categorias(nome) VALUES (?)",
+        [("python",), ("programacao",), ("sql",), ("proway",), ("linux",)]
+    )
+    cursor.executemany(
+        "INSERT INTO postagens_categorias(postagem_id, categoria_id) VALUES (?, ?)",
+        [(1, 1), (1, 2)]
+    )
+    connection.commit()
+
+
+def _em_lotes(valores: Sequence, tamanho: int = LIMITE_PARAMETROS) -> Iterable[Sequence]:
+    for i in range(0, len(valores), tamanho):
+        yield valores[i:i + tamanho]
+
+
+class SessaoBlog:
+    """
+    Sessão de acesso aos dados do blog. Deve ser criada para cada requisição, pois o mapa de identidade
+    guarda os objetos já carregados enquanto a sessão existir.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.usuarios: Dict[int, Usuario] = {}
+        self.categorias: Dict[int, Categoria] = {}
+        self.postagens: Dict[int, Postagem] = {}
+        # Quantidade de consultas executadas pela sessão (útil para verificar que não há N+1).
+        self.qtd_consultas = 0
+
+    def executar(self, comando: str, parametros: Sequence = ()) -> List[tuple]:
+        self.qtd_consultas += 1
+        return self.connection.execute(comando, tuple(parametros)).fetchall()
+
+    def _usuario(self, id: int, email: str, criado_em: str, perfil_id, nome, data_de_nascimento, genero) -> Usuario:
+        usuario = self.usuarios.get(id)
+        if usuario is None:
+            perfil = Perfil(perfil_id, nome, data_de_nascimento, genero) if perfil_id is not None else None
+            usuario = self.usuarios[id] = Usuario(id, email, criado_em, perfil)
+        return usuario
+
+    def _categoria(self, id: int, nome: str) -> Categoria:
+        categoria = self.categorias.get(id)
+        if categoria is None:
+            categoria = self.categorias[id] = Categoria(id, nome)
+        return categoria
+
+    def carregar_postagens(self, ids: Sequence[int]) -> List[Postagem]:
+        """
+        Carrega as postagens com o autor (e o seu perfil) e as categorias.
+
+        São executadas 2 consultas para cada lote de até LIMITE_PARAMETROS postagens ainda não carregadas
+        na sessão, independente de quantas categorias ou autores diferentes existam.
+
+        Args:
+            ids (Sequence[int]): Ids das postagens.
+
+        Returns:
+            List[Postagem]: As postagens encontradas, na mesma ordem dos ids informados.
+        """
+        novos = [id for id in dict.fromkeys(ids) if id not in self.postagens]
+
+        for lote in _em_lotes(novos):
+            marcadores = ", ".join("?" * len(lote))
+
+            # 1) Postagens + autor (1:N) + perfil do autor (1:1, pode não existir, por isso LEFT JOIN).
+            registros = self.executar(f"""
+                SELECT p.id, p.titulo, p.texto, p.criado_em,
+                       u.id, u.email, u.criado_em,
+                       pf.id, pf.nome, pf.data_de_nascimento, pf.genero
+                FROM postagens p
+                INNER JOIN usuarios u ON u.id = p.usuario_id
+                LEFT JOIN perfis pf ON pf.id = u.id
+                WHERE p.id IN ({marcadores})
+            """, lote)
+
+            for id, titulo, texto, criado_em, *dados_usuario in registros:
+                self.postagens[id] = Postagem(id, titulo, texto, criado_em, self._usuario(*dados_usuario))
+
+            # 2) Categorias de todas as postagens do lote (N:N, através da tabela associativa).
+            registros = self.executar(f"""
+                SELECT pc.postagem_id, c.id, c.nome
+                FROM postagens_categorias pc
+                INNER JOIN categorias c ON c.id = pc.categoria_id
+                WHERE pc.postagem_id IN ({marcadores})
+                ORDER BY pc.postagem_id, c.nome
+            """, lote)
+
+            for postagem_id, categoria_id, nome in registros:
+                self.postagens[postagem_id].categorias.append(self._categoria(categoria_id, nome))
+
+        return [self.postagens[id] for id in ids if id in self.postagens]
+
+    def feed(self, limite: int = 20, usuario_id: Optional[int] = None) -> List[Postagem]:
+        """
+        Retorna as postagens mais recentes (opcionalmente de um único autor), já com autor e categorias.
+
+        Args:
+            limite (int): Quantidade máxima de postagens.
+            usuario_id (Optional[int]): Se informado, apenas as postagens desse usuário.
+
+        Returns:
+            List[Postagem]: As postagens, da mais recente para a mais antiga.
+        """
+        if usuario_id is None:
+            registros = self.executar(
+                "SELECT id FROM postagens ORDER BY criado_em DESC, id DESC LIMIT ?", (limite,)
+            )
+        else:
+            registros = self.executar(
+                "SELECT id FROM postagens WHERE usuario_id = ? ORDER BY criado_em DESC, id DESC LIMIT ?",
+                (usuario_id, limite)
+            )
+        return self.carregar_postagens([id for (id,) in registros])
+
+
+if __name__ == "__main__":
+
+    connection = conectar()
+    criar_schema(connection)
+    popular_exemplo(connection)
+
+    sessao = SessaoBlog(connection)
+    for postagem in sessao.feed():
+        autor = postagem.autor.perfil.nome if postagem.autor.perfil else postagem.autor.email
+        categorias = ", ".join(categoria.nome for categoria in postagem.categorias) or "-"
+        print(f"{postagem.id}) {postagem.titulo} | autor: {autor} | categorias: {categorias}")
+
+    print(f"Consultas executadas: {sessao.qtd_consultas}")
+
+    connection.close()
@@ -0,0 +1,244 @@
+"""
+Relacionamento entre tabelas - busca textual nas postagens
+
+Buscar um termo com WHERE titulo LIKE '%termo%' OR texto LIKE '%termo%' obriga o banco a ler todas as
+postagens, pois um índice comum não ajuda quando o texto procurado pode estar no meio da coluna.
+
+O SQLite possui a extensão FTS5 (Full-Text Search), que cria um índice invertido: para cada palavra, a lista
+de postagens onde ela aparece. Aqui criamos a tabela virtual postagens_fts com as colunas titulo e texto:
+
+- ela é do tipo "external content" (content='postagens'), ou seja, não duplica o texto das postagens, apenas
+  guarda o índice;
+- triggers em postagens mantêm o índice atualizado a cada INSERT, UPDATE e DELETE;
+- os resultados são ordenados por relevância (bm25), com peso maior para o título, quando a busca encontra
+  até LIMITE_CANDIDATOS postagens; acima disso, pelas mais recentes (veja abaixo);
+- é possível filtrar por categorias (através da tabela postagens_categorias) e destacar os termos
+  encontrados no título e em um trecho do texto.
+
+O bm25 precisa da quantidade de postagens que contém cada termo e é calculado para todas as postagens
+encontradas antes do LIMIT: com 300 mil postagens, um termo presente em quase todas leva 360-650 ms, enquanto um
+termo raro leva ~2 ms. Por isso a busca primeiro lê (pelo índice, sem o bm25) os ids das LIMITE_CANDIDATOS + 1
+postagens mais recentes que atendem à busca:
+
+- se forem até LIMITE_CANDIDATOS, as postagens encontradas são ordenadas por bm25, como antes;
+- se passarem disso (termos comuns), os resultados são as postagens mais recentes, sem o bm25
+  (ResultadoBusca.relevancia fica None) - em um termo presente em quase todas as postagens, a relevância
+  pouco distingue uma postagem da outra.
+
+Latência medida com 300 mil postagens (gerador_blog.py), 20 resultados: termo em até 1000 postagens ~1-4 ms;
+termo comum (165 a 255 mil postagens) ~22-27 ms, ~34 ms com filtro de categoria, em vez de 580-650 ms. O
+restante é a leitura da lista de postagens do termo no índice, que o FTS5 faz por inteiro: abaixo de 10 ms
+para termos comuns seria preciso um índice próprio das postagens recentes.
+
+Para bancos que já possuem postagens antes da criação do índice, utilize o comando de reconstrução:
+    python busca_postagens.py blog.sqlite3 --reconstruir
+
+Exemplos de busca:
+    python busca_postagens.py blog.sqlite3 "linguagem python"
+    python busca_postagens.py blog.sqlite3 "linguagem" --categoria 1 --categoria 2
+"""
+
+import argparse
+import re
+import sqlite3
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from blog_dados import Postagem, SessaoBlog, conectar, criar_schema, popular_exemplo
+
+# remove_diacritics 2: "programação" também é encontrado ao buscar "programacao" (e vice-versa).
+# O ranking padrão (rank) utiliza bm25 com peso 10 para o título e 1 para o texto. Definir o ranking na
+# própria tabela permite que o FTS5 utilize o caminho otimizado de "ORDER BY rank LIMIT n".
+SCHEMA_BUSCA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS postagens_fts USING fts5(
+    titulo,
+    texto,
+    content='postagens',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS postagens_fts_insert AFTER INSERT ON postagens BEGIN
+    INSERT INTO postagens_fts(rowid, titulo, texto) VALUES (new.id, new.titulo, new.texto);
+END;
+
+CREATE TRIGGER IF NOT EXISTS postagens_fts_delete AFTER DELETE ON postagens BEGIN
+    INSERT INTO postagens_fts(postagens_fts, rowid, titulo, texto) VALUES ('delete', old.id, old.titulo, old.texto);
+END;
+
+CREATE TRIGGER IF NOT EXISTS postagens_fts_update AFTER UPDATE OF id, titulo, texto ON postagens BEGIN
+    INSERT INTO postagens_fts(postagens_fts, rowid, titulo, texto) VALUES ('delete', old.id, old.titulo, old.texto);
+    INSERT INTO postagens_fts(rowid, titulo, texto) VALUES (new.id, new.titulo, new.texto);
+END;
+
+INSERT INTO postagens_fts(postagens_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+"""
+
+# Marcadores utilizados para destacar os termos encontrados.
+INICIO_DESTAQUE = "["
+FIM_DESTAQUE = "]"
+RETICENCIAS = "…"
+# Quantidade (aproximada) de palavras do trecho do texto retornado em cada resultado.
+PALAVRAS_TRECHO = 16
+
+LIMITE_PADRAO = 20
+# Acima dessa quantidade de postagens encontradas, os resultados são as mais recentes, e não os de menor bm25.
+LIMITE_CANDIDATOS = 1000
+
+
+@dataclass
+class ResultadoBusca:
+    postagem: Postagem
+    # bm25: quanto MENOR (mais negativo), mais relevante. None quando a busca encontrou mais de LIMITE_CANDIDATOS
+    # postagens e os resultados são as mais recentes.
+    relevancia: Optional[float]
+    titulo_destacado: str
+    trecho: str
+
+
+def criar_busca(connection: sqlite3.Connection) -> None:
+    """Cria a tabela de busca e os triggers. Postagens que já existiam só entram no índice após reconstruir_indice()."""
+    connection.executescript(SCHEMA_BUSCA)
+
+
+def reconstruir_indice(connection: sqlite3.Connection) -> None:
+    """Recria o índice a partir de todas as postagens existentes e compacta a estrutura interna do FTS5."""
+    connection.execute("INSERT INTO postagens_fts(postagens_fts) VALUES ('rebuild')")
+    connection.execute("INSERT INTO postagens_fts(postagens_fts) VALUES ('optimize')")
+    connection.commit()
+
+
+def montar_consulta(texto: str, prefixo: bool = True) -> str:
+    """
+    Converte o texto digitado pelo usuário em uma consulta FTS5 segura.
+
+    Cada palavra é colocada entre aspas (assim caracteres especiais da sintaxe do FTS5 são ignorados) e todas
+    as palavras precisam aparecer na postagem. Com prefixo=True, a última palavra também encontra palavras que
+    começam com ela (ex: "pyth" encontra "python").
+
+    Raises:
+        ValueError: Se o texto não possuir nenhuma palavra.
+    """
+    palavras = re.findall(r"\w+", texto)
+    if not palavras:
+        raise ValueError("Informe ao menos uma palavra para a busca.")
+
+    termos = [f'"{palavra}"' for palavra in palavras]
+    if prefixo:
+        termos[-1] += "*"
+    return " ".join(termos)
+
+
+def buscar(
+        sessao: SessaoBlog,
+        texto: str,
+        categoria_ids: Optional[Sequence[int]] = None,
+        limite: int = LIMITE_PADRAO,
+        consulta_fts: bool = False,
+        limite_candidatos: int = LIMITE_CANDIDATOS
+    ) -> List[ResultadoBusca]:
+    """
+    Busca postagens pelo título e pelo texto (veja no início do módulo como os resultados são ordenados).
+
+    Args:
+        sessao (SessaoBlog): Sessão utilizada para carregar as postagens encontradas.
+        texto (str): Texto da busca.
+        categoria_ids (Optional[Sequence[int]]): Se informado, apenas postagens de alguma dessas categorias.
+        limite (int): Quantidade máxima de resultados.
+        consulta_fts (bool): Se True, o texto é utilizado diretamente como consulta FTS5 (ex: 'python OR java').
+        limite_candidatos (int): Acima dessa quantidade de postagens encontradas, ordena pelas mais recentes.
+
+    Returns:
+        List[ResultadoBusca]: Os resultados, do mais relevante para o menos relevante (ou do mais recente para
+                              o mais antigo).
+    """
+    consulta = texto if consulta_fts else montar_consulta(texto)
+    parametros: list = [consulta]
+
+    filtro_categoria = ""
+    if categoria_ids:
+        marcadores = ", ".join("?" * len(categoria_ids))
+        filtro_categoria = f"""AND EXISTS (
+            SELECT 1 FROM postagens_categorias pc
+            WHERE pc.postagem_id = postagens_fts.rowid AND pc.categoria_id IN ({marcadores})
+        )"""
+        parametros.extend(categoria_ids)
+
+    # Ids das postagens mais recentes encontradas: percorre o índice em ordem de rowid, sem calcular o bm25.
+    candidatos = sessao.executar(f"""
+        SELECT rowid FROM postagens_fts
+        WHERE postagens_fts MATCH ?
+        {filtro_categoria}
+        ORDER BY rowid DESC
+        LIMIT ?
+    """, parametros + [limite_candidatos + 1])
+    if not candidatos:
+        return []
+
+    # Poucas postagens: bm25 (o FTS5 lê todas elas, mas são no máximo limite_candidatos). Muitas: as mais
+    # recentes, limitadas ao intervalo de ids dos primeiros resultados.
+    por_relevancia = len(candidatos) <= limite_candidatos
+    if por_relevancia:
+        relevancia, filtro_recentes, ordem = "rank", "", "rank"
+    else:
+        relevancia, filtro_recentes, ordem = "NULL", "AND rowid >= ?", "rowid DESC"
+        parametros.append(candidatos[min(limite, len(candidatos)) - 1][0])
+    parametros.append(limite)
+
+    registros = sessao.executar(f"""
+        SELECT rowid,
+               {relevancia},
+               highlight(postagens_fts, 0, '{INICIO_DESTAQUE}', '{FIM_DESTAQUE}'),
+               snippet(postagens_fts, 1, '{INICIO_DESTAQUE}', '{FIM_DESTAQUE}', '{RETICENCIAS}', {PALAVRAS_TRECHO})
+        FROM postagens_fts
+        WHERE postagens_fts MATCH ?
+        {filtro_categoria}
+        {filtro_recentes}
+        ORDER BY {ordem}
+        LIMIT ?
+    """, parametros)
+
+    postagens = {postagem.id: postagem for postagem in sessao.carregar_postagens([r[0] for r in registros])}
+    return [
+        ResultadoBusca(postagens[id], relevancia, titulo, trecho)
+        for id, relevancia, titulo, trecho in registros
+        if id in postagens
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca textual nas postagens do blog (SQLite FTS5)")
+    parser.add_argument("banco", help="Caminho do banco de dados SQLite do blog (':memory:' para um exemplo)")
+    parser.add_argument("texto", nargs="?", help="Texto da busca")
+    parser.add_argument("--categoria", type=int, action="append", help="Filtra por id de categoria")
+    parser.add_argument("--limite", type=int, default=LIMITE_PADRAO)
+    parser.add_argument("--fts", action="store_true", help="Utiliza o texto diretamente como consulta FTS5")
+    parser.add_argument("--reconstruir", action="store_true", help="Reconstrói o índice com as postagens existentes")
+    args = parser.parse_args()
+
+    connection = conectar(args.banco)
+    criar_schema(connection)
+    criar_busca(connection)
+
+    if args.banco == ":memory:":
+        popular_exemplo(connection)
+
+    if args.reconstruir:
+        reconstruir_indice(connection)
+        print("Índice de busca reconstruído.")
+
+    if args.texto:
+        resultados = buscar(SessaoBlog(connection), args.texto, args.categoria, args.limite, args.fts)
+        for resultado in resultados:
+            relevancia = "recente" if resultado.relevancia is None else f"{resultado.relevancia:.3f}"
+            print(f"{resultado.postagem.id}) {resultado.titulo_destacado} ({relevancia})")
+            print(f"    {resultado.trecho}")
+        print(f"{len(resultados)} resultado(s).")
+
+    connection.commit()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Relacionamento entre tabelas - contadores de postagens por categoria e por autor
+
+Para exibir "quantidade de postagens por categoria" ou "por autor", a forma direta é agrupar:
+
+    SELECT categoria_id, COUNT(*) FROM postagens_categorias GROUP BY categoria_id;
+
+Porém essa consulta percorre a tabela associativa inteira a cada exibição da página. Aqui guardamos as
+quantidades já calculadas (desnormalizadas) em duas tabelas de contadores:
+
+- contagem_postagens_categoria: uma linha por categoria;
+- contagem_postagens_autor: uma linha por usuário.
+
+Os contadores são mantidos pelo próprio banco, através de triggers de INSERT, DELETE e UPDATE em postagens e
+postagens_categorias, então qualquer programa que altere essas tabelas mantém os contadores corretos. A
+leitura de um contador é uma busca pela chave primária (O(1), sem agrupamento).
+
+Também temos um comando para verificar se os contadores estão consistentes e para recalculá-los:
+    python contadores_blog.py blog.sqlite3 --verificar
+    python contadores_blog.py blog.sqlite3 --reparar
+"""
+
+import argparse
+import sqlite3
+
+from typing import List, Tuple
+
+from blog_dados import conectar, criar_schema, popular_exemplo
+
+SCHEMA_CONTADORES = """
+CREATE TABLE IF NOT EXISTS contagem_postagens_categoria(
+    categoria_id INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS contagem_postagens_autor(
+    usuario_id INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL DEFAULT 0
+);
+
+-- Postagens -> contador por autor
+
+CREATE TRIGGER IF NOT EXISTS contagem_autor_insert AFTER INSERT ON postagens BEGIN
+    INSERT INTO contagem_postagens_autor(usuario_id, quantidade) VALUES (new.usuario_id, 1)
+    ON CONFLICT(usuario_id) DO UPDATE SET quantidade = quantidade + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS contagem_autor_delete AFTER DELETE ON postagens BEGIN
+    UPDATE contagem_postagens_autor SET quantidade = quantidade - 1 WHERE usuario_id = old.usuario_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS contagem_autor_update AFTER UPDATE OF usuario_id ON postagens
+WHEN old.usuario_id IS NOT new.usuario_id BEGIN
+    UPDATE contagem_postagens_autor SET quantidade = quantidade - 1 WHERE usuario_id = old.usuario_id;
+    INSERT INTO contagem_postagens_autor(usuario_id, quantidade) VALUES (new.usuario_id, 1)
+    ON CONFLICT(usuario_id) DO UPDATE SET quantidade = quantidade + 1;
+END;
+
+-- Postagens_categorias -> contador por categoria
+
+CREATE TRIGGER IF NOT EXISTS contagem_categoria_insert AFTER INSERT ON postagens_categorias BEGIN
+    INSERT INTO contagem_postagens_categoria(categoria_id, quantidade) VALUES (new.categoria_id, 1)
+    ON CONFLICT(categoria_id) DO UPDATE SET quantidade = quantidade + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS contagem_categoria_delete AFTER DELETE ON postagens_categorias BEGIN
+    UPDATE contagem_postagens_categoria SET quantidade = quantidade - 1 WHERE categoria_id = old.categoria_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS contagem_categoria_update AFTER UPDATE OF categoria_id ON postagens_categorias
+WHEN old.categoria_id IS NOT new.categoria_id BEGIN
+    UPDATE contagem_postagens_categoria SET quantidade = quantidade - 1 WHERE categoria_id = old.categoria_id;
+    INSERT INTO contagem_postagens_categoria(categoria_id, quantidade) VALUES (new.categoria_id, 1)
+    ON CONFLICT(categoria_id) DO UPDATE SET quantidade = quantidade + 1;
+END;
+"""
+
+# Para cada contador: (tabela de contadores, coluna chave, consulta com a contagem real).
+CONTADORES = {
+    "categoria": (
+        "contagem_postagens_categoria",
+        "categoria_id",
+        "SELECT categoria_id, COUNT(*) FROM postagens_categorias GROUP BY categoria_id",
+    ),
+    "autor": (
+        "contagem_postagens_autor",
+        "usuario_id",
+        "SELECT usuario_id, COUNT(*) FROM postagens GROUP BY usuario_id",
+    ),
+}
+
+
+def criar_contadores(connection: sqlite3.Connection) -> None:
+    """
+    Cria as tabelas de contadores e os triggers. Se as tabelas ainda não existiam, os contadores são
+    calculados a partir dos dados atuais.
+    """
+    existentes = connection.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+        tuple(tabela for tabela, _, _ in CONTADORES.values())
+    ).fetchone()[0]
+
+    connection.executescript(SCHEMA_CONTADORES)
+
+    if existentes < len(CONTADORES):
+        reparar_contadores(connection)
+
+
+def qtd_postagens_categoria(connection: sqlite3.Connection, categoria_id: int) -> int:
+    """Quantidade de postagens da categoria (busca pela chave primária)."""
+    registro = connection.execute(
+        "SELECT quantidade FROM contagem_postagens_categoria WHERE categoria_id = ?", (categoria_id,)
+    ).fetchone()
+    return registro[0] if registro else 0
+
+
+def qtd_postagens_autor(connection: sqlite3.Connection, usuario_id: int) -> int:
+    """Quantidade de postagens do usuário (busca pela chave primária)."""
+    registro = connection.execute(
+        "SELECT quantidade FROM contagem_postagens_autor WHERE usuario_id = ?", (usuario_id,)
+    ).fetchone()
+    return registro[0] if registro else 0
+
+
+def contagens_categorias(connection: sqlite3.Connection) -> List[Tuple[int, str, int]]:
+    """Lista (id, nome, quantidade de postagens) de todas as categorias, sem agrupar postagens_categorias."""
+    return connection.execute("""
+        SELECT c.id, c.nome, COALESCE(cc.quantidade, 0)
+        FROM categorias c
+        LEFT JOIN contagem_postagens_categoria cc ON cc.categoria_id = c.id
+        ORDER BY c.nome
+    """).fetchall()
+
+
+def verificar_contadores(connection: sqlite3.Connection) -> List[Tuple[str, int, int, int]]:
+    """
+    Compara os contadores com a contagem real (GROUP BY).
+
+    Returns:
+        List[Tuple[str, int, int, int]]: As divergências encontradas, como (tipo, id, contador, contagem real).
+                                         Uma lista vazia indica que os contadores estão corretos.
+    """
+    divergencias = []
+    for tipo, (tabela, chave, consulta_real) in CONTADORES.items():
+        # O SQLite só possui FULL OUTER JOIN a partir da versão 3.39, então juntamos dois LEFT JOIN:
+        # ids que estão nos contadores e ids que só aparecem na contagem real.
+        registros = connection.execute(f"""
+            WITH reais(id, quantidade) AS ({consulta_real})
+            SELECT t.{chave}, t.quantidade, COALESCE(r.quantidade, 0)
+            FROM {tabela} t LEFT JOIN reais r ON r.id = t.{chave}
+            WHERE t.quantidade IS NOT COALESCE(r.quantidade, 0)
+            UNION ALL
+            SELECT r.id, 0, r.quantidade
+            FROM reais r LEFT JOIN {tabela} t ON t.{chave} = r.id
+            WHERE t.{chave} IS NULL
+        """).fetchall()
+        divergencias.extend((tipo, id, contador, real) for id, contador, real in registros)
+    return divergencias
+
+
+def reparar_contadores(connection: sqlite3.Connection) -> None:
+    """Recalcula todos os contadores a partir das tabelas postagens e postagens_categorias (em uma transação)."""
+    with connection:
+        for tabela, chave, consulta_real in CONTADORES.values():
+            connection.execute(f"DELETE FROM {tabela}")
+            connection.execute(f"INSERT INTO {tabela}({chave}, quantidade) {consulta_real}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contadores de postagens por categoria e por autor")
+    parser.add_argument("banco", help="Caminho do banco de dados SQLite do blog (':memory:' para um exemplo)")
+    parser.add_argument("--verificar", action="store_true", help="Verifica se os contadores estão consistentes")
+    parser.add_argument("--reparar", action="store_true", help="Recalcula todos os contadores")
+    args = parser.parse_args()
+
+    connection = conectar(args.banco)
+    criar_schema(connection)
+    criar_contadores(connection)
+
+    if args.banco == ":memory:":
+        popular_exemplo(connection)
+
+    if args.verificar:
+        divergencias = verificar_contadores(connection)
+        for tipo, id, contador, real in divergencias:
+            print(f"Contador de {tipo} {id}: {contador} (real: {real})")
+        print(f"{len(divergencias)} divergência(s) encontrada(s).")
+
+    if args.reparar:
+        reparar_contadores(connection)
+        print("Contadores recalculados.")
+
+    for id, nome, quantidade in contagens_categorias(connection):
+        print(f"{nome.ljust(20)} {quantidade}")
+
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Relacionamento entre tabelas - paginação do feed de postagens
+
+Com LIMIT/OFFSET, para exibir a página 10.000 o banco precisa ler e descartar todas as postagens das 9.999
+páginas anteriores, então cada página fica mais lenta que a anterior.
+
+Aqui utilizamos paginação por chave (keyset pagination): o feed é ordenado por (criado_em, id) e cada página
+guarda a chave da sua última postagem. A página seguinte começa exatamente depois dessa chave:
+
+    WHERE (criado_em, id) < (:criado_em_ultima, :id_ultima)
+    ORDER BY criado_em DESC, id DESC
+    LIMIT :limite
+
+Com um índice composto em (criado_em, id), o banco vai direto para a posição da chave, então a página
+10.000 custa o mesmo que a página 1. O id entra na chave para desempatar postagens criadas no mesmo instante.
+
+No feed por categoria, a categoria está na tabela associativa postagens_categorias e a data em postagens,
+então nenhum índice das duas tabelas atende ao filtro e à ordenação juntos: o banco percorreria o feed geral
+verificando a categoria de cada postagem, e o custo de uma página cresceria com 1/seletividade (uma categoria
+com 1% das postagens leria ~100 postagens para cada uma exibida). Por isso guardamos (categoria_id, criado_em,
+postagem_id) na tabela feed_categorias, mantida por triggers (como os contadores de contadores_blog.py), e a
+página por categoria é uma busca nessa chave, com o mesmo custo das demais.
+
+Para quem chama a API, a chave é devolvida como um "cursor" opaco (texto em base64), que deve ser enviado de
+volta para buscar a próxima página.
+
+Exemplo de uso:
+    python feed_postagens.py
+"""
+
+import base64
+import binascii
+import json
+import sqlite3
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from blog_dados import Postagem, SessaoBlog, conectar, criar_schema, popular_exemplo
+
+# Índices utilizados pela paginação:
+# - feed geral: (criado_em, id);
+# - feed por autor: (usuario_id, criado_em, id) - também atende às buscas por usuario_id, por isso
+#   substitui o índice idx_postagens_usuario_id;
+# - feed por categoria: chave primária (categoria_id, criado_em, postagem_id) de feed_categorias, uma cópia
+#   desnormalizada de postagens_categorias com a data da postagem, mantida pelos triggers abaixo.
+#   Colunas de chave primária de uma tabela WITHOUT ROWID não aceitam NULL (e o INSERT OR IGNORE descartaria a
+#   postagem sem avisar), então postagens sem criado_em são gravadas com a data '' - menor que qualquer data, ou
+#   seja, no fim do feed, a mesma posição que os NULLs ocupam no ORDER BY criado_em DESC do feed geral.
+INDICES_FEED = """
+CREATE INDEX IF NOT EXISTS idx_postagens_criado_em_id ON postagens(criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_postagens_usuario_criado_em_id ON postagens(usuario_id, criado_em, id);
+DROP INDEX IF EXISTS idx_postagens_usuario_id;
+
+CREATE TABLE IF NOT EXISTS feed_categorias(
+    categoria_id INTEGER NOT NULL,
+    criado_em TEXT,
+    postagem_id INTEGER NOT NULL,
+    PRIMARY KEY(categoria_id, criado_em, postagem_id)
+) WITHOUT ROWID;
+
+-- Postagens_categorias -> feed_categorias
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_insert AFTER INSERT ON postagens_categorias BEGIN
+    INSERT OR IGNORE INTO feed_categorias(categoria_id, criado_em, postagem_id)
+    SELECT new.categoria_id, COALESCE(p.criado_em, ''), p.id FROM postagens p WHERE p.id = new.postagem_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_delete AFTER DELETE ON postagens_categorias BEGIN
+    DELETE FROM feed_categorias WHERE categoria_id = old.categoria_id AND postagem_id = old.postagem_id
+        AND criado_em IN (SELECT COALESCE(criado_em, '') FROM postagens WHERE id = old.postagem_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_update AFTER UPDATE OF postagem_id, categoria_id ON postagens_categorias
+BEGIN
+    DELETE FROM feed_categorias WHERE categoria_id = old.categoria_id AND postagem_id = old.postagem_id
+        AND criado_em IN (SELECT COALESCE(criado_em, '') FROM postagens WHERE id = old.postagem_id);
+    INSERT OR IGNORE INTO feed_categorias(categoria_id, criado_em, postagem_id)
+    SELECT new.categoria_id, COALESCE(p.criado_em, ''), p.id FROM postagens p WHERE p.id = new.postagem_id;
+END;
+
+-- Postagens -> feed_categorias (a data faz parte da chave, e a postagem pode ser associada antes de existir)
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_postagem_insert AFTER INSERT ON postagens BEGIN
+    INSERT OR IGNORE INTO feed_categorias(categoria_id, criado_em, postagem_id)
+    SELECT pc.categoria_id, COALESCE(new.criado_em, ''), new.id FROM postagens_categorias pc
+    WHERE pc.postagem_id = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_postagem_update AFTER UPDATE OF id, criado_em ON postagens
+WHEN old.id IS NOT new.id OR old.criado_em IS NOT new.criado_em BEGIN
+    DELETE FROM feed_categorias WHERE postagem_id = old.id AND criado_em = COALESCE(old.criado_em, '')
+        AND categoria_id IN (SELECT categoria_id FROM postagens_categorias WHERE postagem_id = old.id);
+    INSERT OR IGNORE INTO feed_categorias(categoria_id, criado_em, postagem_id)
+    SELECT pc.categoria_id, COALESCE(new.criado_em, ''), new.id FROM postagens_categorias pc
+    WHERE pc.postagem_id = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS feed_categorias_postagem_delete AFTER DELETE ON postagens BEGIN
+    DELETE FROM feed_categorias WHERE postagem_id = old.id AND criado_em = COALESCE(old.criado_em, '')
+        AND categoria_id IN (SELECT categoria_id FROM postagens_categorias WHERE postagem_id = old.id);
+END;
+"""
+
+# Preenche feed_categorias com as associações existentes antes da criação dos triggers.
+PREENCHER_FEED_CATEGORIAS = """
+INSERT OR IGNORE INTO feed_categorias(categoria_id, criado_em, postagem_id)
+SELECT pc.categoria_id, COALESCE(p.criado_em, ''), p.id FROM postagens_categorias pc
+INNER JOIN postagens p ON p.id = pc.postagem_id
+"""
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+
+
+@dataclass
+class PaginaFeed:
+    postagens: List[Postagem]
+    # Cursor para buscar a próxima página. None quando esta é a última página.
+    proximo_cursor: Optional[str]
+
+
+def criar_indices_feed(connection: sqlite3.Connection) -> None:
+    existia = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feed_categorias'"
+    ).fetchone() is not None
+    connection.executescript(INDICES_FEED)
+    if not existia:
+        with connection:
+            connection.execute(PREENCHER_FEED_CATEGORIAS)
+
+
+def codificar_cursor(criado_em: str, id: int) -> str:
+    """Transforma a chave (criado_em, id) da última postagem em um texto opaco."""
+    dados = json.dumps([criado_em, id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(dados).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple:
+    """
+    Faz o caminho inverso de codificar_cursor().
+
+    Raises:
+        ValueError: Se o cursor não tiver sido gerado por codificar_cursor().
+    """
+    try:
+        dados = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        criado_em, id = json.loads(dados)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError("Cursor inválido.") from e
+
+    if not isinstance(criado_em, str) or not isinstance(id, int):
+        raise ValueError("Cursor inválido.")
+    return criado_em, id
+
+
+def _pagina(
+        sessao: SessaoBlog,
+        filtro: str,
+        parametros: Sequence,
+        limite: int,
+        cursor: Optional[str],
+        tabela: str = "postagens",
+        coluna_id: str = "id"
+    ) -> PaginaFeed:
+    """
+    Busca uma página de postagens.
+
+    Args:
+        sessao (SessaoBlog): Sessão utilizada para carregar as postagens (com autor e categorias).
+        filtro (str): Condição adicional do WHERE (ex: "p.usuario_id = ?"), ou texto vazio.
+        parametros (Sequence): Valores dos placeholders do filtro.
+        limite (int): Quantidade de postagens por página.
+        cursor (Optional[str]): Cursor devolvido pela página anterior (None para a primeira página).
+        tabela (str): Tabela percorrida (com as colunas criado_em e coluna_id), com o alias p.
+        coluna_id (str): Coluna com o id da postagem na tabela.
+    """
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+    condicoes = [filtro] if filtro else []
+    parametros = list(parametros)
+
+    if cursor is not None:
+        condicoes.append(f"(p.criado_em, p.{coluna_id}) < (?, ?)")
+        parametros.extend(decodificar_cursor(cursor))
+
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+    # Buscamos uma postagem a mais do que o limite apenas para saber se existe uma próxima página.
+    registros = sessao.executar(f"""
+        SELECT p.{coluna_id}, p.criado_em FROM {tabela} p
+        {where}
+        ORDER BY p.criado_em DESC, p.{coluna_id} DESC
+        LIMIT ?
+    """, parametros + [limite + 1])
+
+    proximo_cursor = None
+    if len(registros) > limite:
+        registros = registros[:limite]
+        ultimo_id, ultimo_criado_em = registros[-1]
+        proximo_cursor = codificar_cursor(ultimo_criado_em, ultimo_id)
+
+    postagens = sessao.carregar_postagens([id for id, _ in registros])
+    return PaginaFeed(postagens, proximo_cursor)
+
+
+def pagina_feed(sessao: SessaoBlog, limite: int = LIMITE_PADRAO, cursor: Optional[str] = None) -> PaginaFeed:
+    """Página do feed com todas as postagens, da mais recente para a mais antiga."""
+    return _pagina(sessao, "", (), limite, cursor)
+
+
+def pagina_feed_autor(
+        sessao: SessaoBlog,
+        usuario_id: int,
+        limite: int = LIMITE_PADRAO,
+        cursor: Optional[str] = None
+    ) -> PaginaFeed:
+    """Página do feed com as postagens de um usuário."""
+    return _pagina(sessao, "p.usuario_id = ?", (usuario_id,), limite, cursor)
+
+
+def pagina_feed_categoria(
+        sessao: SessaoBlog,
+        categoria_id: int,
+        limite: int = LIMITE_PADRAO,
+        cursor: Optional[str] = None
+    ) -> PaginaFeed:
+    """Página do feed com as postagens de uma categoria (através da tabela feed_categorias)."""
+    return _pagina(
+        sessao, "p.categoria_id = ?", (categoria_id,), limite, cursor, tabela="feed_categorias", coluna_id="postagem_id"
+    )
+
+
+if __name__ == "__main__":
+
+    connection = conectar()
+    criar_schema(connection)
+    criar_indices_feed(connection)
+    popular_exemplo(connection)
+
+    cursor = None
+    numero_pagina = 1
+    while True:
+        pagina = pagina_feed(SessaoBlog(connection), limite=2, cursor=cursor)
+        print(f"Página {numero_pagina}: {[postagem.titulo for postagem in pagina.postagens]}")
+        if pagina.proximo_cursor is None:
+            break
+        cursor = pagina.proximo_cursor
+        numero_pagina += 1
+
+    pagina = pagina_feed_categoria(SessaoBlog(connection), categoria_id=1)
+    print(f"Categoria 'python': {[postagem.titulo for postagem in pagina.postagens]}")
+
+    connection.close()
@@ -0,0 +1,315 @@
+"""
+Relacionamento entre tabelas - gerador de dados e teste de carga do blog
+
+O relacionamentos.sql insere apenas 3 usuários e 3 postagens, o que não permite medir o tempo das consultas
+com JOIN em uma escala realista. Aqui geramos milhões de registros nas tabelas usuarios, perfis, categorias,
+postagens e postagens_categorias:
+
+- a geração é determinística: a mesma semente gera exatamente os mesmos dados;
+- os ids são informados explicitamente e as tabelas são preenchidas na ordem das chaves estrangeiras
+  (usuarios -> perfis -> categorias -> postagens -> postagens_categorias), então as FKs são respeitadas;
+- os registros são inseridos em lote (executemany), em uma única transação, com PRAGMA synchronous = OFF
+  durante a carga;
+- a quantidade de categorias por postagem segue uma distribuição configurável, no formato
+  "quantidade:peso,..." (ex: "0:5,1:40,2:35,3:20" -> 5% das postagens sem categoria, 40% com uma, etc).
+
+Depois da carga, o teste de carga executa as consultas com JOIN documentadas no relacionamentos.sql com
+parâmetros aleatórios e mostra a latência p50/p95/p99 de cada uma.
+
+Exemplo de uso:
+    python gerador_blog.py blog.sqlite3 --usuarios 100000 --postagens 1000000 --carga 2000
+"""
+
+import argparse
+import itertools
+import random
+import sqlite3
+import statistics
+import time
+
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from blog_dados import conectar, criar_schema
+
+DISTRIBUICAO_PADRAO = "0:5,1:40,2:35,3:20"
+TAMANHO_LOTE = 10000
+
+# Período das datas de criação (em segundos desde 1970, UTC): 2020-01-01 até 2024-12-31.
+INICIO_PERIODO = 1577836800
+FIM_PERIODO = 1735689599
+
+PALAVRAS = (
+    "python java sql banco dados consulta tabela indice linguagem programacao linux servidor rede "
+    "arquivo memoria processo codigo teste classe funcao objeto lista dicionario api web dado carga"
+).split()
+NOMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Rodrigues", "Almeida"]
+GENEROS = ["Masculino", "Feminino", None]
+
+
+def interpretar_distribuicao(texto: str) -> Tuple[List[int], List[float]]:
+    """
+    Converte o texto "quantidade:peso,..." em duas listas: quantidades e pesos acumulados (para random.choices).
+
+    Raises:
+        ValueError: Se o texto não estiver no formato esperado ou se algum valor for negativo.
+    """
+    quantidades, pesos = [], []
+    try:
+        for item in texto.split(","):
+            quantidade, peso = item.split(":")
+            quantidades.append(int(quantidade))
+            pesos.append(float(peso))
+    except ValueError as e:
+        raise ValueError(f"Distribuição inválida: {texto!r} (formato esperado: '0:5,1:40,2:35')") from e
+
+    if any(q < 0 for q in quantidades) or any(p < 0 for p in pesos) or sum(pesos) <= 0:
+        raise ValueError(f"Distribuição inválida: {texto!r} (valores negativos ou pesos zerados)")
+    return quantidades, list(itertools.accumulate(pesos))
+
+
+def _data(rng: random.Random) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(rng.randint(INICIO_PERIODO, FIM_PERIODO)))
+
+
+def _frase(rng: random.Random, minimo: int, maximo: int) -> str:
+    return " ".join(rng.choices(PALAVRAS, k=rng.randint(minimo, maximo)))
+
+
+def _proximo_id(connection: sqlite3.Connection, tabela: str) -> int:
+    """Os ids gerados começam depois do maior id existente, assim a carga pode ser repetida no mesmo banco."""
+    return connection.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {tabela}").fetchone()[0]
+
+
+def _inserir(connection: sqlite3.Connection, comando: str, registros: Iterable[tuple], tamanho_lote: int) -> int:
+    """Insere os registros (gerados sob demanda) em lotes de tamanho_lote, sem montar a lista inteira na memória."""
+    total = 0
+    registros = iter(registros)
+    while True:
+        lote = list(itertools.islice(registros, tamanho_lote))
+        if not lote:
+            return total
+        connection.executemany(comando, lote)
+        total += len(lote)
+
+
+def gerar_blog(
+        connection: sqlite3.Connection,
+        qtd_usuarios: int,
+        qtd_postagens: int,
+        qtd_categorias: int = 50,
+        distribuicao: str = DISTRIBUICAO_PADRAO,
+        semente: int = 42,
+        proporcao_perfis: float = 0.8,
+        tamanho_lote: int = TAMANHO_LOTE
+    ) -> Dict[str, int]:
+    """
+    Gera dados sintéticos para todas as tabelas do blog.
+
+    Args:
+        connection (sqlite3.Connection): Conexão com o banco (o schema deve existir).
+        qtd_usuarios (int): Quantidade de usuários.
+        qtd_postagens (int): Quantidade de postagens (cada uma de um usuário aleatório).
+        qtd_categorias (int): Quantidade de categorias.
+        distribuicao (str): Distribuição da quantidade de categorias por postagem ("quantidade:peso,...").
+        semente (int): Semente do gerador de números aleatórios.
+        proporcao_perfis (float): Proporção dos usuários que possuem perfil (relação 1:1 opcional).
+        tamanho_lote (int): Quantidade de registros por executemany.
+
+    Returns:
+        Dict[str, int]: Quantidade de registros inseridos em cada tabela.
+
+    Raises:
+        ValueError: Se a distribuição for inválida ou pedir mais categorias do que existem.
+    """
+    quantidades, pesos_acumulados = interpretar_distribuicao(distribuicao)
+    if max(quantidades) > qtd_categorias:
+        raise ValueError(f"A distribuição pede até {max(quantidades)} categorias, mas existem {qtd_categorias}.")
+    if qtd_usuarios <= 0 and qtd_postagens > 0:
+        raise ValueError("É necessário ao menos um usuário para gerar postagens.")
+
+    rng = random.Random(semente)
+    primeiro_usuario = _proximo_id(connection, "usuarios")
+    primeira_categoria = _proximo_id(connection, "categorias")
+    primeira_postagem = _proximo_id(connection, "postagens")
+    ids_usuarios = range(primeiro_usuario, primeiro_usuario + qtd_usuarios)
+    ids_categorias = range(primeira_categoria, primeira_categoria + qtd_categorias)
+    ids_postagens = range(primeira_postagem, primeira_postagem + qtd_postagens)
+
+    def usuarios() -> Iterator[tuple]:
+        for id in ids_usuarios:
+            yield id, f"usuario{id}@email.com", f"senha{rng.getrandbits(32):08x}", _data(rng)
+
+    def perfis() -> Iterator[tuple]:
+        for id in ids_usuarios:
+            if rng.random() < proporcao_perfis:
+                nascimento = f"{rng.randint(1950, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                yield id, f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}", nascimento, rng.choice(GENEROS)
+
+    def categorias() -> Iterator[tuple]:
+        for id in ids_categorias:
+            yield id, f"{rng.choice(PALAVRAS)}-{id}"
+
+    def postagens() -> Iterator[tuple]:
+        for id in ids_postagens:
+            yield id, rng.choice(ids_usuarios), _frase(rng, 3, 8).capitalize(), _frase(rng, 20, 80), _data(rng)
+
+    def postagens_categorias() -> Iterator[tuple]:
+        for id in ids_postagens:
+            k = rng.choices(quantidades, cum_weights=pesos_acumulados)[0]
+            for categoria_id in rng.sample(ids_categorias, k):
+                yield id, categoria_id
+
+    resumo = {}
+    connection.commit()
+    connection.execute("PRAGMA synchronous = OFF")
+    try:
+        with connection:
+            resumo["usuarios"] = _inserir(
+                connection, "INSERT INTO usuarios(id, email, senha, criado_em) VALUES (?, ?, ?, ?)",
+                usuarios(), tamanho_lote
+            )
+            resumo["perfis"] = _inserir(
+                connection, "INSERT INTO perfis(id, nome, data_de_nascimento, genero) VALUES (?, ?, ?, ?)",
+                perfis(), tamanho_lote
+            )
+            resumo["categorias"] = _inserir(
+                connection, "INSERT INTO categorias(id, nome) VALUES (?, ?)", categorias(), tamanho_lote
+            )
+            resumo["postagens"] = _inserir(
+                connection, "INSERT INTO postagens(id, usuario_id, titulo, texto, criado_em) VALUES (?, ?, ?, ?, ?)",
+                postagens(), tamanho_lote
+            )
+            resumo["postagens_categorias"] = _inserir(
+                connection, "INSERT INTO postagens_categorias(postagem_id, categoria_id) VALUES (?, ?)",
+                postagens_categorias(), tamanho_lote
+            )
+    finally:
+        connection.execute("PRAGMA synchronous = FULL")
+
+    connection.execute("ANALYZE")
+    return resumo
+
+
+# =====================================
+# TESTE DE CARGA
+# =====================================
+
+# Consultas com JOIN do relacionamentos.sql. Cada uma recebe uma função que sorteia os parâmetros a partir
+# dos limites (menor id, maior id) das tabelas.
+CONSULTAS_CARGA: Dict[str, Tuple[str, Callable[[random.Random, Dict[str, Tuple[int, int]]], tuple]]] = {
+    # 1:N - postagens de um usuário.
+    "usuarios_postagens": (
+        """
+        SELECT a.id, a.email, b.titulo FROM usuarios a
+        INNER JOIN postagens b ON a.id = b.usuario_id
+        WHERE a.id = ?
+        """,
+        lambda rng, limites: (rng.randint(*limites["usuarios"]),),
+    ),
+    # N:N - categorias de uma postagem.
+    "postagem_categorias": (
+        """
+        SELECT p.id, p.titulo, c.nome FROM postagens p
+        INNER JOIN postagens_categorias pc ON p.id = pc.postagem_id
+        INNER JOIN categorias c ON pc.categoria_id = c.id
+        WHERE p.id = ?
+        """,
+        lambda rng, limites: (rng.randint(*limites["postagens"]),),
+    ),
+    # N:N no sentido inverso - postagens mais recentes de uma categoria.
+    "categoria_postagens": (
+        """
+        SELECT p.id, p.titulo, c.nome FROM categorias c
+        INNER JOIN postagens_categorias pc ON pc.categoria_id = c.id
+        INNER JOIN postagens p ON p.id = pc.postagem_id
+        WHERE c.id = ?
+        ORDER BY p.criado_em DESC
+        LIMIT 20
+        """,
+        lambda rng, limites: (rng.randint(*limites["categorias"]),),
+    ),
+}
+
+
+def percentis(tempos: Sequence[float]) -> Dict[str, float]:
+    """Retorna p50, p95, p99 e a média dos tempos informados."""
+    if len(tempos) < 2:
+        valor = tempos[0] if tempos else 0.0
+        return {"p50": valor, "p95": valor, "p99": valor, "media": valor}
+    cortes = statistics.quantiles(tempos, n=100, method="inclusive")
+    return {"p50": cortes[49], "p95": cortes[94], "p99": cortes[98], "media": statistics.fmean(tempos)}
+
+
+def teste_de_carga(
+        connection: sqlite3.Connection,
+        iteracoes: int = 1000,
+        semente: int = 42,
+        consultas: Sequence[str] = tuple(CONSULTAS_CARGA)
+    ) -> Dict[str, Dict[str, float]]:
+    """
+    Executa cada consulta do teste de carga com parâmetros aleatórios e mede a latência.
+
+    Args:
+        connection (sqlite3.Connection): Conexão com o banco já populado.
+        iteracoes (int): Quantidade de execuções de cada consulta.
+        semente (int): Semente utilizada para sortear os parâmetros.
+        consultas (Sequence[str]): Nomes das consultas de CONSULTAS_CARGA que serão executadas.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Para cada consulta, p50, p95, p99 e média em milissegundos.
+    """
+    limites = {
+        tabela: connection.execute(f"SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0) FROM {tabela}").fetchone()
+        for tabela in ("usuarios", "postagens", "categorias")
+    }
+    rng = random.Random(semente)
+
+    resultado = {}
+    for nome in consultas:
+        comando, sortear_parametros = CONSULTAS_CARGA[nome]
+        tempos = []
+        for _ in range(iteracoes):
+            parametros = sortear_parametros(rng, limites)
+            inicio = time.perf_counter()
+            connection.execute(comando, parametros).fetchall()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        resultado[nome] = percentis(tempos)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos e teste de carga do blog")
+    parser.add_argument("banco", help="Caminho do banco de dados SQLite")
+    parser.add_argument("--usuarios", type=int, default=10000)
+    parser.add_argument("--postagens", type=int, default=100000)
+    parser.add_argument("--categorias", type=int, default=50)
+    parser.add_argument("--distribuicao", default=DISTRIBUICAO_PADRAO,
+                        help="Categorias por postagem, no formato 'quantidade:peso,...'")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--carga", type=int, default=1000, help="Execuções de cada consulta no teste de carga")
+    parser.add_argument("--sem-geracao", action="store_true", help="Apenas executa o teste de carga")
+    args = parser.parse_args()
+
+    connection = conectar(args.banco)
+    criar_schema(connection)
+
+    if not args.sem_geracao:
+        inicio = time.perf_counter()
+        resumo = gerar_blog(
+            connection, args.usuarios, args.postagens, args.categorias, args.distribuicao, args.semente
+        )
+        duracao = time.perf_counter() - inicio
+        print(", ".join(f"{tabela}: {quantidade}" for tabela, quantidade in resumo.items()))
+        print(f"Geração concluída em {duracao:.2f}s ({sum(resumo.values()) / duracao:,.0f} registros/s)")
+
+    if args.carga > 0:
+        print(f"{'consulta'.ljust(22)} {'p50':>9} {'p95':>9} {'p99':>9} {'média':>9}  (ms)")
+        for nome, tempos in teste_de_carga(connection, args.carga, args.semente).items():
+            print(f"{nome.ljust(22)} {tempos['p50']:9.3f} {tempos['p95']:9.3f} {tempos['p99']:9.3f} {tempos['media']:9.3f}")
+
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# ANÁLISE DE VENDAS EM STREAMING - vendas.csv
+# Calcula, por produto, a receita, a quantidade de unidades vendidas e o preço médio, além dos totais gerais
+# e dos N produtos com maior receita.
+#
+# O arquivo é lido linha a linha (streaming) e os resultados são acumulados em um dicionário (hash map) com
+# uma entrada por produto. Assim, a memória utilizada depende apenas da quantidade de produtos distintos, e
+# não da quantidade de linhas do arquivo.
+#
+# No modo paralelo, o arquivo é dividido em blocos de bytes (sempre alinhados no início de uma linha), cada
+# processo agrega o seu bloco e, no final, os resultados parciais são combinados.
+#
+# Com --distribuicao, a mediana, os percentis e o histograma dos preços de venda também são calculados na mesma
+# passada (estatisticas_streaming); no modo paralelo, as distribuições dos blocos são combinadas. Com --banco,
+# a distribuição é gravada na tabela tb_estatisticas_distribuicoes.
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import heapq
+import os
+import sqlite3
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from estatisticas_streaming import Distribuicao, gravar_distribuicao
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+CSV_PATH = BASE_DIR / "vendas.csv"
+
+# Colunas esperadas no cabeçalho do arquivo.
+COLUNAS_VENDAS = ("sale_id", "product", "quantity", "price")
+
+# Faixas do histograma de preços de venda: de R$ 0 a R$ 1000, em faixas de R$ 50.
+FAIXAS_PRECO = (0.0, 1000.0, 20)
+
+# Posições de cada valor na lista de acumuladores de um produto.
+RECEITA, UNIDADES, VENDAS = 0, 1, 2
+
+# Tipo do resultado da agregação: produto -> [receita, unidades, quantidade de vendas]
+Agregado = Dict[str, List[float]]
+
+
+# =====================================
+# AGREGAÇÃO
+# =====================================
+
+def separar_campos(linha: str) -> Tuple[str, str, str, str]:
+    """
+    Separa uma linha do vendas.csv nos campos (sale_id, product, quantity, price).
+
+    str.split é bem mais rápido que o módulo csv; só utilizamos o csv.reader quando a linha possui aspas.
+    O nome do produto fica "no meio" da linha, então separamos o primeiro campo pela esquerda e os dois
+    últimos pela direita.
+    """
+    if '"' in linha:
+        return tuple(next(csv.reader([linha], delimiter=";")))
+
+    sale_id, resto = linha.split(";", 1)
+    produto, quantidade, preco = resto.rsplit(";", 2)
+    return sale_id, produto, quantidade, preco
+
+
+def agregar_linhas(
+        linhas: Iterable[str],
+        agregado: Optional[Agregado] = None,
+        distribuicao: Optional[Distribuicao] = None
+    ) -> Tuple[Agregado, int]:
+    """
+    Acumula receita, unidades e quantidade de vendas por produto.
+
+    Args:
+        linhas (Iterable[str]): Linhas do arquivo, sem o cabeçalho.
+        agregado (Optional[Agregado]): Acumuladores já existentes (permite continuar uma agregação).
+        distribuicao (Optional[Distribuicao]): Se informada, recebe o preço de cada venda.
+
+    Returns:
+        Tuple[Agregado, int]: Os acumuladores por produto e a quantidade de linhas inválidas ignoradas.
+    """
+    if agregado is None:
+        agregado = {}
+
+    invalidas = 0
+    for linha in linhas:
+        linha = linha.rstrip("\r\n")
+        if not linha:
+            continue
+
+        try:
+            _, produto, quantidade, preco = separar_campos(linha)
+            quantidade = int(quantidade)
+            preco = float(preco)
+        except ValueError:
+            invalidas += 1
+            continue
+
+        acumulador = agregado.get(produto)
+        if acumulador is None:
+            acumulador = agregado[produto] = [0.0, 0, 0]
+        acumulador[RECEITA] += quantidade * preco
+        acumulador[UNIDADES] += quantidade
+        acumulador[VENDAS] += 1
+        if distribuicao is not None:
+            distribuicao.adicionar(preco)
+
+    return agregado, invalidas
+
+
+def combinar(parciais: Iterable[Agregado]) -> Agregado:
+    """Combina resultados parciais (de blocos diferentes do arquivo) em um único resultado."""
+    resultado: Agregado = {}
+    for parcial in parciais:
+        for produto, (receita, unidades, vendas) in parcial.items():
+            acumulador = resultado.get(produto)
+            if acumulador is None:
+                resultado[produto] = [receita, unidades, vendas]
+            else:
+                acumulador[RECEITA] += receita
+                acumulador[UNIDADES] += unidades
+                acumulador[VENDAS] += vendas
+    return resultado
+
+
+# =====================================
+# LEITURA DO ARQUIVO
+# =====================================
+
+def _validar_cabecalho(cabecalho: str) -> None:
+    colunas = tuple(coluna.strip().lower() for coluna in cabecalho.lstrip("\ufeff").rstrip("\r\n").split(";"))
+    if colunas != COLUNAS_VENDAS:
+        raise ValueError(f"O CSV deve conter as colunas: {COLUNAS_VENDAS}. Encontrado: {colunas}")
+
+
+def dividir_em_blocos(caminho: Path, qtd_blocos: int, pular_cabecalho: bool = True) -> List[Tuple[int, int]]:
+    """
+    Divide o arquivo em intervalos de bytes [inicio, fim) que começam sempre no início de uma linha.
+
+    Args:
+        caminho (Path): Caminho do arquivo.
+        qtd_blocos (int): Quantidade desejada de blocos.
+        pular_cabecalho (bool): Se True, a primeira linha do arquivo não faz parte de nenhum bloco.
+
+    Returns:
+        List[Tuple[int, int]]: Os intervalos de bytes de cada bloco (blocos vazios são descartados).
+    """
+    tamanho = os.path.getsize(caminho)
+
+    with open(caminho, "rb") as f:
+        inicio = 0
+        if pular_cabecalho:
+            f.readline()
+            inicio = f.tell()
+
+        limites = [inicio]
+        passo = max(1, (tamanho - inicio) // max(1, qtd_blocos))
+        for i in range(1, qtd_blocos):
+            posicao = inicio + i * passo
+            if posicao <= limites[-1]:
+                continue
+            if posicao >= tamanho:
+                break
+            # Avança até o fim da linha atual, para que o próximo bloco comece no início de uma linha.
+            f.seek(posicao - 1)
+            f.readline()
+            limites.append(f.tell())
+        limites.append(tamanho)
+
+    return [(a, b) for a, b in zip(limites, limites[1:]) if b > a]
+
+
+def ler_linhas_bloco(caminho: Path, inicio: int, fim: int) -> Iterable[str]:
+    """Lê as linhas do arquivo que começam no intervalo de bytes [inicio, fim)."""
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        posicao = inicio
+        while posicao < fim:
+            linha = f.readline()
+            if not linha:
+                break
+            posicao += len(linha)
+            yield linha.decode("utf-8")
+
+
+def agregar_bloco(
+        caminho: Path,
+        inicio: int,
+        fim: int,
+        distribuicao: Optional[Distribuicao] = None
+    ) -> Tuple[Agregado, int, Optional[Distribuicao]]:
+    """
+    Agrega um bloco do arquivo. É a função executada em cada processo no modo paralelo.
+    A distribuição do bloco é retornada para ser combinada com as dos demais blocos.
+    """
+    agregado, invalidas = agregar_linhas(ler_linhas_bloco(caminho, inicio, fim), distribuicao=distribuicao)
+    return agregado, invalidas, distribuicao
+
+
+def agregar_arquivo(
+        caminho: Path = CSV_PATH,
+        processos: int = 1,
+        distribuicao: Optional[Distribuicao] = None
+    ) -> Tuple[Agregado, int]:
+    """
+    Agrega o arquivo de vendas inteiro.
+
+    Args:
+        caminho (Path): Caminho do vendas.csv.
+        processos (int): Quantidade de processos. Com 1, o arquivo é lido em streaming no processo atual.
+        distribuicao (Optional[Distribuicao]): Se informada, recebe os preços de todas as vendas (no modo
+                                               paralelo, as distribuições dos blocos são combinadas nela).
+
+    Returns:
+        Tuple[Agregado, int]: Os acumuladores por produto e a quantidade de linhas inválidas ignoradas.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+        ValueError: Se o cabeçalho não for o esperado.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise FileNotFoundError(f"Arquivo CSV não encontrado: {caminho}")
+
+    with open(caminho, encoding="utf-8", newline="") as f:
+        _validar_cabecalho(f.readline())
+
+        if processos <= 1:
+            return agregar_linhas(f, distribuicao=distribuicao)
+
+    blocos = dividir_em_blocos(caminho, processos * 4)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [
+            executor.submit(
+                agregar_bloco, caminho, inicio, fim, distribuicao.copia_vazia() if distribuicao else None
+            )
+            for inicio, fim in blocos
+        ]
+        resultados = [futuro.result() for futuro in futuros]
+
+    agregado = combinar(parcial for parcial, _, _ in resultados)
+    invalidas = sum(qtd for _, qtd, _ in resultados)
+    if distribuicao is not None:
+        for _, _, parcial in resultados:
+            distribuicao.combinar(parcial)
+    return agregado, invalidas
+
+
+# =====================================
+# RELATÓRIOS
+# =====================================
+
+def totais(agregado: Agregado) -> Dict[str, float]:
+    """Retorna os totais gerais: receita, unidades, quantidade de vendas e de produtos distintos."""
+    receita = sum(acumulador[RECEITA] for acumulador in agregado.values())
+    unidades = sum(acumulador[UNIDADES] for acumulador in agregado.values())
+    return {
+        "receita": receita,
+        "unidades": unidades,
+        "vendas": sum(acumulador[VENDAS] for acumulador in agregado.values()),
+        "produtos": len(agregado),
+        "preco_medio": receita / unidades if unidades else 0.0,
+    }
+
+
+def top_produtos(agregado: Agregado, n: int = 10) -> List[Tuple[str, float, int, float]]:
+    """
+    Retorna os N produtos com maior receita, sem ordenar todos os produtos (heapq.nlargest).
+
+    Returns:
+        List[Tuple[str, float, int, float]]: Tuplas (produto, receita, unidades, preço médio).
+    """
+    maiores = heapq.nlargest(n, agregado.items(), key=lambda item: item[1][RECEITA])
+    return [
+        (produto, receita, unidades, receita / unidades if unidades else 0.0)
+        for produto, (receita, unidades, _) in maiores
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receita, unidades e preço médio por produto (vendas.csv)")
+    parser.add_argument("arquivo", nargs="?", default=str(CSV_PATH))
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de produtos no ranking")
+    parser.add_argument("--processos", type=int, default=1, help="Quantidade de processos (modo paralelo)")
+    parser.add_argument("--distribuicao", action="store_true",
+                        help="Calcula a mediana, os percentis e o histograma dos preços de venda")
+    parser.add_argument("--banco", help="Grava a distribuição dos preços neste banco SQLite (implica --distribuicao)")
+    args = parser.parse_args()
+
+    distribuicao = Distribuicao(*FAIXAS_PRECO) if args.distribuicao or args.banco else None
+    agregado, invalidas = agregar_arquivo(Path(args.arquivo), args.processos, distribuicao)
+    geral = totais(agregado)
+
+    print(f"Vendas: {geral['vendas']}")
+    print(f"Produtos distintos: {geral['produtos']}")
+    print(f"Unidades vendidas: {geral['unidades']}")
+    print(f"Receita total: R$ {geral['receita']:.2f}")
+    print(f"Preço médio por unidade: R$ {geral['preco_medio']:.2f}")
+    if invalidas:
+        print(f"Linhas inválidas ignoradas: {invalidas}")
+
+    print(f"\nTop {args.top} produtos por receita:")
+    for posicao, (produto, receita, unidades, preco_medio) in enumerate(top_produtos(agregado, args.top), start=1):
+        print(f"{posicao:>3}) {produto.ljust(35)} R$ {receita:>12.2f} {unidades:>8} un. (média R$ {preco_medio:.2f})")
+
+    if distribuicao is not None and distribuicao.quantidade:
+        print("\nPreço de venda (percentis estimados):")
+        print("  " + "  ".join(f"p{p * 100:g}: R$ {valor:.2f}" for p, valor in distribuicao.percentis()))
+        print("Histograma dos preços de venda:")
+        maior = max(distribuicao.histograma.contagens) or 1
+        for inicio, fim, quantidade in distribuicao.histograma.faixas():
+            print(f"  R$ {inicio:>7.2f} a {fim:>7.2f}: {quantidade:>8} {'#' * round(40 * quantidade / maior)}")
+        for rotulo, quantidade in (("abaixo", distribuicao.histograma.abaixo), ("acima", distribuicao.histograma.acima)):
+            if quantidade:
+                print(f"  {rotulo} do intervalo: {quantidade}")
+
+        if args.banco:
+            with sqlite3.connect(args.banco) as conn:
+                gravar_distribuicao(conn, "analise_vendas", "preco", distribuicao)
+            print(f"Distribuição gravada em {args.banco} (tb_estatisticas_distribuicoes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+# CARGAS RETOMÁVEIS DE CSV (CHECKPOINTS)
+# As cargas de CSV (exercicio01, exercicio02) apagam a tabela e leem o arquivo inteiro a cada execução. Se uma
+# carga grande for interrompida no meio (erro, queda do processo, Ctrl+C), a próxima execução começa do zero.
+#
+# Aqui a carga é feita em lotes, e cada lote é gravado na MESMA transação que o checkpoint da carga, na tabela
+# tb_checkpoints:
+#   - impressão digital do arquivo (caminho, tamanho, mtime e hash, como no cache_csv);
+#   - posição em bytes logo após o último registro gravado, a linha do arquivo e a quantidade de registros.
+#
+# Como os dados e o checkpoint são confirmados juntos, o checkpoint sempre corresponde exatamente ao que está no
+# banco. Ao executar novamente:
+#   - mesmo arquivo e carga incompleta: o arquivo é posicionado (seek) direto no checkpoint e a carga continua;
+#   - mesmo arquivo e carga concluída: nada é lido de novo;
+#   - arquivo diferente (ou sem checkpoint): a tabela é limpa e a carga começa do início.
+#
+# Outros programas podem regravar as mesmas tabelas (ex: ingestao_multipla.py, pipeline.py). Por isso:
+#   - o checkpoint guarda também a quantidade de linhas das tabelas de destino (parâmetro tabelas); se ela não
+#     for mais a mesma, a carga começa do início, mesmo que o arquivo não tenha mudado;
+#   - quem regrava as tabelas por outro caminho chama invalidar_carga(), que apaga o checkpoint e as
+#     estatísticas memoizadas da carga.
+# As estatísticas memoizadas (memoizacao.py) têm a mesma chave da carga e só valem enquanto o checkpoint valer:
+# quando a carga recomeça do início, elas são apagadas na mesma transação que limpa as tabelas.
+#
+# No modo quarentena, os contadores de linhas rejeitadas e o tamanho do arquivo de rejeitos também são gravados
+# no checkpoint: a carga retomada continua o arquivo de rejeitos e o orçamento de erros vale para a carga inteira
+# (inclusive quando a carga concluída não é lida de novo).
+#
+# Observação: registros com quebra de linha dentro de aspas são suportados (a posição só é gravada ao final de
+# um registro completo).
+#
+# Uso:
+#   python checkpoint.py              # lista os checkpoints
+#   python checkpoint.py --apagar exercicio02:notas
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import json
+import sqlite3
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from cache_csv import impressao_digital, mesmo_arquivo
+from memoizacao import CREATE_TB_MEMO_ESTATISTICAS
+from quarentena import ERROS_DE_LINHA, Quarentena
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+
+TAMANHO_LOTE = 10000
+
+# =====================================
+# SQL
+# =====================================
+CREATE_TB_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS tb_checkpoints (
+    chave TEXT PRIMARY KEY,             -- Identificador da carga (ex: "exercicio02:notas").
+    fonte TEXT NOT NULL,                -- Caminho absoluto do arquivo.
+    tamanho INTEGER NOT NULL,           -- Impressão digital do arquivo (veja cache_csv.impressao_digital).
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT,
+    posicao_bytes INTEGER NOT NULL,     -- Posição logo após o último registro gravado.
+    linha_arquivo INTEGER NOT NULL,     -- Última linha do arquivo lida (o cabeçalho é a linha 1).
+    registros INTEGER NOT NULL,         -- Quantidade de registros gravados.
+    concluida INTEGER NOT NULL,         -- 1 se o arquivo foi lido até o fim.
+    atualizado_em TEXT NOT NULL,
+    linhas_destino INTEGER,             -- Quantidade de linhas nas tabelas de destino (NULL: não verificada).
+    quarentena TEXT                     -- Estado da quarentena (JSON, veja Quarentena.estado), se houver.
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão da tabela: bancos já existentes as recebem com ALTER TABLE.
+COLUNAS_ADICIONADAS = {
+    "linhas_destino": "INTEGER",
+    "quarentena": "TEXT",
+}
+
+SALVAR_CHECKPOINT = """
+INSERT INTO tb_checkpoints
+    (chave, fonte, tamanho, mtime_ns, hash, posicao_bytes, linha_arquivo, registros, concluida, atualizado_em,
+     linhas_destino, quarentena)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (chave) DO UPDATE SET
+    fonte = excluded.fonte, tamanho = excluded.tamanho, mtime_ns = excluded.mtime_ns, hash = excluded.hash,
+    posicao_bytes = excluded.posicao_bytes, linha_arquivo = excluded.linha_arquivo,
+    registros = excluded.registros, concluida = excluded.concluida, atualizado_em = excluded.atualizado_em,
+    linhas_destino = excluded.linhas_destino, quarentena = excluded.quarentena
+"""
+
+
+class Checkpoint(NamedTuple):
+    impressao: Dict[str, object]
+    posicao_bytes: int
+    linha_arquivo: int
+    registros: int
+    concluida: bool
+    linhas_destino: Optional[int]
+    quarentena: Optional[Dict[str, object]]
+
+
+class ResultadoCarga(NamedTuple):
+    registros: int          # Total de registros da carga (incluindo os gravados em execuções anteriores).
+    registros_novos: int    # Registros gravados nesta execução.
+    bytes_lidos: int        # Bytes lidos nesta execução.
+    retomada: bool          # True se a carga continuou de um checkpoint.
+    concluida: bool         # False se a carga foi interrompida (veja o parâmetro interromper).
+    # Impressão digital (com o hash) do arquivo carregado, obtida ANTES da leitura (utilize-a em gravar_memo).
+    impressao: Dict[str, object]
+
+
+def criar_tabela_checkpoints(conn: sqlite3.Connection) -> None:
+    """Cria a tabela tb_checkpoints (ou acrescenta as colunas que faltam em uma tabela antiga)."""
+    conn.execute(CREATE_TB_CHECKPOINTS)
+    existentes = {coluna[1] for coluna in conn.execute("PRAGMA table_info(tb_checkpoints)")}
+    for coluna, tipo in COLUNAS_ADICIONADAS.items():
+        if coluna not in existentes:
+            conn.execute(f"ALTER TABLE tb_checkpoints ADD COLUMN {coluna} {tipo}")
+
+
+def ler_checkpoint(conn: sqlite3.Connection, chave: str) -> Optional[Checkpoint]:
+    """Retorna o checkpoint gravado para a carga, ou None se não houver."""
+    criar_tabela_checkpoints(conn)
+    linha = conn.execute(
+        """SELECT fonte, tamanho, mtime_ns, hash, posicao_bytes, linha_arquivo, registros, concluida, linhas_destino,
+                  quarentena
+           FROM tb_checkpoints WHERE chave = ?""",
+        (chave,)
+    ).fetchone()
+    if linha is None:
+        return None
+    fonte, tamanho, mtime_ns, hash_, posicao, linha_arquivo, registros, concluida, linhas_destino, quarentena = linha
+    impressao = {"fonte": fonte, "tamanho": tamanho, "mtime_ns": mtime_ns, "hash": hash_}
+    return Checkpoint(
+        impressao, posicao, linha_arquivo, registros, bool(concluida), linhas_destino,
+        json.loads(quarentena) if quarentena else None
+    )
+
+
+def contar_linhas(conn: sqlite3.Connection, tabelas: Sequence[str]) -> int:
+    """Quantidade total de linhas das tabelas."""
+    return sum(conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0] for tabela in tabelas)
+
+
+def _tabelas_conferem(conn: sqlite3.Connection, checkpoint: Checkpoint, tabelas: Optional[Sequence[str]]) -> bool:
+    # Sem a contagem gravada (checkpoint antigo), não há como saber se as tabelas ainda são desta carga.
+    return not tabelas or checkpoint.linhas_destino == contar_linhas(conn, tabelas)
+
+
+def _retomar_quarentena(quarentena: Quarentena, checkpoint: Checkpoint) -> None:
+    # Checkpoint gravado sem quarentena: não houve linhas rejeitadas (o primeiro erro interromperia a carga).
+    quarentena.retomar(**(checkpoint.quarentena or {"aceitas": checkpoint.registros}))
+    if checkpoint.concluida:
+        # O orçamento (desta execução) também vale para uma carga já concluída que não será lida novamente.
+        quarentena.finalizar()
+
+
+def _salvar_checkpoint(
+        cur,
+        chave: str,
+        impressao: Dict[str, object],
+        posicao: int,
+        linha_arquivo: int,
+        registros: int,
+        concluida: bool,
+        linhas_destino: Optional[int],
+        estado_quarentena: Optional[Dict[str, object]]
+    ) -> None:
+    cur.execute(SALVAR_CHECKPOINT, (
+        chave, impressao["fonte"], impressao["tamanho"], impressao["mtime_ns"], impressao["hash"],
+        posicao, linha_arquivo, registros, int(concluida),
+        datetime.now(timezone.utc).isoformat(timespec="seconds"), linhas_destino,
+        json.dumps(estado_quarentena, ensure_ascii=False) if estado_quarentena is not None else None,
+    ))
+
+
+def apagar_checkpoint(conn: sqlite3.Connection, chave: str) -> bool:
+    """Apaga o checkpoint da carga (a próxima execução começa do início). Retorna False se não existia."""
+    criar_tabela_checkpoints(conn)
+    with conn:
+        return conn.execute("DELETE FROM tb_checkpoints WHERE chave = ?", (chave,)).rowcount > 0
+
+
+def _apagar_memo(conn: sqlite3.Connection, chave: str) -> None:
+    conn.execute(CREATE_TB_MEMO_ESTATISTICAS)
+    conn.execute("DELETE FROM tb_memo_estatisticas WHERE chave = ?", (chave,))
+
+
+def invalidar_carga(conn: sqlite3.Connection, chave: str) -> None:
+    """
+    Apaga o checkpoint e as estatísticas memoizadas da carga. Deve ser chamada por quem regrava as tabelas da
+    carga por outro caminho; o commit fica a cargo de quem chama (junto com os dados regravados).
+    """
+    criar_tabela_checkpoints(conn)
+    conn.execute("DELETE FROM tb_checkpoints WHERE chave = ?", (chave,))
+    _apagar_memo(conn, chave)
+
+
+def carga_concluida(
+        conn: sqlite3.Connection,
+        chave: str,
+        impressao: Dict[str, object],
+        tabelas: Optional[Sequence[str]] = None,
+        quarentena: Optional[Quarentena] = None
+    ) -> bool:
+    """
+    Retorna True se a carga deste arquivo foi concluída e as tabelas de destino ainda são as gravadas por ela
+    (mesma verificação que carregar_csv_retomavel faz antes de não ler o arquivo de novo).
+
+    Utilizada antes de consultar as estatísticas memoizadas da carga: elas só valem com o checkpoint válido.
+    Se a quarentena for informada, ela recebe os contadores gravados no checkpoint e o orçamento de erros é
+    verificado, como se a carga tivesse sido executada agora.
+
+    Raises:
+        OrcamentoErrosExcedido: Se as linhas rejeitadas pela carga ultrapassarem o orçamento da quarentena.
+    """
+    checkpoint = ler_checkpoint(conn, chave)
+    concluida = (
+        checkpoint is not None
+        and checkpoint.concluida
+        and mesmo_arquivo(impressao, checkpoint.impressao)
+        and _tabelas_conferem(conn, checkpoint, tabelas)
+    )
+    if concluida and quarentena is not None:
+        _retomar_quarentena(quarentena, checkpoint)
+    return concluida
+
+
+class _LeitorPosicionado:
+    """Itera as linhas (texto) de um arquivo binário, acompanhando a posição em bytes e a linha atual."""
+
+    def __init__(self, arquivo, posicao: int, linha: int, encoding: str):
+        self.arquivo = arquivo
+        self.posicao = posicao
+        self.linha = linha
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[str]:
+        for bruta in self.arquivo:
+            self.posicao += len(bruta)
+            self.linha += 1
+            yield bruta.decode(self.encoding)
+
+
+def carregar_csv_retomavel(
+        conn: sqlite3.Connection,
+        caminho: Path,
+        chave: str,
+        converter: Callable[[int, Dict[str, str]], object],
+        gravar_lote: Callable[[sqlite3.Cursor, List[object]], None],
+        limpar: Callable[[sqlite3.Cursor], None],
+        tamanho_lote: int = TAMANHO_LOTE,
+        delimitador: str = ";",
+        encoding: str = "utf-8",
+        interromper: Optional[Callable[[], bool]] = None,
+        quarentena: Optional[Quarentena] = None,
+        tabelas: Optional[Sequence[str]] = None
+    ) -> ResultadoCarga:
+    """
+    Carrega um CSV no banco em lotes, gravando um checkpoint a cada commit (veja o início do módulo).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco (as tabelas de destino já devem existir).
+        caminho (Path): Arquivo CSV, com cabeçalho.
+        chave (str): Identificador da carga na tabela tb_checkpoints.
+        converter (Callable[[int, Dict[str, str]], object]): Recebe o número da linha no arquivo e o registro
+            (nomes das colunas em minúsculas, sem espaços nas pontas) e retorna o item a ser gravado.
+        gravar_lote (Callable[[sqlite3.Cursor, List[object]], None]): Grava uma lista de itens convertidos.
+        limpar (Callable[[sqlite3.Cursor], None]): Apaga os dados de uma carga anterior (quando a carga começa do
+            início). É executado na mesma transação do primeiro checkpoint.
+        tamanho_lote (int): Quantidade de registros por commit.
+        delimitador (str): Delimitador do CSV.
+        encoding (str): Codificação do arquivo.
+        interromper (Optional[Callable[[], bool]]): Consultado após cada commit; se retornar True, a carga para
+            (e pode ser retomada depois).
+        quarentena (Optional[Quarentena]): Se informada, as linhas que o converter não conseguir converter são
+            registradas nela e ignoradas, em vez de interromper a carga.
+        tabelas (Optional[Sequence[str]]): Tabelas gravadas por gravar_lote. A quantidade de linhas delas é
+            gravada no checkpoint e conferida antes de aproveitá-lo (veja o início do módulo).
+
+    Returns:
+        ResultadoCarga: Quantidade de registros, bytes lidos e se a carga foi retomada e concluída.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+        ValueError: Se o arquivo não possuir cabeçalho. Sem quarentena, os erros do converter são propagados;
+                    os lotes já confirmados permanecem gravados e a carga pode ser retomada após a correção.
+        OrcamentoErrosExcedido: Se a quarentena ultrapassar o orçamento de erros.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise FileNotFoundError(f"Arquivo CSV não encontrado: {caminho}")
+
+    checkpoint = ler_checkpoint(conn, chave)
+    impressao = impressao_digital(caminho, calcular_hash=False)
+    retomada = (
+        checkpoint is not None
+        and mesmo_arquivo(impressao, checkpoint.impressao)
+        and _tabelas_conferem(conn, checkpoint, tabelas)
+    )
+
+    # Estado da quarentena gravado com o checkpoint (mantido como está se esta execução não tiver quarentena).
+    estado_quarentena = checkpoint.quarentena if retomada else None
+    if retomada:
+        # O checkpoint guarda o hash do arquivo; a impressão atual o reaproveita.
+        impressao["hash"] = checkpoint.impressao["hash"]
+        if quarentena is not None:
+            # Os contadores e o arquivo de rejeitos continuam de onde a carga parou.
+            _retomar_quarentena(quarentena, checkpoint)
+        if checkpoint.concluida:
+            return ResultadoCarga(checkpoint.registros, 0, 0, True, True, impressao)
+
+    with open(caminho, "rb") as f:
+        cabecalho_bruto = f.readline()
+        if not cabecalho_bruto.strip():
+            raise ValueError(f"O arquivo {caminho} não possui cabeçalho.")
+        # utf-8-sig: ignora o BOM que alguns programas (ex: Excel) gravam no início do arquivo.
+        cabecalho = next(csv.reader(
+            [cabecalho_bruto.decode("utf-8-sig" if encoding == "utf-8" else encoding)], delimiter=delimitador
+        ))
+        colunas = [coluna.strip().lower() for coluna in cabecalho]
+
+        cur = conn.cursor()
+        if retomada:
+            posicao, linha_arquivo, registros = checkpoint.posicao_bytes, checkpoint.linha_arquivo, checkpoint.registros
+            linhas_destino = checkpoint.linhas_destino
+            f.seek(posicao)
+        else:
+            # Carga nova: o hash é calculado para reconhecer o arquivo mesmo que o mtime mude.
+            impressao = impressao_digital(caminho)
+            posicao, linha_arquivo, registros = f.tell(), 1, 0
+            limpar(cur)
+            # As estatísticas memoizadas eram da carga anterior.
+            _apagar_memo(conn, chave)
+            linhas_destino = contar_linhas(conn, tabelas) if tabelas else None
+            if quarentena is not None:
+                estado_quarentena = quarentena.estado()
+            _salvar_checkpoint(
+                cur, chave, impressao, posicao, linha_arquivo, registros, False, linhas_destino, estado_quarentena
+            )
+            conn.commit()
+
+        def gravar(itens: List[object]) -> None:
+            nonlocal linhas_destino
+            # total_changes: linhas inseridas/alteradas por esta conexão (evita um COUNT(*) a cada lote).
+            antes = conn.total_changes
+            gravar_lote(cur, itens)
+            if linhas_destino is not None:
+                linhas_destino += conn.total_changes - antes
+
+        posicao_inicial, registros_iniciais = posicao, registros
+        leitor = _LeitorPosicionado(f, posicao, linha_arquivo, encoding)
+        reader = csv.reader(leitor, delimiter=delimitador)
+
+        lote: List[object] = []
+        concluida = True
+        for campos in reader:
+            if not campos:
+                continue
+            registro = dict(zip(colunas, campos))
+            if quarentena is None:
+                lote.append(converter(leitor.linha, registro))
+            else:
+                try:
+                    lote.append(converter(leitor.linha, registro))
+                except ERROS_DE_LINHA as e:
+                    quarentena.rejeitar(leitor.linha, campos, e)
+                    continue
+            if len(lote) >= tamanho_lote:
+                gravar(lote)
+                registros += len(lote)
+                if quarentena is not None:
+                    # estado() descarrega os rejeitos no disco antes de gravar o tamanho do arquivo.
+                    quarentena.aceitar(len(lote))
+                    estado_quarentena = quarentena.estado()
+                lote = []
+                _salvar_checkpoint(
+                    cur, chave, impressao, leitor.posicao, leitor.linha, registros, False, linhas_destino,
+                    estado_quarentena
+                )
+                conn.commit()
+                if interromper is not None and interromper():
+                    concluida = False
+                    break
+
+        if concluida:
+            if lote:
+                gravar(lote)
+                registros += len(lote)
+            if quarentena is not None:
+                # Verifica o orçamento antes de confirmar o último lote e marcar a carga como concluída.
+                quarentena.aceitar(len(lote))
+                quarentena.finalizar()
+                estado_quarentena = quarentena.estado()
+            _salvar_checkpoint(
+                cur, chave, impressao, leitor.posicao, leitor.linha, registros, True, linhas_destino, estado_quarentena
+            )
+            conn.commit()
+
+    return ResultadoCarga(
+        registros, registros - registros_iniciais, leitor.posicao - posicao_inicial, retomada, concluida, impressao
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta e apaga os checkpoints das cargas de CSV")
+    parser.add_argument("--banco", default=str(DB_PATH))
+    parser.add_argument("--apagar", metavar="CHAVE", help="Apaga o checkpoint (a próxima carga começa do início)")
+    args = parser.parse_args()
+
+    with sqlite3.connect(args.banco) as conn:
+        if args.apagar:
+            if apagar_checkpoint(conn, args.apagar):
+                print(f"Checkpoint apagado: {args.apagar}")
+            else:
+                print(f"Checkpoint não encontrado: {args.apagar}")
+            return
+
+        criar_tabela_checkpoints(conn)
+        linhas = conn.execute(
+            """SELECT chave, fonte, posicao_bytes, tamanho, registros, concluida, atualizado_em
+               FROM tb_checkpoints ORDER BY chave"""
+        ).fetchall()
+        if not linhas:
+            print("Nenhum checkpoint gravado.")
+        for chave, fonte, posicao, tamanho, registros, concluida, atualizado_em in linhas:
+            situacao = "concluída" if concluida else f"interrompida em {posicao / max(tamanho, 1):.1%}"
+            print(f"{chave}: {fonte} - {registros} registros, {situacao} ({atualizado_em})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# CONSULTAS SOMENTE LEITURA EM PARALELO COM AS CARGAS
+# Os painéis consultam tb_cursos, tb_notas e as tabelas de estatísticas enquanto as cargas gravam no banco.
+# No modo de journal padrão (rollback journal), o escritor bloqueia os leitores durante o commit e
+# as consultas falham com "database is locked".
+#
+# Este módulo oferece uma API de leitura:
+#   - o banco é colocado em modo WAL (write-ahead log, configuração gravada no próprio arquivo): o escritor
+#     acrescenta as alterações ao arquivo -wal e cada leitor enxerga um "retrato" (snapshot) consistente do
+#     banco, sem bloquear e sem ser bloqueado pelo escritor;
+#   - as conexões são abertas em modo somente leitura (URI mode=ro + PRAGMA query_only), com leitura por memória
+#     mapeada (PRAGMA mmap_size) e reaproveitadas entre as requisições (pool);
+#   - as consultas possuem nome (CONSULTAS) e são sempre o mesmo texto SQL, então ficam no cache de comandos
+#     preparados de cada conexão (o SQL não é interpretado novamente a cada requisição);
+#   - várias consultas podem ser feitas no mesmo snapshot (LeitorBanco.snapshot), sem enxergar um commit do
+#     escritor feito entre elas.
+#
+# As consultas são divididas em grupos, cada um com o seu banco padrão: o exercicio01.py grava tb_cursos e
+# tb_estatisticas_cursos no db.sqlite3 da raiz do repositório, e o exercicio02.py grava as notas no db.sqlite3
+# deste diretório (GRUPOS).
+#
+# Uso:
+#   leitor = LeitorBanco(DB_PATH)
+#   leitor.consultar("estatisticas_notas")
+#   with leitor.snapshot() as consulta:
+#       cursos = consulta("cursos")
+#       estatisticas = consulta("estatisticas_cursos")
+#
+#   python consultas_leitura.py estatisticas_notas
+#   python consultas_leitura.py curso id=1                  # grupo "cursos": db.sqlite3 da raiz
+#   python consultas_leitura.py --teste-carga --threads 8 --segundos 5 --com-escritor
+#   python consultas_leitura.py --teste-carga --grupo cursos
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from estatisticas_streaming import TDigest
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+# O exercicio01.py grava os cursos no db.sqlite3 da raiz do repositório.
+DB_CURSOS_PATH = BASE_DIR.parent / "db.sqlite3"
+
+# Tamanho da região do arquivo mapeada em memória por conexão (as páginas são lidas direto do cache do sistema
+# operacional, sem cópia para o cache do SQLite).
+MMAP_SIZE = 256 * 1024 * 1024
+# Quantidade máxima de conexões abertas no pool.
+MAX_CONEXOES = 8
+# Tempo máximo de espera por uma conexão livre do pool ou por um bloqueio do banco, em segundos.
+TIMEOUT = 5.0
+
+# =====================================
+# CONSULTAS
+# =====================================
+# Nome -> SQL. Os parâmetros são nomeados (:nome) para que as chamadas fiquem legíveis.
+CONSULTAS: Dict[str, str] = {
+    "cursos": "SELECT id, curso, carga_horaria, preco FROM tb_cursos ORDER BY id",
+    "curso": "SELECT id, curso, carga_horaria, preco FROM tb_cursos WHERE id = :id",
+    "buscar_cursos": """
+        SELECT id, curso, carga_horaria, preco FROM tb_cursos
+        WHERE curso LIKE '%' || :trecho || '%' ORDER BY curso""",
+    "estatisticas_cursos": """
+        SELECT qtd_cursos, curso_maior_carga_horaria, curso_com_maior_valor FROM tb_estatisticas_cursos""",
+    "aluno": "SELECT id, nome, nota1, nota2, nota3, nota4, nota5 FROM tb_notas WHERE id = :id",
+    "buscar_alunos": "SELECT id, nome FROM tb_notas WHERE nome LIKE :trecho || '%' ORDER BY nome LIMIT 50",
+    "notas_aluno": """
+        SELECT avaliacao, nota FROM tb_notas_longo WHERE aluno_id = :aluno_id ORDER BY avaliacao""",
+    "estatisticas_notas": """
+        SELECT quantidade_de_alunos, media_geral, maior_media, aluno_maior_media FROM tb_estatisticas_notas""",
+    "distribuicao": """
+        SELECT estatistica, limite_inferior, limite_superior, valor FROM tb_estatisticas_distribuicoes
+        WHERE fonte = :fonte AND medida = :medida ORDER BY rowid""",
+}
+
+# Grupo -> (banco padrão, consultas do teste de carga com os seus parâmetros, demais consultas do grupo).
+GRUPOS: Dict[str, Tuple[Path, Sequence[Tuple[str, Dict[str, object]]], Sequence[str]]] = {
+    "cursos": (
+        DB_CURSOS_PATH,
+        (("cursos", {}), ("curso", {"id": 1}), ("estatisticas_cursos", {})),
+        ("buscar_cursos",),
+    ),
+    "notas": (
+        DB_PATH,
+        (
+            ("aluno", {"id": 1}), ("estatisticas_notas", {}),
+            ("distribuicao", {"fonte": "exercicio02", "medida": "media_aparada"}),
+        ),
+        ("buscar_alunos", "notas_aluno"),
+    ),
+}
+
+
+def grupo_da_consulta(nome: str) -> str:
+    """Retorna o grupo (chave de GRUPOS) de uma consulta de CONSULTAS."""
+    for grupo, (_, carga, demais) in GRUPOS.items():
+        if nome in demais or any(nome == consulta for consulta, _ in carga):
+            return grupo
+    raise KeyError(nome)
+
+
+def ativar_wal(caminho: Path) -> str:
+    """
+    Coloca o banco em modo WAL (a configuração fica gravada no arquivo e vale para todas as conexões).
+
+    Returns:
+        str: O modo de journal após a alteração ("wal").
+    """
+    conn = sqlite3.connect(caminho, timeout=TIMEOUT)
+    try:
+        return conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _linha_como_dict(cursor: sqlite3.Cursor, linha: tuple) -> dict:
+    return {coluna[0]: valor for coluna, valor in zip(cursor.description, linha)}
+
+
+class LeitorBanco:
+    """Pool de conexões somente leitura com consultas preparadas (veja o início do módulo)."""
+
+    def __init__(
+            self,
+            caminho: Path = DB_PATH,
+            max_conexoes: int = MAX_CONEXOES,
+            mmap_size: int = MMAP_SIZE,
+            wal: bool = True
+        ):
+        """
+        Args:
+            caminho (Path): Banco de dados SQLite (deve existir).
+            max_conexoes (int): Quantidade máxima de conexões abertas ao mesmo tempo.
+            mmap_size (int): Bytes do arquivo mapeados em memória por conexão (0 desliga).
+            wal (bool): Se True, coloca o banco em modo WAL (necessário para não bloquear com o escritor).
+
+        Raises:
+            FileNotFoundError: Se o banco não existir.
+        """
+        self.caminho = Path(caminho).resolve()
+        if not self.caminho.exists():
+            raise FileNotFoundError(f"Banco de dados não encontrado: {self.caminho}")
+        if wal:
+            ativar_wal(self.caminho)
+        self.max_conexoes = max_conexoes
+        self.mmap_size = mmap_size
+        # Conexões livres. LIFO: a conexão mais recente (com o cache "quente") é reutilizada primeiro.
+        self._livres: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._abertas: List[sqlite3.Connection] = []
+        self._trava = threading.Lock()
+        self._fechado = False
+
+    def _abrir(self) -> sqlite3.Connection:
+        # mode=ro: o SQLite recusa qualquer escrita nesta conexão. check_same_thread=False: a conexão é usada
+        # por uma thread de cada vez, mas não necessariamente pela que a criou.
+        conn = sqlite3.connect(
+            f"{self.caminho.as_uri()}?mode=ro", uri=True, timeout=TIMEOUT,
+            check_same_thread=False, cached_statements=len(CONSULTAS) * 2,
+            # Transações controladas manualmente (BEGIN/COMMIT do snapshot).
+            isolation_level=None
+        )
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        return conn
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool (abrindo uma nova se houver menos de max_conexoes)."""
+        if self._fechado:
+            raise RuntimeError("O leitor já foi fechado.")
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            with self._trava:
+                conn = self._abrir() if len(self._abertas) < self.max_conexoes else None
+                if conn is not None:
+                    self._abertas.append(conn)
+            if conn is None:
+                try:
+                    conn = self._livres.get(timeout=TIMEOUT)
+                except queue.Empty:
+                    mensagem = f"Nenhuma conexão livre após {TIMEOUT}s ({self.max_conexoes} em uso)."
+                    raise TimeoutError(mensagem) from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._livres.put(conn)
+
+    def consultar(self, nome: str, **parametros) -> List[dict]:
+        """
+        Executa uma consulta de CONSULTAS e retorna as linhas como dicionários.
+
+        Raises:
+            KeyError: Se a consulta não existir.
+            sqlite3.OperationalError: Se a tabela ainda não existir (a carga correspondente não foi executada).
+        """
+        sql = CONSULTAS[nome]
+        with self.conexao() as conn:
+            cursor = conn.execute(sql, parametros)
+            return [_linha_como_dict(cursor, linha) for linha in cursor.fetchall()]
+
+    def consultar_um(self, nome: str, **parametros) -> Optional[dict]:
+        """Como consultar(), mas retorna apenas a primeira linha (ou None)."""
+        linhas = self.consultar(nome, **parametros)
+        return linhas[0] if linhas else None
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Callable[..., List[dict]]]:
+        """
+        Executa várias consultas no mesmo retrato do banco. Retorna uma função consulta(nome, **parametros).
+
+        No modo WAL, o retrato é definido pela primeira leitura após o BEGIN: commits feitos pelo escritor
+        depois disso não aparecem nas consultas seguintes do bloco 'with'.
+        """
+        with self.conexao() as conn:
+            conn.execute("BEGIN")
+
+            def consulta(nome: str, **parametros) -> List[dict]:
+                cursor = conn.execute(CONSULTAS[nome], parametros)
+                return [_linha_como_dict(cursor, linha) for linha in cursor.fetchall()]
+
+            try:
+                yield consulta
+            finally:
+                conn.execute("COMMIT")
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões do pool (não deve haver consultas em andamento)."""
+        self._fechado = True
+        with self._trava:
+            for conn in self._abertas:
+                conn.close()
+            self._abertas.clear()
+
+    def __enter__(self) -> "LeitorBanco":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+# =====================================
+# TESTE DE CARGA
+# =====================================
+
+def teste_de_carga(
+        leitor: LeitorBanco,
+        consultas: Sequence[Tuple[str, Dict[str, object]]],
+        threads: int = 4,
+        segundos: float = 5.0,
+        com_escritor: bool = False
+    ) -> Dict[str, object]:
+    """
+    Executa as consultas repetidamente em várias threads (e, opcionalmente, um escritor gravando ao mesmo
+    tempo) e mede a latência de cada consulta.
+
+    Antes do teste, cada consulta é executada uma vez: uma consulta que falha sempre (ex: tabela inexistente no
+    banco informado) interrompe o teste, em vez de ser repetida em laço e medir apenas a falha. As consultas que
+    falham durante o teste (ex: bloqueio do escritor) também entram na latência e na taxa de erros.
+
+    O escritor grava em uma tabela própria (tb_teste_leitura), apagada no final.
+
+    Args:
+        leitor (LeitorBanco): Leitor do banco testado.
+        consultas (Sequence[Tuple[str, Dict[str, object]]]): Consultas (nome, parâmetros), executadas em rodízio.
+        threads (int): Quantidade de threads leitoras.
+        segundos (float): Duração do teste.
+        com_escritor (bool): Se True, um escritor grava no banco durante o teste.
+
+    Returns:
+        Dict[str, object]: Quantidade de consultas, consultas por segundo, erros e taxa de erros, commits do
+                           escritor e a latência (p50, p95 e p99 em ms).
+
+    Raises:
+        ValueError: Se alguma consulta falhar antes do teste.
+    """
+    for nome, parametros in consultas:
+        try:
+            leitor.consultar(nome, **parametros)
+        except sqlite3.Error as e:
+            raise ValueError(f"A consulta '{nome}' falhou em {leitor.caminho}: {e}") from e
+
+    fim = time.monotonic() + segundos
+    latencias: List[TDigest] = []
+    erros: List[str] = []
+    commits = [0]
+
+    def ler():
+        digest = TDigest()
+        latencias.append(digest)
+        i = 0
+        while time.monotonic() < fim:
+            nome, parametros = consultas[i % len(consultas)]
+            i += 1
+            inicio = time.perf_counter()
+            try:
+                leitor.consultar(nome, **parametros)
+            except sqlite3.Error as e:
+                erros.append(f"{nome}: {e}")
+            digest.adicionar((time.perf_counter() - inicio) * 1000)
+
+    def escrever():
+        conn = sqlite3.connect(leitor.caminho, timeout=TIMEOUT)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS tb_teste_leitura (id INTEGER PRIMARY KEY, valor REAL)")
+            while time.monotonic() < fim:
+                linhas = ((float(i),) for i in range(1000))
+                conn.executemany("INSERT INTO tb_teste_leitura (valor) VALUES (?)", linhas)
+                conn.commit()
+                commits[0] += 1
+            conn.execute("DROP TABLE tb_teste_leitura")
+            conn.commit()
+        except sqlite3.Error as e:
+            erros.append(f"escritor: {e}")
+        finally:
+            conn.close()
+
+    trabalhadores = [threading.Thread(target=ler) for _ in range(threads)]
+    if com_escritor:
+        trabalhadores.append(threading.Thread(target=escrever))
+    inicio = time.perf_counter()
+    for t in trabalhadores:
+        t.start()
+    for t in trabalhadores:
+        t.join()
+    duracao = time.perf_counter() - inicio
+
+    total = TDigest()
+    for digest in latencias:
+        total.combinar(digest)
+    resultado = {
+        "consultas": total.quantidade,
+        "consultas_por_s": total.quantidade / duracao if duracao else 0.0,
+        "commits_escritor": commits[0],
+    }
+    if total.quantidade:
+        resultado.update({f"p{p}_ms": total.quantil(p / 100) for p in (50, 95, 99)})
+    resultado.update({
+        "erros": len(erros),
+        "taxa_erros": len(erros) / total.quantidade if total.quantidade else 0.0,
+        "primeiro_erro": erros[0] if erros else None,
+    })
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas somente leitura no db.sqlite3 (modo WAL)")
+    parser.add_argument("consulta", nargs="?", choices=sorted(CONSULTAS), help="Consulta a executar")
+    parser.add_argument("parametros", nargs="*", metavar="NOME=VALOR", help="Parâmetros da consulta")
+    parser.add_argument("--banco", help="Banco de dados (padrão: o banco do grupo da consulta, veja GRUPOS)")
+    parser.add_argument("--grupo", choices=sorted(GRUPOS), default="notas",
+                        help="Grupo de consultas do teste de carga (padrão: notas)")
+    parser.add_argument("--teste-carga", action="store_true", help="Mede a latência com várias threads")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--com-escritor", action="store_true", help="Teste de carga com um escritor simultâneo")
+    args = parser.parse_args()
+
+    if args.consulta is None and not args.teste_carga:
+        parser.error("informe a consulta ou --teste-carga")
+    grupo = grupo_da_consulta(args.consulta) if args.consulta else args.grupo
+    parametros = dict(parametro.split("=", 1) for parametro in args.parametros)
+
+    with LeitorBanco(Path(args.banco or GRUPOS[grupo][0]), max_conexoes=max(args.threads, 1)) as leitor:
+        if args.teste_carga:
+            consultas = [(args.consulta, parametros)] if args.consulta else GRUPOS[grupo][1]
+            try:
+                resultado = teste_de_carga(leitor, consultas, args.threads, args.segundos, args.com_escritor)
+            except ValueError as e:
+                parser.exit(1, f"Erro: {e}\n")
+            for chave, valor in resultado.items():
+                print(f"{chave}: {valor:.3f}" if isinstance(valor, float) else f"{chave}: {valor}")
+            return
+
+        for linha in leitor.consultar(args.consulta, **parametros):
+            print(linha)
+
+
+if __name__ == "__main__":
+    main()
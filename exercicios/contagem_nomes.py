@@ -0,0 +1,316 @@
+# CONTAGEM DE NOMES - nomes.txt
+# Calcula a quantidade de nomes distintos e os nomes mais frequentes de um arquivo com um nome por linha.
+#
+# Dois modos de contagem:
+#   - exato: percorre o arquivo em streaming acumulando um Counter. A memória cresce com a quantidade de
+#     nomes distintos.
+#   - aproximado: utiliza estruturas probabilísticas (sketches) de tamanho fixo, independente do tamanho do
+#     arquivo:
+#       * HyperLogLog para estimar a quantidade de nomes distintos (erro relativo configurável);
+#       * Count-Min Sketch para estimar a frequência de cada nome (erro <= epsilon * total, com probabilidade
+#         1 - delta) + uma lista de candidatos "heavy hitters" para o top-K.
+#
+# Todas as estruturas podem ser combinadas (merge). Assim, no modo paralelo, cada processo conta um bloco do
+# arquivo e os resultados são combinados no final.
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import hashlib
+import math
+
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# Reaproveitamos a divisão do arquivo em blocos de bytes utilizada na análise de vendas.
+from analise_vendas import dividir_em_blocos, ler_linhas_bloco
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+TXT_PATH = BASE_DIR / "nomes.txt"
+
+MASCARA_64 = (1 << 64) - 1
+
+
+def hash_nome(nome: str) -> int:
+    """Retorna um hash de 128 bits do nome. Os 64 bits menores são usados no HyperLogLog e os maiores no Count-Min."""
+    return int.from_bytes(hashlib.blake2b(nome.encode("utf-8"), digest_size=16).digest(), "little")
+
+
+def ler_nomes(linhas: Iterable[str]) -> Iterable[str]:
+    """Remove espaços e quebras de linha, ignorando linhas vazias."""
+    for linha in linhas:
+        nome = linha.strip()
+        if nome:
+            yield nome
+
+
+# =====================================
+# HYPERLOGLOG - QUANTIDADE DE DISTINTOS
+# =====================================
+
+class HyperLogLog:
+    """
+    Estimador da quantidade de elementos distintos.
+
+    Utiliza m = 2^precisao registradores de 1 byte. O erro relativo padrão é de aproximadamente 1.04 / sqrt(m).
+    """
+
+    def __init__(self, precisao: int = 14):
+        if not 4 <= precisao <= 18:
+            raise ValueError("A precisão do HyperLogLog deve estar entre 4 e 18.")
+        self.precisao = precisao
+        self.m = 1 << precisao
+        self.registradores = bytearray(self.m)
+
+    @classmethod
+    def para_erro(cls, erro_relativo: float) -> "HyperLogLog":
+        """Cria um HyperLogLog com a menor precisão que atende ao erro relativo informado."""
+        precisao = math.ceil(math.log2((1.04 / erro_relativo) ** 2))
+        return cls(min(18, max(4, precisao)))
+
+    def adicionar_hash(self, h: int) -> None:
+        h &= MASCARA_64
+        bits_restantes = 64 - self.precisao
+        indice = h >> bits_restantes
+        resto = h & ((1 << bits_restantes) - 1)
+        # Posição do primeiro bit 1 (contando a partir da esquerda) dos bits restantes.
+        rank = bits_restantes - resto.bit_length() + 1
+        if rank > self.registradores[indice]:
+            self.registradores[indice] = rank
+
+    def adicionar(self, nome: str) -> None:
+        self.adicionar_hash(hash_nome(nome))
+
+    def estimar(self) -> float:
+        m = self.m
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimativa = alpha * m * m / sum(2.0 ** -r for r in self.registradores)
+
+        # Correção para cardinalidades pequenas (linear counting).
+        zeros = self.registradores.count(0)
+        if estimativa <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return estimativa
+
+    def combinar(self, outro: "HyperLogLog") -> None:
+        if self.precisao != outro.precisao:
+            raise ValueError("Só é possível combinar HyperLogLogs com a mesma precisão.")
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+
+
+# =====================================
+# COUNT-MIN SKETCH - FREQUÊNCIAS
+# =====================================
+
+class CountMinSketch:
+    """
+    Estimador de frequências. A frequência estimada nunca é menor que a real e, com probabilidade 1 - delta,
+    excede a real em no máximo epsilon * total.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.largura = math.ceil(math.e / epsilon)
+        self.profundidade = math.ceil(math.log(1 / delta))
+        self.tabelas = [array("Q", bytes(8 * self.largura)) for _ in range(self.profundidade)]
+        self.total = 0
+
+    def _posicoes(self, h: int) -> Iterable[int]:
+        # Double hashing: a partir de dois hashes geramos uma posição diferente para cada linha da tabela.
+        h1 = h >> 64
+        h2 = (h >> 32) | 1
+        largura = self.largura
+        return ((h1 + i * h2) % largura for i in range(self.profundidade))
+
+    def adicionar_hash(self, h: int, quantidade: int = 1) -> None:
+        for tabela, posicao in zip(self.tabelas, self._posicoes(h)):
+            tabela[posicao] += quantidade
+        self.total += quantidade
+
+    def estimar_hash(self, h: int) -> int:
+        return min(tabela[posicao] for tabela, posicao in zip(self.tabelas, self._posicoes(h)))
+
+    def adicionar(self, nome: str, quantidade: int = 1) -> None:
+        self.adicionar_hash(hash_nome(nome), quantidade)
+
+    def estimar(self, nome: str) -> int:
+        return self.estimar_hash(hash_nome(nome))
+
+    def combinar(self, outro: "CountMinSketch") -> None:
+        if (self.largura, self.profundidade) != (outro.largura, outro.profundidade):
+            raise ValueError("Só é possível combinar Count-Min Sketches com as mesmas dimensões.")
+        for tabela, outra in zip(self.tabelas, outro.tabelas):
+            for i, valor in enumerate(outra):
+                if valor:
+                    tabela[i] += valor
+        self.total += outro.total
+
+
+# =====================================
+# CONTADOR APROXIMADO (HLL + CMS + HEAVY HITTERS)
+# =====================================
+
+class ContadorAproximado:
+    """
+    Combina HyperLogLog, Count-Min Sketch e uma lista limitada de candidatos a nomes mais frequentes.
+
+    A lista de candidatos guarda no máximo 2 * capacidade nomes; quando esse limite é atingido, ficam apenas
+    os "capacidade" nomes com maior frequência estimada.
+    """
+
+    def __init__(self, erro_distintos: float = 0.01, epsilon: float = 0.001, delta: float = 0.01,
+                 capacidade: int = 100):
+        self.hll = HyperLogLog.para_erro(erro_distintos)
+        self.cms = CountMinSketch(epsilon, delta)
+        self.capacidade = capacidade
+        self.candidatos: Dict[str, int] = {}
+
+    def adicionar(self, nome: str) -> None:
+        h = hash_nome(nome)
+        self.hll.adicionar_hash(h)
+        self.cms.adicionar_hash(h)
+
+        candidatos = self.candidatos
+        candidatos[nome] = self.cms.estimar_hash(h)
+        if len(candidatos) > 2 * self.capacidade:
+            self._podar()
+
+    def _podar(self) -> None:
+        maiores = sorted(self.candidatos.items(), key=lambda item: item[1], reverse=True)[:self.capacidade]
+        self.candidatos = dict(maiores)
+
+    def combinar(self, outro: "ContadorAproximado") -> None:
+        self.hll.combinar(outro.hll)
+        self.cms.combinar(outro.cms)
+        # Depois de combinar os sketches, reestimamos todos os candidatos com o Count-Min combinado.
+        nomes = set(self.candidatos) | set(outro.candidatos)
+        self.candidatos = {nome: self.cms.estimar(nome) for nome in nomes}
+        self._podar()
+
+    def distintos(self) -> int:
+        return round(self.hll.estimar())
+
+    def mais_frequentes(self, k: int = 10) -> List[Tuple[str, int]]:
+        return sorted(self.candidatos.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    @property
+    def total(self) -> int:
+        return self.cms.total
+
+
+# =====================================
+# CONTAGEM DE UM ARQUIVO
+# =====================================
+
+def contar_exato_linhas(linhas: Iterable[str]) -> Counter:
+    return Counter(ler_nomes(linhas))
+
+
+def contar_aproximado_linhas(linhas: Iterable[str], **parametros) -> ContadorAproximado:
+    contador = ContadorAproximado(**parametros)
+    for nome in ler_nomes(linhas):
+        contador.adicionar(nome)
+    return contador
+
+
+def _contar_bloco(caminho: Path, inicio: int, fim: int, modo: str, parametros: dict):
+    linhas = ler_linhas_bloco(caminho, inicio, fim)
+    if modo == "exato":
+        return contar_exato_linhas(linhas)
+    return contar_aproximado_linhas(linhas, **parametros)
+
+
+def contar_arquivo(caminho: Path = TXT_PATH, modo: str = "exato", processos: int = 1, **parametros):
+    """
+    Conta os nomes de um arquivo.
+
+    Args:
+        caminho (Path): Arquivo com um nome por linha.
+        modo (str): "exato" (Counter) ou "aproximado" (sketches).
+        processos (int): Quantidade de processos. Com mais de 1, cada processo conta um bloco do arquivo.
+        **parametros: Parâmetros do ContadorAproximado (erro_distintos, epsilon, delta, capacidade).
+
+    Returns:
+        Counter | ContadorAproximado: O resultado da contagem.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+        ValueError: Se o modo for desconhecido.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {caminho}")
+    if modo not in ("exato", "aproximado"):
+        raise ValueError(f"Modo '{modo}' desconhecido. Utilize 'exato' ou 'aproximado'.")
+
+    if processos <= 1:
+        with open(caminho, encoding="utf-8") as f:
+            if modo == "exato":
+                return contar_exato_linhas(f)
+            return contar_aproximado_linhas(f, **parametros)
+
+    blocos = dividir_em_blocos(caminho, processos, pular_cabecalho=False)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(_contar_bloco, caminho, inicio, fim, modo, parametros) for inicio, fim in blocos]
+        parciais = [futuro.result() for futuro in futuros]
+
+    # Começa de uma contagem vazia: um arquivo vazio não gera nenhum bloco.
+    resultado = Counter() if modo == "exato" else ContadorAproximado(**parametros)
+    for parcial in parciais:
+        if modo == "exato":
+            resultado.update(parcial)
+        else:
+            resultado.combinar(parcial)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantidade de nomes distintos e nomes mais frequentes")
+    parser.add_argument("arquivo", nargs="?", default=str(TXT_PATH))
+    parser.add_argument("--modo", choices=("exato", "aproximado"), default="exato")
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de nomes mais frequentes")
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--erro-distintos", type=float, default=0.01, help="Erro relativo do HyperLogLog")
+    parser.add_argument("--epsilon", type=float, default=0.001, help="Erro do Count-Min (fração do total)")
+    parser.add_argument("--delta", type=float, default=0.01, help="Probabilidade de exceder o erro do Count-Min")
+    args = parser.parse_args()
+
+    parametros = {}
+    if args.modo == "aproximado":
+        parametros = {
+            "erro_distintos": args.erro_distintos,
+            "epsilon": args.epsilon,
+            "delta": args.delta,
+            "capacidade": max(100, args.top * 10),
+        }
+
+    resultado = contar_arquivo(Path(args.arquivo), args.modo, args.processos, **parametros)
+
+    if args.modo == "exato":
+        total, distintos, mais_frequentes = sum(resultado.values()), len(resultado), resultado.most_common(args.top)
+    else:
+        total, distintos, mais_frequentes = resultado.total, resultado.distintos(), resultado.mais_frequentes(args.top)
+
+    print(f"Total de nomes: {total}")
+    print(f"Nomes distintos{' (estimativa)' if args.modo == 'aproximado' else ''}: {distintos}")
+    print(f"\nTop {args.top} nomes:")
+    for posicao, (nome, quantidade) in enumerate(mais_frequentes, start=1):
+        print(f"{posicao:>3}) {nome.ljust(30)} {quantidade}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# ESTATÍSTICAS DE DISTRIBUIÇÃO EM STREAMING - mediana, percentis e histogramas em uma única passada
+# As tabelas de estatísticas guardam apenas quantidade, média e máximo. Para a mediana e os percentis seria
+# preciso ordenar todos os valores, o que não é viável com bilhões de linhas. Este módulo oferece:
+#   - TDigest: estimador de quantis (t-digest, variante "merging" de Dunning). Os valores são resumidos em
+#     "centroides" (média, peso); os centroides das pontas são pequenos e os do meio são grandes, para que os
+#     percentis extremos (p1, p99) não percam precisão. A memória é limitada pela compressão (~0.6 * compressao
+#     centroides), independente da quantidade de valores;
+#   - Histograma: faixas de largura fixa entre um mínimo e um máximo, com contadores para os valores abaixo e
+#     acima do intervalo;
+#   - Distribuicao: as duas estruturas juntas, atualizadas na mesma passada que as demais agregações.
+#
+# As três estruturas podem ser combinadas (combinar): cada processo/bloco calcula a sua e, no final, os
+# resultados parciais são reunidos, como no modo paralelo do analise_vendas.
+#
+# Os resultados são gravados na tabela tb_estatisticas_distribuicoes (uma linha por estatística).
+#
+# Precisão medida (python estatisticas_streaming.py, 200 mil valores lognormais, erro relativo aos quantis
+# exatos em várias sementes):
+#   - compressao 100 (~60 centroides): p50 até ~0.2%, p99 até ~2%, p99.9 até ~11%;
+#   - compressao 500, o padrão (~290 centroides): p1 e p50 ~0.1%, p99 até ~0.3%, p99.9 até ~1.5%.
+# O custo de tempo da compressão 500 é ~20% maior que o da 100; para p99.9 ou além, utilize uma compressão maior.
+#
+# Uso:
+#   python estatisticas_streaming.py                       # mede o erro da compressão padrão
+#   python estatisticas_streaming.py --compressao 100 200 --quantidade 1000000
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import math
+import random
+import sqlite3
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Compressão padrão do t-digest: quanto maior, mais centroides (mais precisão e mais memória). Com 100, o erro
+# do p99.9 chegava a ~11% (veja a precisão medida no início do módulo).
+COMPRESSAO = 500
+
+# Percentis gravados na tabela.
+PERCENTIS = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+CREATE_TB_ESTATISTICAS_DISTRIBUICOES = """
+CREATE TABLE IF NOT EXISTS tb_estatisticas_distribuicoes (
+    fonte TEXT NOT NULL,            -- Script de origem (ex: "exercicio02").
+    medida TEXT NOT NULL,           -- Valor medido (ex: "media_aparada", "preco").
+    estatistica TEXT NOT NULL,      -- quantidade, minimo, maximo, media, p1, p50, p99, faixa_00, abaixo, acima...
+    limite_inferior REAL,           -- Faixas do histograma: intervalo [limite_inferior, limite_superior).
+    limite_superior REAL,
+    valor REAL NOT NULL,
+    PRIMARY KEY (fonte, medida, estatistica)
+);
+"""
+
+
+class TDigest:
+    """Estimador de quantis em streaming (t-digest). Veja o início do módulo."""
+
+    def __init__(self, compressao: int = COMPRESSAO):
+        if compressao < 10:
+            raise ValueError("A compressão deve ser no mínimo 10.")
+        self.compressao = compressao
+        # (média, peso), ordenados pela média.
+        self._centroides: List[Tuple[float, float]] = []
+        # Valores adicionados desde a última compressão, e centroides recebidos de outros t-digests.
+        self._buffer: List[float] = []
+        self._centroides_pendentes: List[Tuple[float, float]] = []
+        self._tamanho_buffer = 5 * compressao
+        self.quantidade = 0
+        self.soma = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def adicionar(self, valor: float) -> None:
+        self._buffer.append(valor)
+        if len(self._buffer) >= self._tamanho_buffer:
+            self._comprimir()
+
+    def adicionar_varios(self, valores: Iterable[float]) -> None:
+        for valor in valores:
+            self._buffer.append(valor)
+            if len(self._buffer) >= self._tamanho_buffer:
+                self._comprimir()
+
+    def combinar(self, outro: "TDigest") -> "TDigest":
+        """Acrescenta os valores resumidos em outro t-digest (ex: de outro bloco do arquivo). Retorna self."""
+        outro._comprimir()
+        if outro.quantidade:
+            self._centroides_pendentes.extend(outro._centroides)
+            self.quantidade += outro.quantidade
+            self.soma += outro.soma
+            self.minimo = min(self.minimo, outro.minimo)
+            self.maximo = max(self.maximo, outro.maximo)
+            if len(self._centroides_pendentes) >= self._tamanho_buffer:
+                self._comprimir()
+        return self
+
+    def _limite(self, q: float) -> float:
+        # Função de escala k1: k(q) = compressao / (2*pi) * asin(2q - 1). Um centroide pode crescer enquanto a
+        # sua faixa de quantis corresponder a no máximo 1 unidade de k (faixas estreitas nas pontas).
+        k = self.compressao / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compressao / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compressao) + 1) / 2
+
+    def _comprimir(self) -> None:
+        if not self._buffer and not self._centroides_pendentes:
+            return
+        if self._buffer:
+            self.quantidade += len(self._buffer)
+            self.soma += math.fsum(self._buffer)
+            self.minimo = min(self.minimo, min(self._buffer))
+            self.maximo = max(self.maximo, max(self._buffer))
+
+        itens = self._centroides + self._centroides_pendentes
+        itens.extend((valor, 1) for valor in self._buffer)
+        itens.sort()
+        self._buffer = []
+        self._centroides_pendentes = []
+
+        total = sum(peso for _, peso in itens)
+        novos = []
+        media_atual, peso_atual = itens[0]
+        peso_anterior = 0.0
+        limite = self._limite(0.0)
+        for media, peso in itens[1:]:
+            if (peso_anterior + peso_atual + peso) / total <= limite:
+                peso_atual += peso
+                media_atual += (media - media_atual) * peso / peso_atual
+            else:
+                novos.append((media_atual, peso_atual))
+                peso_anterior += peso_atual
+                limite = self._limite(peso_anterior / total)
+                media_atual, peso_atual = media, peso
+        novos.append((media_atual, peso_atual))
+        self._centroides = novos
+
+    def quantil(self, q: float) -> float:
+        """
+        Estima o quantil q (0 a 1) dos valores adicionados (ex: 0.5 = mediana).
+
+        Raises:
+            ValueError: Se nenhum valor foi adicionado ou se q estiver fora do intervalo [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("O quantil deve estar entre 0 e 1.")
+        self._comprimir()
+        if not self.quantidade:
+            raise ValueError("Nenhum valor foi adicionado.")
+        if q == 0 or (len(self._centroides) == 1 and self.minimo == self.maximo):
+            return self.minimo
+        if q == 1:
+            return self.maximo
+
+        # Cada centroide representa os valores ao redor do seu centro (posição acumulada + peso/2); entre dois
+        # centros o valor é interpolado linearmente. Antes do primeiro e depois do último centro, a interpolação
+        # é feita com o mínimo e o máximo exatos.
+        alvo = q * self.quantidade
+        media_anterior, centro_anterior = self.minimo, 0.0
+        acumulado = 0.0
+        for media, peso in self._centroides:
+            centro = acumulado + peso / 2
+            if alvo < centro:
+                proporcao = (alvo - centro_anterior) / (centro - centro_anterior)
+                return media_anterior + (media - media_anterior) * proporcao
+            media_anterior, centro_anterior = media, centro
+            acumulado += peso
+        if self.quantidade == centro_anterior:
+            return self.maximo
+        proporcao = (alvo - centro_anterior) / (self.quantidade - centro_anterior)
+        return media_anterior + (self.maximo - media_anterior) * proporcao
+
+    def media(self) -> float:
+        self._comprimir()
+        return self.soma / self.quantidade if self.quantidade else 0.0
+
+    def __len__(self) -> int:
+        self._comprimir()
+        return len(self._centroides)
+
+
+class Histograma:
+    """Histograma de faixas de largura fixa entre minimo e maximo, com contadores abaixo e acima do intervalo."""
+
+    def __init__(self, minimo: float, maximo: float, qtd_faixas: int):
+        if maximo <= minimo or qtd_faixas < 1:
+            raise ValueError("O máximo deve ser maior que o mínimo e deve haver ao menos uma faixa.")
+        self.minimo = minimo
+        self.maximo = maximo
+        self.largura = (maximo - minimo) / qtd_faixas
+        self.contagens = [0] * qtd_faixas
+        self.abaixo = 0
+        self.acima = 0
+
+    def adicionar(self, valor: float) -> None:
+        if valor < self.minimo:
+            self.abaixo += 1
+        elif valor > self.maximo:
+            self.acima += 1
+        else:
+            # O máximo entra na última faixa (senão um valor igual ao máximo ficaria "acima").
+            self.contagens[min(int((valor - self.minimo) / self.largura), len(self.contagens) - 1)] += 1
+
+    def combinar(self, outro: "Histograma") -> "Histograma":
+        """Soma as contagens de outro histograma com as mesmas faixas. Retorna self."""
+        if (outro.minimo, outro.maximo, len(outro.contagens)) != (self.minimo, self.maximo, len(self.contagens)):
+            raise ValueError("Só é possível combinar histogramas com as mesmas faixas.")
+        self.contagens = [a + b for a, b in zip(self.contagens, outro.contagens)]
+        self.abaixo += outro.abaixo
+        self.acima += outro.acima
+        return self
+
+    def faixas(self) -> List[Tuple[float, float, int]]:
+        """Retorna as faixas (início, fim, quantidade)."""
+        return [
+            (self.minimo + i * self.largura, self.minimo + (i + 1) * self.largura, quantidade)
+            for i, quantidade in enumerate(self.contagens)
+        ]
+
+
+class Distribuicao:
+    """t-digest e histograma de uma mesma medida, atualizados juntos."""
+
+    def __init__(self, minimo: float, maximo: float, qtd_faixas: int = 10, compressao: int = COMPRESSAO):
+        self.digest = TDigest(compressao)
+        self.histograma = Histograma(minimo, maximo, qtd_faixas)
+
+    def adicionar(self, valor: float) -> None:
+        self.digest.adicionar(valor)
+        self.histograma.adicionar(valor)
+
+    def adicionar_varios(self, valores: Iterable[float]) -> None:
+        for valor in valores:
+            self.digest.adicionar(valor)
+            self.histograma.adicionar(valor)
+
+    def combinar(self, outra: "Distribuicao") -> "Distribuicao":
+        self.digest.combinar(outra.digest)
+        self.histograma.combinar(outra.histograma)
+        return self
+
+    def copia_vazia(self) -> "Distribuicao":
+        """Nova distribuição vazia com a mesma configuração (ex: uma para cada bloco no modo paralelo)."""
+        h = self.histograma
+        return Distribuicao(h.minimo, h.maximo, len(h.contagens), self.digest.compressao)
+
+    @property
+    def quantidade(self) -> int:
+        self.digest._comprimir()
+        return self.digest.quantidade
+
+    def percentis(self, percentis: Sequence[float] = PERCENTIS) -> List[Tuple[float, float]]:
+        """Retorna (percentil, valor estimado) para cada percentil (ex: 0.5 -> mediana)."""
+        return [(p, self.digest.quantil(p)) for p in percentis]
+
+
+def _nome_percentil(p: float) -> str:
+    # 0.5 -> p50, 0.99 -> p99, 0.999 -> p99.9
+    return f"p{p * 100:g}"
+
+
+def gravar_distribuicao(
+        conn: sqlite3.Connection,
+        fonte: str,
+        medida: str,
+        distribuicao: Distribuicao,
+        percentis: Sequence[float] = PERCENTIS
+    ) -> None:
+    """
+    Grava (substituindo a gravação anterior) a distribuição de uma medida em tb_estatisticas_distribuicoes.
+    O commit fica a cargo de quem chama.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+        fonte (str): Script de origem.
+        medida (str): Nome da medida.
+        distribuicao (Distribuicao): Distribuição calculada.
+        percentis (Sequence[float]): Percentis gravados.
+    """
+    conn.execute(CREATE_TB_ESTATISTICAS_DISTRIBUICOES)
+    conn.execute("DELETE FROM tb_estatisticas_distribuicoes WHERE fonte = ? AND medida = ?", (fonte, medida))
+
+    linhas = [("quantidade", None, None, distribuicao.quantidade)]
+    if distribuicao.quantidade:
+        digest = distribuicao.digest
+        linhas += [
+            ("minimo", None, None, digest.minimo),
+            ("maximo", None, None, digest.maximo),
+            ("media", None, None, digest.media()),
+        ]
+        linhas += [(_nome_percentil(p), None, None, valor) for p, valor in distribuicao.percentis(percentis)]
+
+    histograma = distribuicao.histograma
+    linhas.append(("abaixo", None, histograma.minimo, histograma.abaixo))
+    linhas += [
+        (f"faixa_{i:02d}", inicio, fim, quantidade)
+        for i, (inicio, fim, quantidade) in enumerate(histograma.faixas())
+    ]
+    linhas.append(("acima", histograma.maximo, None, histograma.acima))
+
+    conn.executemany(
+        """INSERT INTO tb_estatisticas_distribuicoes
+           (fonte, medida, estatistica, limite_inferior, limite_superior, valor)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(fonte, medida, *linha) for linha in linhas]
+    )
+
+
+def ler_distribuicao(
+        conn: sqlite3.Connection,
+        fonte: str,
+        medida: str
+    ) -> List[Tuple[str, Optional[float], Optional[float], float]]:
+    """Retorna as estatísticas gravadas de uma medida: (estatística, limite inferior, limite superior, valor)."""
+    conn.execute(CREATE_TB_ESTATISTICAS_DISTRIBUICOES)
+    return conn.execute(
+        """SELECT estatistica, limite_inferior, limite_superior, valor FROM tb_estatisticas_distribuicoes
+           WHERE fonte = ? AND medida = ? ORDER BY rowid""",
+        (fonte, medida)
+    ).fetchall()
+
+
+def _quantil_exato(ordenados: Sequence[float], q: float) -> float:
+    # Interpolação linear entre as posições vizinhas (como numpy.quantile).
+    posicao = q * (len(ordenados) - 1)
+    i = int(posicao)
+    if i + 1 >= len(ordenados):
+        return ordenados[-1]
+    return ordenados[i] + (ordenados[i + 1] - ordenados[i]) * (posicao - i)
+
+
+def medir_precisao(
+        valores: Sequence[float],
+        compressao: int = COMPRESSAO,
+        quantis: Sequence[float] = (0.001, 0.01, 0.5, 0.99, 0.999)
+    ) -> List[Tuple[float, float, float]]:
+    """
+    Compara os quantis estimados pelo t-digest com os quantis exatos (valores ordenados).
+
+    Args:
+        valores (Sequence[float]): Valores de teste.
+        compressao (int): Compressão do t-digest.
+        quantis (Sequence[float]): Quantis comparados.
+
+    Returns:
+        List[Tuple[float, float, float]]: (quantil, valor exato, erro relativo) para cada quantil.
+    """
+    digest = TDigest(compressao)
+    digest.adicionar_varios(valores)
+    ordenados = sorted(valores)
+    resultado = []
+    for q in quantis:
+        exato = _quantil_exato(ordenados, q)
+        erro = (digest.quantil(q) - exato) / exato if exato else digest.quantil(q) - exato
+        resultado.append((q, exato, erro))
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o erro do t-digest em relação aos quantis exatos")
+    parser.add_argument("--compressao", type=int, nargs="+", default=[COMPRESSAO])
+    parser.add_argument("--quantidade", type=int, default=200_000, help="Quantidade de valores (lognormais)")
+    parser.add_argument("--sementes", type=int, default=3, help="Quantidade de amostras diferentes")
+    args = parser.parse_args()
+
+    for semente in range(args.sementes):
+        gerador = random.Random(semente)
+        valores = [gerador.lognormvariate(0, 1) for _ in range(args.quantidade)]
+        for compressao in args.compressao:
+            erros = "  ".join(
+                f"{_nome_percentil(q)}: {erro:+.2%}" for q, _, erro in medir_precisao(valores, compressao)
+            )
+            print(f"semente {semente}, compressao {compressao}: {erros}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,32 @@
 # CÓDIGO PYTHON COMENTADO - SISTEMA DE GERENCIAMENTO DE CURSOS
 # Este programa lê dados de cursos de um arquivo CSV, armazena em um banco SQLite
 # e calcula estatísticas sobre os cursos
+#
+# As etapas ficam em funções (processar_cursos), para que outros programas possam executá-las sem a linha de
+# comando (ex: o job "cursos" do servico_jobs.py). Ao executar este arquivo, main() lê os argumentos e as chama.
 
 # ===== IMPORTAÇÃO DAS BIBLIOTECAS =====
 import sqlite3  # Biblioteca para trabalhar com banco de dados SQLite
-import csv      # Biblioteca para ler e escrever arquivos CSV
 import os       # Biblioteca para trabalhar com caminhos de arquivos e sistema operacional
+import argparse # Biblioteca para ler os argumentos da linha de comando
+
+from typing import Callable, NamedTuple, Optional, Tuple
+
+# Instrumentação deste projeto: tempo de cada etapa e contadores (ligada pela variável PROWAY_INSTRUMENTACAO)
+from instrumentacao import execucao_atual, iniciar_execucao
+
+# Carga em lotes com checkpoint: uma carga interrompida continua de onde parou na próxima execução
+from checkpoint import ResultadoCarga, apagar_checkpoint, carga_concluida, carregar_csv_retomavel
+
+# Memoização: se o CSV não mudou desde a última execução, as estatísticas gravadas são reutilizadas
+from cache_csv import impressao_digital
+from memoizacao import consultar_memo, gravar_memo
+
+# Quarentena: linhas inválidas do CSV vão para um arquivo de rejeitos, em vez de interromper a carga
+from quarentena import Quarentena, adicionar_argumentos_quarentena, quarentena_dos_argumentos
+
+# Mediana, percentis e histograma calculados em uma única passada (sem ordenar todos os valores)
+from estatisticas_streaming import Distribuicao, gravar_distribuicao
 
 # ===== DEFINIÇÃO DOS CAMINHOS DOS ARQUIVOS =====
 # __file__ é uma variável especial que contém o caminho do arquivo atual
@@ -15,109 +36,230 @@ import os       # Biblioteca para trabalhar com caminhos de arquivos e sistema o
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'db.sqlite3')
 CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'exercicios', 'cursos.csv')
 
-# ===== 1. CONECTAR AO BANCO DE DADOS =====
-# sqlite3.connect() cria uma conexão com o banco de dados
-# Se o arquivo não existir, ele será criado automaticamente
-conn = sqlite3.connect(DB_PATH)
+# Identificador desta carga nas tabelas de checkpoints e de memoização
+CHAVE_CARGA = 'exercicio01:cursos'
+# Tabelas gravadas pela carga (a quantidade de linhas é conferida com a gravada no checkpoint)
+TABELAS_CARGA = ('tb_cursos',)
 
-# cursor é um objeto que permite executar comandos SQL no banco
-# É como um "ponteiro" que navega pelo banco de dados
-cursor = conn.cursor()
-
-# ===== 2. CRIAR TABELA tb_cursos =====
-# cursor.execute() executa um comando SQL
+# ===== COMANDOS SQL DE CRIAÇÃO DAS TABELAS =====
 # CREATE TABLE IF NOT EXISTS significa: "crie a tabela apenas se ela não existir"
 # Isso evita erros se executarmos o script várias vezes
-cursor.execute('''
+CREATE_TB_CURSOS = '''
 CREATE TABLE IF NOT EXISTS tb_cursos (
     id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Chave primária que incrementa automaticamente
     curso TEXT NOT NULL,                   -- Nome do curso (texto obrigatório)
     carga_horaria INTEGER NOT NULL,        -- Carga horária em horas (número inteiro obrigatório)
     preco REAL NOT NULL                    -- Preço do curso (número decimal obrigatório)
-)
-''')
-
-# ===== 3. LER O ARQUIVO CSV E INSERIR OS DADOS =====
-# 'with open()' é uma forma segura de abrir arquivos
-# Quando o bloco termina, o arquivo é fechado automaticamente
-# newline='' evita problemas com quebras de linha no CSV
-# encoding='utf-8' garante que caracteres especiais (acentos) sejam lidos corretamente
-with open(CSV_PATH, newline='', encoding='utf-8') as csvfile:
-    reader = csv.DictReader(csvfile, delimiter=';')
-    
-    # List comprehension: uma forma compacta de criar listas
-    # Para cada linha (row) do CSV, cria uma tupla com os dados
-    # int() converte texto para número inteiro
-    # float() converte texto para número decimal
-    cursos = [(row['curso'], int(row['carga_horaria']), float(row['preco'])) for row in reader]
-
-# ===== LIMPAR TABELA ANTES DE INSERIR =====
-# DELETE FROM remove todos os registros da tabela
-# Isso evita dados duplicados se executarmos o script várias vezes
-cursor.execute('DELETE FROM tb_cursos')
+);
+'''
+
+CREATE_TB_ESTATISTICAS_CURSOS = '''
+CREATE TABLE IF NOT EXISTS tb_estatisticas_cursos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    qtd_cursos INTEGER,                    -- Quantidade total de cursos
+    curso_maior_carga_horaria TEXT,        -- Nome e carga do curso com mais horas
+    curso_com_maior_valor TEXT             -- Nome e preço do curso mais caro
+);
+'''
+
+
+# Resultado de processar_cursos()
+class ResultadoCursos(NamedTuple):
+    carga: Optional[ResultadoCarga]     # None se as estatísticas memoizadas foram utilizadas (o CSV não foi lido)
+    # (quantidade de cursos, (curso, carga horária), (curso, preço)); None se a carga foi interrompida
+    estatisticas: Optional[Tuple[int, Tuple[str, int], Tuple[str, float]]]
+    memoizado: bool
+
+
+# Exibe as estatísticas na tela (utilizada no final do programa e quando as estatísticas estão memoizadas)
+# print() exibe informações no console/terminal
+def exibir_estatisticas(qtd_cursos, curso_maior_carga, curso_maior_valor):
+    print(f"Quantidade de cursos: {qtd_cursos}")
+    print(f"Curso com a maior carga horária: {curso_maior_carga[0]} ({curso_maior_carga[1]} horas)")
+    print(f"Curso com o maior valor: {curso_maior_valor[0]} (R$ {curso_maior_valor[1]:.2f})")
+
+# Converte cada linha do CSV (um dicionário coluna -> valor) em uma tupla com os tipos corretos
+# int() converte texto para número inteiro
+# float() converte texto para número decimal
+def converter_curso(numero_linha, row):
+    return (row['curso'], int(row['carga_horaria']), float(row['preco']))
 
 # executemany() executa o mesmo comando SQL várias vezes
 # Os '?' são placeholders (marcadores) que serão substituídos pelos valores
 # Isso é mais seguro que concatenar strings (evita SQL injection)
-cursor.executemany('INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (?, ?, ?)', cursos)
+def gravar_cursos(cursor, cursos):
+    cursor.executemany('INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (?, ?, ?)', cursos)
 
-# commit() confirma as alterações no banco de dados
-# Sem isso, as mudanças ficam apenas na memória e são perdidas
-conn.commit()
+# DELETE FROM remove todos os registros da tabela
+# Isso evita dados duplicados quando a carga começa do início
+def limpar_cursos(cursor):
+    cursor.execute('DELETE FROM tb_cursos')
 
-# ===== 4. CALCULAR ESTATÍSTICAS =====
 
-# Contar quantos cursos existem na tabela
-cursor.execute('SELECT COUNT(*) FROM tb_cursos')
-# fetchone() retorna uma tupla com o resultado da consulta
-# [0] pega o primeiro (e único) elemento da tupla
-qtd_cursos = cursor.fetchone()[0]
+def processar_cursos(
+        conn: sqlite3.Connection,
+        caminho: str = CSV_PATH,
+        forcar: bool = False,
+        quarentena: Optional[Quarentena] = None,
+        interromper: Optional[Callable[[], bool]] = None
+    ) -> ResultadoCursos:
+    """
+    Carrega os cursos do CSV em tb_cursos e grava as estatísticas (tb_estatisticas_cursos, a distribuição dos
+    preços e a memoização).
 
-# Encontrar o curso com maior carga horária
-# ORDER BY carga_horaria DESC ordena por carga horária em ordem decrescente (maior primeiro)
-# ORDER BY id ASC é um critério de desempate (se houver empate, pega o de menor ID)
-# LIMIT 1 retorna apenas o primeiro resultado
-cursor.execute('SELECT curso, carga_horaria FROM tb_cursos ORDER BY carga_horaria DESC, id ASC LIMIT 1')
-curso_maior_carga = cursor.fetchone()
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+        caminho (str): Arquivo CSV dos cursos.
+        forcar (bool): Recarrega o CSV e recalcula as estatísticas, mesmo que o arquivo não tenha mudado.
+        quarentena (Optional[Quarentena]): Se informada, as linhas inválidas vão para o arquivo de rejeitos.
+        interromper (Optional[Callable[[], bool]]): Consultado após cada lote; se retornar True, a carga para (e
+            continua na próxima execução) e as estatísticas não são calculadas.
 
-# Encontrar o curso com maior preço (mesma lógica do anterior)
-cursor.execute('SELECT curso, preco FROM tb_cursos ORDER BY preco DESC, id ASC LIMIT 1')
-curso_maior_valor = cursor.fetchone()
+    Returns:
+        ResultadoCursos: O resultado da carga e as estatísticas.
 
-# ===== 5. CRIAR TABELA DE ESTATÍSTICAS =====
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS tb_estatisticas_cursos (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    qtd_cursos INTEGER,                    -- Quantidade total de cursos
-    curso_maior_carga_horaria TEXT,        -- Nome e carga do curso com mais horas
-    curso_com_maior_valor TEXT             -- Nome e preço do curso mais caro
-)
-''')
-
-# Limpar tabela de estatísticas (mesmo motivo anterior)
-cursor.execute('DELETE FROM tb_estatisticas_cursos')
-
-# ===== 6. INSERIR ESTATÍSTICAS =====
-cursor.execute(
-    'INSERT INTO tb_estatisticas_cursos (qtd_cursos, curso_maior_carga_horaria, curso_com_maior_valor) VALUES (?, ?, ?)',
-    (
-        qtd_cursos,  # Quantidade de cursos
-        # f-string: forma moderna de formatar strings em Python
-        # curso_maior_carga[0] é o nome do curso, [1] é a carga horária
-        f"{curso_maior_carga[0]} ({curso_maior_carga[1]} horas)",
-        # :.2f formata o número com 2 casas decimais
-        f"{curso_maior_valor[0]} (R$ {curso_maior_valor[1]:.2f})"
+    Raises:
+        OrcamentoErrosExcedido: Se a quarentena ultrapassar o orçamento de erros.
+    """
+    # Instrumentação iniciada por quem chamou (se estiver desligada, as chamadas abaixo não fazem nada)
+    execucao = execucao_atual()
+
+    # cursor é um objeto que permite executar comandos SQL no banco
+    # É como um "ponteiro" que navega pelo banco de dados
+    cursor = conn.cursor()
+
+    # ===== 2. CRIAR AS TABELAS =====
+    # executescript() executa vários comandos SQL de uma vez
+    cursor.executescript(CREATE_TB_CURSOS + CREATE_TB_ESTATISTICAS_CURSOS)
+
+    # ===== VERIFICAR SE O CSV MUDOU DESDE A ÚLTIMA EXECUÇÃO =====
+    # A impressão digital do arquivo (tamanho, data de modificação e, se necessário, hash do conteúdo) é comparada
+    # com a gravada na última execução. Se for a mesma (e tb_cursos ainda for a da última carga concluída), as
+    # estatísticas gravadas são retornadas, sem ler o CSV e sem recalcular nada.
+    # Com a quarentena, o orçamento de erros é verificado com as linhas rejeitadas gravadas no checkpoint da carga.
+    impressao = impressao_digital(caminho, calcular_hash=False)
+    if forcar:
+        # Recalcula tudo: apaga também o checkpoint, para que o CSV seja carregado novamente do início
+        apagar_checkpoint(conn, CHAVE_CARGA)
+    elif carga_concluida(conn, CHAVE_CARGA, impressao, TABELAS_CARGA, quarentena):
+        memo = consultar_memo(conn, CHAVE_CARGA, impressao)
+        if memo is not None:
+            estatisticas = (memo['qtd_cursos'], tuple(memo['curso_maior_carga']), tuple(memo['curso_maior_valor']))
+            return ResultadoCursos(None, estatisticas, True)
+
+    # ===== 3. LER O ARQUIVO CSV E INSERIR OS DADOS =====
+    # O CSV é lido e gravado em lotes. Cada lote é confirmado (commit) junto com um "checkpoint" na tabela
+    # tb_checkpoints, que guarda até onde o arquivo já foi carregado (posição em bytes).
+    # - Se a carga anterior foi interrompida, ela continua do último lote confirmado.
+    # - Se o arquivo não mudou desde a última carga completa, nada é lido novamente.
+    # - Se o arquivo mudou, a tabela é limpa (DELETE FROM) e a carga começa do início.
+    with execucao.etapa('carga_csv'):
+        carga = carregar_csv_retomavel(conn, caminho, CHAVE_CARGA, converter_curso, gravar_cursos, limpar_cursos,
+                                       interromper=interromper, quarentena=quarentena, tabelas=TABELAS_CARGA)
+
+    execucao.contar('linhas_lidas', carga.registros_novos)
+    execucao.contar('bytes_lidos', carga.bytes_lidos)
+    execucao.contar('linhas_gravadas', carga.registros_novos)
+    if quarentena is not None:
+        quarentena.fechar()
+        execucao.contar('linhas_rejeitadas', quarentena.rejeitadas)
+    if not carga.concluida:
+        # Carga interrompida: as estatísticas são calculadas quando ela terminar
+        return ResultadoCursos(carga, None, False)
+
+    # ===== 4. CALCULAR ESTATÍSTICAS =====
+
+    # Contar quantos cursos existem na tabela
+    cursor.execute('SELECT COUNT(*) FROM tb_cursos')
+    # fetchone() retorna uma tupla com o resultado da consulta
+    # [0] pega o primeiro (e único) elemento da tupla
+    qtd_cursos = cursor.fetchone()[0]
+
+    # Encontrar o curso com maior carga horária
+    # ORDER BY carga_horaria DESC ordena por carga horária em ordem decrescente (maior primeiro)
+    # ORDER BY id ASC é um critério de desempate (se houver empate, pega o de menor ID)
+    # LIMIT 1 retorna apenas o primeiro resultado
+    cursor.execute('SELECT curso, carga_horaria FROM tb_cursos ORDER BY carga_horaria DESC, id ASC LIMIT 1')
+    curso_maior_carga = cursor.fetchone()
+
+    # Encontrar o curso com maior preço (mesma lógica do anterior)
+    cursor.execute('SELECT curso, preco FROM tb_cursos ORDER BY preco DESC, id ASC LIMIT 1')
+    curso_maior_valor = cursor.fetchone()
+
+    # Distribuição dos preços: mediana, percentis e histograma (faixas de R$ 100 entre R$ 0 e R$ 2000)
+    # Os preços são lidos uma única vez, direto do cursor, sem montar uma lista com todos eles
+    distribuicao_precos = Distribuicao(0.0, 2000.0, 20)
+    for (preco,) in cursor.execute('SELECT preco FROM tb_cursos'):
+        distribuicao_precos.adicionar(preco)
+
+    # ===== 5. LIMPAR A TABELA DE ESTATÍSTICAS =====
+    cursor.execute('DELETE FROM tb_estatisticas_cursos')
+
+    # ===== 6. INSERIR ESTATÍSTICAS =====
+    cursor.execute(
+        'INSERT INTO tb_estatisticas_cursos (qtd_cursos, curso_maior_carga_horaria, curso_com_maior_valor) VALUES (?, ?, ?)',
+        (
+            qtd_cursos,  # Quantidade de cursos
+            # f-string: forma moderna de formatar strings em Python
+            # curso_maior_carga[0] é o nome do curso, [1] é a carga horária
+            f"{curso_maior_carga[0]} ({curso_maior_carga[1]} horas)",
+            # :.2f formata o número com 2 casas decimais
+            f"{curso_maior_valor[0]} (R$ {curso_maior_valor[1]:.2f})"
+        )
     )
-)
-# Confirma as alterações no banco
-conn.commit()
+    # Grava a distribuição dos preços na tabela tb_estatisticas_distribuicoes
+    gravar_distribuicao(conn, 'exercicio01', 'preco', distribuicao_precos)
+
+    # Grava as estatísticas junto com a impressão digital do CSV obtida antes da carga (para a próxima execução)
+    gravar_memo(conn, CHAVE_CARGA, carga.impressao, {
+        'qtd_cursos': qtd_cursos,
+        'curso_maior_carga': list(curso_maior_carga),
+        'curso_maior_valor': list(curso_maior_valor),
+    })
+    # Confirma as alterações no banco
+    conn.commit()
+
+    return ResultadoCursos(carga, (qtd_cursos, tuple(curso_maior_carga), tuple(curso_maior_valor)), False)
+
+
+def main():
+    # ===== ARGUMENTOS DA LINHA DE COMANDO =====
+    # --forcar: recarrega o CSV e recalcula as estatísticas, mesmo que o arquivo não tenha mudado
+    # --rejeitos, --max-erros, --max-proporcao: modo quarentena (veja quarentena.py)
+    parser = argparse.ArgumentParser(description='Carga dos cursos e cálculo das estatísticas')
+    parser.add_argument('--forcar', action='store_true',
+                        help='Recarrega o CSV e recalcula as estatísticas, mesmo que o arquivo não tenha mudado')
+    adicionar_argumentos_quarentena(parser)
+    args = parser.parse_args()
+
+    # None se nenhum argumento de quarentena foi informado: nesse caso, a primeira linha inválida interrompe a carga
+    quarentena = quarentena_dos_argumentos(args)
+
+    # Inicia a instrumentação. Se estiver desligada, as chamadas abaixo não fazem nada.
+    # O 'with' grava o registro JSON da execução (tempo das etapas, contadores e pico de memória) no final,
+    # inclusive quando a execução termina com erro (status "erro").
+    with iniciar_execucao("exercicio01") as execucao:
+        # ===== 1. CONECTAR AO BANCO DE DADOS =====
+        # sqlite3.connect() cria uma conexão com o banco de dados
+        # Se o arquivo não existir, ele será criado automaticamente
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            resultado = processar_cursos(conn, CSV_PATH, args.forcar, quarentena)
+        finally:
+            # ===== FECHAR CONEXÃO COM O BANCO =====
+            # Sempre importante fechar a conexão para liberar recursos
+            conn.close()
+
+        # ===== 7. EXIBIR ESTATÍSTICAS NA TELA =====
+        if quarentena is not None:
+            # Resumo das linhas rejeitadas por tipo de erro (ex: numero_invalido: 3)
+            print(quarentena.texto_resumo())
+        exibir_estatisticas(*resultado.estatisticas)
+
+        if resultado.memoizado:
+            execucao.finalizar(memoizado=True)
 
-# ===== 7. EXIBIR ESTATÍSTICAS NA TELA =====
-# print() exibe informações no console/terminal
-print(f"Quantidade de cursos: {qtd_cursos}")
-print(f"Curso com a maior carga horária: {curso_maior_carga[0]} ({curso_maior_carga[1]} horas)")
-print(f"Curso com o maior valor: {curso_maior_valor[0]} (R$ {curso_maior_valor[1]:.2f})")
 
-# ===== FECHAR CONEXÃO COM O BANCO =====
-# Sempre importante fechar a conexão para liberar recursos
-conn.close()
\ No newline at end of file
+# Executa main() apenas quando o arquivo é executado diretamente (e não quando é importado)
+if __name__ == '__main__':
+    main()
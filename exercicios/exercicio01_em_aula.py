@@ -1,14 +1,24 @@
+import argparse #biblioteca para ler os argumentos da linha de comando
 import pymysql #biblioteca para conexão com o banco de dados
 import os #biblioteca para manipulação de arquivos
 import requests #biblioteca para fazer requisições HTTP
 from dotenv import load_dotenv #biblioteca para carregar variáveis de ambiente
 import csv #biblioteca para manipulação de arquivos CSV
+from instrumentacao import execucao_atual, iniciar_execucao #tempo das etapas e contadores (PROWAY_INSTRUMENTACAO)
+from perfilamento import adicionar_argumentos_perfil, perfilar #cProfile e tracemalloc (--perfil ou PROWAY_PERFIL)
 
 load_dotenv() #carrega as variáveis de ambiente
 
-if __name__ == "__main__":
+def main():
+    #o registro JSON da execução é gravado ao sair do 'with', inclusive em caso de erro (status "erro")
+    with iniciar_execucao("exercicio01_em_aula"): #não faz nada se a instrumentação estiver desligada
+        carregar_cursos()
+
+def carregar_cursos():
     pass #pass é uma instrução que não faz nada
 
+    execucao = execucao_atual() #execução iniciada pelo main()
+
     # Conexão com o banco de dados
 
     connection = pymysql.connect(
@@ -23,8 +33,10 @@ if __name__ == "__main__":
 
     url = "https://raw.githubusercontent.com/abispo/shared-files/refs/heads/main/modulo02/cursos.csv"
 
-    response = requests.get(url) #faz uma requisição GET para a URL
-    content = response.text #pega o conteúdo da resposta
+    with execucao.etapa("download_http"):
+        response = requests.get(url) #faz uma requisição GET para a URL
+        content = response.text #pega o conteúdo da resposta
+    execucao.contar("bytes_baixados", len(response.content))
 
     with open(os.path.join(os.getcwd(), "cursos.csv"), 'w', encoding='utf-8') as _file: #cria um arquivo CSV
         _file.write(content) #escreve o conteúdo no arquivo
@@ -62,17 +74,19 @@ if __name__ == "__main__":
         csv_file = csv.DictReader(_file, delimiter=';')
 
         # Inserção dos dados no banco de dados para cada linha do arquivo CSV
-        for row in csv_file:
-            command = """
-                INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (
-                '{}', {}, {}
-                )""".format(
-                    row.get("curso"),
-                    int(row.get("carga_horaria")),
-                    float(row.get("preco"))
-                )
-            cursor.execute(command)
-        connection.commit()
+        with execucao.etapa("gravacao_banco"):
+            for row in csv_file:
+                command = """
+                    INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (
+                    '{}', {}, {}
+                    )""".format(
+                        row.get("curso"),
+                        int(row.get("carga_horaria")),
+                        float(row.get("preco"))
+                    )
+                cursor.execute(command)
+                execucao.contar("linhas_gravadas")
+            connection.commit()
     
     # Método 01: Utilizando o sql
 
@@ -127,4 +141,14 @@ if __name__ == "__main__":
 
     # Curso com maior valor
     curso_com_maior_valor_2 = sorted(
-        results, key=lambda item: item[3], reverse=True)[0]
\ No newline at end of file
+        results, key=lambda item: item[3], reverse=True)[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga dos cursos (baixados da internet) no MySQL")
+    adicionar_argumentos_perfil(parser)
+    args = parser.parse_args()
+
+    # Com o perfilamento desligado, apenas executa main()
+    with perfilar("exercicio01_em_aula", args.perfil, args.perfil_amostragem):
+        main()
@@ -3,6 +3,9 @@
 # armazenando-as em um banco de dados SQLite e calculando estatísticas.
 
 # ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+# argparse: Módulo para ler os argumentos da linha de comando (aqui, as opções de perfilamento).
+import argparse
+
 # pathlib: Uma forma moderna e orientada a objetos de lidar com caminhos de arquivos e diretórios.
 # É mais robusta e legível que o módulo 'os.path' para muitas operações.
 from pathlib import Path
@@ -15,9 +18,52 @@ import sqlite3
 # Permite ler e escrever dados em formato tabular, onde os valores são separados por vírgulas (ou outros delimitadores).
 import csv
 
+# heapq: Seleção parcial (nsmallest/nlargest) das menores e maiores notas, sem ordenar a lista inteira.
+import heapq
+
+# itertools: groupby, para agrupar as notas de cada aluno lidas da tabela no formato longo.
+import itertools
+
+# math: fsum, soma de ponto flutuante com arredondamento correto.
+import math
+
+# re: Expressões regulares, para reconhecer as colunas de notas (n1, n2, ..., nN).
+import re
+
 # typing: Módulo que fornece suporte para type hints (dicas de tipo).
 # Ajuda a escrever código mais claro e a detectar erros de tipo durante o desenvolvimento.
-from typing import List, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# numpy (opcional): Se estiver instalado, as médias aparadas de vários alunos são calculadas de uma vez.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# instrumentacao: Módulo deste projeto que mede o tempo de cada etapa e conta as linhas processadas
+# (ligado pela variável de ambiente PROWAY_INSTRUMENTACAO).
+from instrumentacao import execucao_atual, iniciar_execucao
+
+# checkpoint: Módulo deste projeto que carrega o CSV em lotes, gravando a posição já carregada a cada commit,
+# para que uma carga interrompida continue de onde parou.
+from checkpoint import ResultadoCarga, apagar_checkpoint, carga_concluida, carregar_csv_retomavel
+
+# cache_csv e memoizacao: Módulos deste projeto. Se o CSV e os parâmetros não mudaram desde a última execução,
+# as estatísticas gravadas são reutilizadas, sem ler o CSV nem recalcular nada.
+from cache_csv import impressao_digital
+from memoizacao import consultar_memo, gravar_memo
+
+# quarentena: Módulo deste projeto que desvia as linhas inválidas do CSV para um arquivo de rejeitos,
+# em vez de interromper a carga no primeiro erro.
+from quarentena import Quarentena, adicionar_argumentos_quarentena, quarentena_dos_argumentos
+
+# estatisticas_streaming: Módulo deste projeto com a mediana, os percentis (t-digest) e o histograma das médias,
+# calculados na mesma passada que as demais estatísticas e gravados em tb_estatisticas_distribuicoes.
+from estatisticas_streaming import Distribuicao, gravar_distribuicao
+
+# perfilamento: Módulo deste projeto que executa o programa com o cProfile e o tracemalloc quando solicitado
+# (argumento --perfil ou variável de ambiente PROWAY_PERFIL).
+from perfilamento import adicionar_argumentos_perfil, perfilar, snapshot_memoria
 
 # =====================================
 # CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
@@ -40,6 +86,17 @@ DB_PATH = BASE_DIR / "db.sqlite3"
 # O arquivo 'notas.csv' também é esperado dentro do diretório onde está este script.
 CSV_PATH = BASE_DIR / "notas.csv"
 
+# PROPORCAO_APARADA: Proporção das notas descartada em CADA extremo no cálculo da média aparada.
+# Com 5 notas, 0.2 descarta 1 menor e 1 maior nota.
+PROPORCAO_APARADA = 0.2
+
+# CHAVE_CARGA: Identificador desta carga nas tabelas de checkpoints e de memoização.
+CHAVE_CARGA = "exercicio02:notas"
+
+# TABELAS_CARGA: Tabelas gravadas pela carga. A quantidade de linhas delas é gravada no checkpoint e conferida
+# na execução seguinte (se outro programa regravar as tabelas, o CSV é carregado novamente).
+TABELAS_CARGA = ("tb_notas", "tb_notas_longo")
+
 # =====================================
 # SQL DE CRIAÇÃO DE TABELAS
 # =====================================
@@ -60,6 +117,19 @@ CREATE TABLE IF NOT EXISTS tb_notas (
 );
 """
 
+# CREATE_TB_NOTAS_LONGO: SQL para criar a tabela 'tb_notas_longo' (formato "longo").
+# Em vez de uma coluna para cada nota, cada nota é uma linha. Assim cada aluno pode ter uma quantidade
+# diferente de avaliações (ex: de 3 a 40), sem alterar a estrutura da tabela.
+CREATE_TB_NOTAS_LONGO = """
+CREATE TABLE IF NOT EXISTS tb_notas_longo (
+    aluno_id INTEGER NOT NULL,             -- 'aluno_id': Identificador do aluno (número da linha do aluno no CSV).
+    nome TEXT NOT NULL,                    -- 'nome': Nome do aluno (repetido em cada nota).
+    avaliacao INTEGER NOT NULL,            -- 'avaliacao': Número da avaliação (1 para a coluna n1, 2 para n2, ...).
+    nota REAL NOT NULL,                    -- 'nota': Valor da nota.
+    PRIMARY KEY (aluno_id, avaliacao)      -- Cada aluno possui no máximo uma nota por avaliação.
+);
+"""
+
 # CREATE_TB_ESTATS: SQL para criar a tabela 'tb_estatisticas_notas'.
 # Esta tabela armazenará estatísticas calculadas a partir das notas dos alunos.
 # Note que não há 'id' explícito aqui, mas o SQLite adiciona um 'rowid' implícito para cada linha.
@@ -131,44 +201,221 @@ def load_csv_notas(path: Path) -> List[Tuple[str, float, float, float, float, fl
         return rows
 
 
-def trimmed_mean_5_notas(notas: Tuple[float, float, float, float, float]) -> float:
+def load_csv_notas_variaveis(path: Path) -> List[Tuple[int, str, List[Tuple[int, float]]]]:
+    """
+    Lê um CSV de notas com qualquer quantidade de colunas de notas (n1, n2, ..., nN).
+    Células vazias são ignoradas, então cada aluno pode ter uma quantidade diferente de notas.
+
+    Args:
+        path (Path): O objeto Path para o arquivo CSV de notas.
+
+    Returns:
+        List[Tuple[int, str, List[Tuple[int, float]]]]: Uma lista de tuplas (aluno_id, nome, notas), onde aluno_id
+        é o número da linha do aluno no CSV e notas é a lista de (avaliação, nota), na ordem das avaliações
+        (a coluna n3 é a avaliação 3).
+
+    Raises:
+        FileNotFoundError: Se o arquivo CSV não for encontrado.
+        ValueError: Se o CSV não contiver a coluna nome e ao menos uma coluna de nota, ou se alguma nota
+                    não puder ser convertida.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo CSV não encontrado: {path}")
+
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter=";")
+        cabecalho = [coluna.strip().lower() for coluna in next(reader, [])]
+
+        # Colunas de notas: n1, n2, ... (ordenadas pelo número, mesmo que estejam fora de ordem no arquivo).
+        colunas_notas = sorted(
+            (int(coluna[1:]), indice) for indice, coluna in enumerate(cabecalho) if re.fullmatch(r"n\d+", coluna)
+        )
+        if "nome" not in cabecalho or not colunas_notas:
+            raise ValueError("O CSV deve conter a coluna 'nome' e ao menos uma coluna de nota (n1, n2, ...).")
+        indice_nome = cabecalho.index("nome")
+
+        rows = []
+        # start=2: a linha 1 do arquivo é o cabeçalho.
+        for numero_linha, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            try:
+                nome = row[indice_nome]
+                notas = [
+                    (avaliacao, float(row[indice]))
+                    for avaliacao, indice in colunas_notas
+                    if indice < len(row) and row[indice].strip()
+                ]
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"Linha {numero_linha} inválida: {row}") from e
+            rows.append((numero_linha, nome, notas))
+        return rows
+
+
+def converter_linha_notas(numero_linha: int, registro: Dict[str, str]) -> Tuple[int, str, List[Tuple[int, float]]]:
     """
-    Calcula a média aparada de 5 notas.
-    A média aparada exclui a menor e a maior nota antes de calcular a média das restantes.
+    Converte um registro do CSV de notas (já lido como dicionário) no mesmo formato de load_csv_notas_variaveis.
 
     Args:
-        notas (Tuple[float, float, float, float, float]): Uma tupla contendo exatamente 5 notas (valores float).
+        numero_linha (int): Número da linha do registro no arquivo (utilizado como aluno_id).
+        registro (Dict[str, str]): Coluna -> valor (colunas em minúsculas: nome, n1, n2, ...).
+
+    Returns:
+        Tuple[int, str, List[Tuple[int, float]]]: (aluno_id, nome, [(avaliação, nota), ...]).
+
+    Raises:
+        ValueError: Se não houver a coluna nome ou se alguma nota não puder ser convertida.
+    """
+    try:
+        nome = registro["nome"]
+        notas = sorted(
+            (int(coluna[1:]), float(valor))
+            for coluna, valor in registro.items()
+            if coluna[:1] == "n" and coluna[1:].isdigit() and valor and valor.strip()
+        )
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Linha {numero_linha} inválida: {registro}") from e
+    return numero_linha, nome, notas
+
+
+def gravar_lote_notas(cur, alunos: List[Tuple[int, str, List[Tuple[int, float]]]]) -> None:
+    """
+    Grava um lote de alunos nas tabelas tb_notas (apenas os alunos com as notas n1 a n5) e tb_notas_longo.
+
+    Args:
+        cur: O objeto cursor do SQLite.
+        alunos (List[Tuple[int, str, List[Tuple[int, float]]]]): Alunos no formato de converter_linha_notas.
+    """
+    # Insere na tabela tb_notas (formato antigo, com 5 colunas) os alunos que possuem as notas n1 a n5.
+    # executemany() é eficiente para inserir múltiplas linhas de uma vez.
+    # Os '?' são placeholders para os valores que serão inseridos.
+    cur.executemany(
+        """INSERT INTO tb_notas (nome, nota1, nota2, nota3, nota4, nota5)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (
+            (nome, *(nota for _, nota in notas))
+            for _, nome, notas in alunos
+            if [avaliacao for avaliacao, _ in notas] == [1, 2, 3, 4, 5]
+        )
+    )
+
+    # Insere todas as notas na tabela tb_notas_longo (uma linha por nota).
+    cur.executemany(
+        """INSERT INTO tb_notas_longo (aluno_id, nome, avaliacao, nota)
+           VALUES (?, ?, ?, ?)""",
+        (
+            (aluno_id, nome, avaliacao, nota)
+            for aluno_id, nome, notas in alunos
+            for avaliacao, nota in notas
+        )
+    )
+
+
+def limpar_notas(cur) -> None:
+    """Apaga as notas de uma carga anterior (tb_notas e tb_notas_longo)."""
+    cur.execute("DELETE FROM tb_notas")
+    cur.execute("DELETE FROM tb_notas_longo")
+
+
+def _qtd_descartada(n: int, proporcao: float) -> int:
+    # Quantidade de notas descartada em cada extremo. A tolerância evita que o erro de representação do produto
+    # descarte uma nota a menos (ex: 10 * 0.3 = 2.9999999999999996, e int() resultaria em 2).
+    return math.floor(n * proporcao + 1e-9)
+
+
+def media_aparada(notas: Sequence[float], proporcao: float = PROPORCAO_APARADA) -> float:
+    """
+    Calcula a média aparada de qualquer quantidade de notas.
+    São descartadas as k menores e as k maiores notas, onde k = quantidade * proporcao arredondado para baixo.
+
+    Em vez de ordenar todas as notas, utilizamos seleção parcial: heapq.nsmallest/nlargest encontram apenas
+    as k notas de cada extremo (O(n log k)). A soma das notas restantes é o total menos esses extremos,
+    calculada com math.fsum (que não acumula erros de arredondamento).
+
+    Args:
+        notas (Sequence[float]): As notas do aluno (ao menos uma).
+        proporcao (float): Proporção descartada em cada extremo, entre 0 (média simples) e 0.5 (exclusive).
 
     Returns:
         float: A média aparada das notas.
 
     Raises:
-        ValueError: Se o número de notas não for exatamente 5.
+        ValueError: Se não houver notas ou se a proporção estiver fora do intervalo [0, 0.5).
     """
-    # Verifica se a tupla 'notas' contém exatamente 5 elementos.
-    if len(notas) != 5:
-        # Se não, levanta um ValueError, pois a função é específica para 5 notas.
-        raise ValueError("São esperadas exatamente 5 notas.")
-    
-    # sorted(notas): Cria uma nova lista com as notas ordenadas em ordem crescente.
-    ordenadas = sorted(notas)
-    
-    # intermediarias = ordenadas[1:-1]: Seleciona todas as notas, exceto a primeira (menor) e a última (maior).
-    # Isso efetivamente exclui a menor e a maior nota.
-    intermediarias = ordenadas[1:-1]
-    
-    # sum(intermediarias): Soma as notas restantes.
-    # len(intermediarias): Conta quantas notas restaram (sempre 3 neste caso).
-    # Retorna a média das notas intermediárias.
-    return sum(intermediarias) / len(intermediarias)
-
-
-def calcular_estatisticas(cur) -> Tuple[int, float, float, str]:
+    if not 0 <= proporcao < 0.5:
+        raise ValueError("A proporção deve estar entre 0 e 0.5 (exclusive).")
+    n = len(notas)
+    if n == 0:
+        raise ValueError("É necessária ao menos uma nota.")
+
+    k = _qtd_descartada(n, proporcao)
+    if k == 0:
+        return math.fsum(notas) / n
+
+    menores = heapq.nsmallest(k, notas)
+    maiores = heapq.nlargest(k, notas)
+    soma = math.fsum(itertools.chain(notas, (-nota for nota in menores), (-nota for nota in maiores)))
+    return soma / (n - 2 * k)
+
+
+def medias_aparadas(grupos: Sequence[Sequence[float]], proporcao: float = PROPORCAO_APARADA) -> List[float]:
     """
-    Lê as notas da tabela tb_notas, calcula e retorna estatísticas gerais.
+    Calcula a média aparada de vários alunos de uma vez (um grupo de notas por aluno).
+
+    Com o NumPy instalado, os alunos com a mesma quantidade de notas são reunidos em uma matriz e os extremos
+    são separados com np.partition (seleção parcial em todas as linhas ao mesmo tempo). Sem o NumPy, utiliza
+    media_aparada() para cada aluno. Nos dois casos as notas restantes são somadas com math.fsum, para que o
+    resultado não dependa de o NumPy estar instalado.
+
+    Args:
+        grupos (Sequence[Sequence[float]]): As notas de cada aluno.
+        proporcao (float): Proporção descartada em cada extremo (veja media_aparada).
+
+    Returns:
+        List[float]: As médias aparadas, na mesma ordem dos grupos.
+
+    Raises:
+        ValueError: Se algum grupo estiver vazio ou se a proporção for inválida.
+    """
+    if np is None:
+        return [media_aparada(notas, proporcao) for notas in grupos]
+
+    if not 0 <= proporcao < 0.5:
+        raise ValueError("A proporção deve estar entre 0 e 0.5 (exclusive).")
+
+    # Índices dos alunos agrupados pela quantidade de notas.
+    por_tamanho = {}
+    for i, notas in enumerate(grupos):
+        if len(notas) == 0:
+            raise ValueError("É necessária ao menos uma nota.")
+        por_tamanho.setdefault(len(notas), []).append(i)
+
+    resultado = [0.0] * len(grupos)
+    for n, indices in por_tamanho.items():
+        matriz = np.array([grupos[i] for i in indices], dtype=np.float64)
+        k = _qtd_descartada(n, proporcao)
+        if k > 0:
+            # Após a partição, as colunas k..n-k-1 contêm exatamente as notas que não são descartadas.
+            matriz = np.partition(matriz, (k, n - k - 1), axis=1)[:, k:n - k]
+        for i, restantes in zip(indices, matriz.tolist()):
+            resultado[i] = math.fsum(restantes) / (n - 2 * k)
+    return resultado
+
+
+def calcular_estatisticas(
+        cur,
+        proporcao: float = PROPORCAO_APARADA,
+        distribuicao: Optional[Distribuicao] = None
+    ) -> Tuple[int, float, float, str]:
+    """
+    Lê as notas da tabela tb_notas_longo, calcula e retorna estatísticas gerais.
+    Cada aluno pode ter uma quantidade diferente de notas.
 
     Args:
         cur: O objeto cursor do SQLite, usado para executar comandos SQL.
+        proporcao (float): Proporção das notas descartada em cada extremo na média aparada de cada aluno.
+        distribuicao (Optional[Distribuicao]): Se informada, recebe as médias aparadas de todos os alunos
+                                               (mediana, percentis e histograma).
 
     Returns:
         Tuple[int, float, float, str]: Uma tupla contendo:
@@ -177,106 +424,223 @@ def calcular_estatisticas(cur) -> Tuple[int, float, float, str]:
             - maior_media (float): A maior média aparada individual.
             - aluno_maior_media (str): O nome do aluno com a maior média aparada.
     """
-    # Executa uma consulta SQL para selecionar o nome e todas as 5 notas de todos os alunos da tb_notas.
-    cur.execute("""SELECT nome, nota1, nota2, nota3, nota4, nota5 FROM tb_notas""")
-    # fetchall(): Recupera todas as linhas do resultado da consulta.
-    # Cada linha é retornada como uma tupla.
-    rows = cur.fetchall()
-
-    # Calcula a quantidade total de alunos com base no número de linhas recuperadas.
-    qtd = len(rows)
-    
+    # Seleciona as notas de todos os alunos, ordenadas por aluno e avaliação (na ordem da chave primária).
+    cur.execute("""SELECT aluno_id, nome, nota FROM tb_notas_longo ORDER BY aluno_id, avaliacao""")
+
+    # itertools.groupby: Agrupa as linhas consecutivas do mesmo aluno (as linhas já estão ordenadas por aluno_id).
+    nomes = []
+    grupos = []
+    for (_, nome), linhas in itertools.groupby(cur.fetchall(), key=lambda linha: (linha[0], linha[1])):
+        nomes.append(nome)
+        grupos.append([nota for _, _, nota in linhas])
+
+    # Calcula a quantidade total de alunos.
+    qtd = len(grupos)
+
     # Verifica se não há alunos. Isso evita uma divisão por zero se a tabela estiver vazia.
     if qtd == 0:
         # Retorna valores neutros/zero para as estatísticas se não houver dados.
         return 0, 0.0, 0.0, ""
 
-    medias_por_aluno = [] # Lista para armazenar tuplas (nome_aluno, media_aparada).
-    # Itera sobre cada linha (tupla) de dados de aluno recuperada do banco de dados.
-    for nome, n1, n2, n3, n4, n5 in rows:
-        # Chama a função trimmed_mean_5_notas para calcular a média aparada das notas do aluno atual.
-        media = trimmed_mean_5_notas((n1, n2, n3, n4, n5))
-        # Adiciona o nome do aluno e sua média aparada à lista.
-        medias_por_aluno.append((nome, media))
+    # Médias aparadas de todos os alunos, calculadas em lote.
+    medias = medias_aparadas(grupos, proporcao)
+    if distribuicao is not None:
+        distribuicao.adicionar_varios(medias)
 
     # Calcula a média geral de todas as médias aparadas dos alunos.
-    # sum(m for _, m in medias_por_aluno): Soma apenas as médias (o segundo elemento de cada tupla).
-    media_geral = sum(m for _, m in medias_por_aluno) / qtd
+    media_geral = sum(medias) / qtd
 
-    # Encontra o aluno com a maior média aparada.
-    # max(..., key=lambda x: x[1]): Encontra o item máximo na lista 'medias_por_aluno'
-    # usando como critério de comparação o segundo elemento da tupla (a média).
-    aluno_maior_media, maior_media = max(medias_por_aluno, key=lambda x: x[1])
+    # Encontra o aluno com a maior média aparada (em caso de empate, o primeiro aluno do arquivo).
+    aluno_maior_media, maior_media = max(zip(nomes, medias), key=lambda x: x[1])
 
     # Retorna todas as estatísticas calculadas.
     return qtd, media_geral, maior_media, aluno_maior_media
 
 
-def main():
+def exibir_estatisticas(
+        qtd: int,
+        media_geral: float,
+        maior_media: float,
+        aluno_maior_media: str,
+        proporcao: float = PROPORCAO_APARADA
+    ) -> None:
+    """Exibe as estatísticas das notas na tela."""
+    # Usa f-strings para formatar e imprimir as estatísticas de forma legível no console.
+    # :.2f formata números de ponto flutuante com duas casas decimais.
+    print(f"Quantidade de alunos: {qtd}")
+    print(f"Média geral (excluindo {proporcao:.0%} das menores e maiores notas de cada aluno): {media_geral:.2f}")
+    print(f"Maior média: {maior_media:.2f}")
+    print(f"Aluno com a maior média: {aluno_maior_media}")
+
+
+class ResultadoNotas(NamedTuple):
+    """Resultado de processar_notas()."""
+    carga: Optional[ResultadoCarga]     # None se as estatísticas memoizadas foram utilizadas (o CSV não foi lido).
+    # (quantidade_de_alunos, media_geral, maior_media, aluno_maior_media); None se a carga foi interrompida.
+    estatisticas: Optional[Tuple[int, float, float, str]]
+    memoizado: bool
+
+
+def processar_notas(
+        conn: sqlite3.Connection,
+        caminho: Path = CSV_PATH,
+        proporcao: float = PROPORCAO_APARADA,
+        forcar: bool = False,
+        quarentena: Optional[Quarentena] = None,
+        interromper: Optional[Callable[[], bool]] = None
+    ) -> ResultadoNotas:
     """
-    Função principal que orquestra todo o fluxo do programa:
-    1. Carrega dados do CSV.
-    2. Conecta ao banco de dados SQLite.
-    3. Cria as tabelas necessárias.
-    4. Limpa e insere os dados das notas no banco.
-    5. Calcula as estatísticas.
-    6. Limpa e insere as estatísticas no banco.
-    7. Exibe as estatísticas na tela.
+    Carrega as notas do CSV e grava as estatísticas: tb_estatisticas_notas, a distribuição das médias e a
+    memoização (utilizada pelo main() e pelo job "notas" do servico_jobs.py).
+
+    1. Cria as tabelas necessárias. Se o CSV e a proporção não mudaram desde a última execução (e forcar for
+       False), retorna as estatísticas memoizadas.
+    2. Carrega as notas do CSV no banco, em lotes, continuando de um checkpoint se a carga anterior
+       tiver sido interrompida (com qualquer quantidade de notas por aluno). Com a quarentena, as linhas
+       inválidas vão para o arquivo de rejeitos em vez de interromper a carga.
+    3. Calcula as estatísticas.
+    4. Limpa e insere as estatísticas no banco.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        caminho (Path): Arquivo CSV das notas.
+        proporcao (float): Proporção das notas descartada em cada extremo na média aparada de cada aluno.
+        forcar (bool): Recarrega o CSV e recalcula as estatísticas, mesmo que o arquivo não tenha mudado.
+        quarentena (Optional[Quarentena]): Se informada, as linhas inválidas vão para o arquivo de rejeitos.
+        interromper (Optional[Callable[[], bool]]): Consultado após cada lote; se retornar True, a carga para
+            (e continua na próxima execução) e as estatísticas não são calculadas.
+
+    Returns:
+        ResultadoNotas: O resultado da carga e as estatísticas.
+
+    Raises:
+        OrcamentoErrosExcedido: Se a quarentena ultrapassar o orçamento de erros.
     """
-    # 1) Ler CSV: Chama a função para carregar as notas do arquivo CSV.
-    notas = load_csv_notas(CSV_PATH)
-
-    # 2) Conectar ao banco: Abre uma conexão com o banco de dados SQLite.
-    # O uso de 'with' garante que a conexão será fechada automaticamente ao final do bloco.
-    with sqlite3.connect(DB_PATH) as conn:
-        # Obtém um objeto cursor para executar comandos SQL.
-        cur = conn.cursor()
-
-        # 3) Criar tabelas: Executa os comandos SQL para criar as tabelas de notas e estatísticas.
-        # executescript() permite executar múltiplas instruções SQL separadas por ponto e vírgula.
-        cur.executescript(CREATE_TB_NOTAS + CREATE_TB_ESTATS)
-
-        # 4) Limpar e inserir em tb_notas:
-        # Limpa todos os registros existentes na tabela tb_notas para evitar duplicidade em execuções repetidas.
-        cur.execute("DELETE FROM tb_notas")
-        # Insere os dados das notas lidos do CSV na tabela tb_notas.
-        # executemany() é eficiente para inserir múltiplas linhas de uma vez.
-        # Os '?' são placeholders para os valores que serão inseridos.
-        cur.executemany(
-            """INSERT INTO tb_notas (nome, nota1, nota2, nota3, nota4, nota5)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            notas
+    # Instrumentação iniciada por quem chamou (não faz nada se estiver desligada).
+    execucao = execucao_atual()
+
+    # Obtém um objeto cursor para executar comandos SQL.
+    cur = conn.cursor()
+
+    # 1) Criar tabelas: Executa os comandos SQL para criar as tabelas de notas e estatísticas.
+    # executescript() permite executar múltiplas instruções SQL separadas por ponto e vírgula.
+    cur.executescript(CREATE_TB_NOTAS + CREATE_TB_NOTAS_LONGO + CREATE_TB_ESTATS)
+
+    # Memoização: a impressão digital do CSV (tamanho, mtime e, se necessário, hash do conteúdo) é
+    # comparada com a da última execução. Se nada mudou e as tabelas ainda são as da última carga concluída,
+    # as estatísticas gravadas são reutilizadas. Com a quarentena, o orçamento de erros é verificado com as
+    # linhas rejeitadas gravadas no checkpoint da carga (OrcamentoErrosExcedido se for ultrapassado).
+    impressao = impressao_digital(caminho, calcular_hash=False)
+    parametros = {"proporcao": proporcao}
+    if forcar:
+        # Recalcula tudo: apaga também o checkpoint, para que o CSV seja carregado novamente do início.
+        apagar_checkpoint(conn, CHAVE_CARGA)
+    elif carga_concluida(conn, CHAVE_CARGA, impressao, TABELAS_CARGA, quarentena):
+        memo = consultar_memo(conn, CHAVE_CARGA, impressao, parametros)
+        if memo is not None:
+            estatisticas = (
+                memo["quantidade_de_alunos"], memo["media_geral"], memo["maior_media"], memo["aluno_maior_media"]
+            )
+            return ResultadoNotas(None, estatisticas, True)
+
+    # 2) Ler o CSV e inserir em tb_notas e tb_notas_longo, em lotes:
+    # Cada lote é confirmado junto com o checkpoint da carga (posição no arquivo). Se a carga for
+    # interrompida, a próxima execução continua do último lote confirmado; se o arquivo não mudou desde
+    # a última carga completa, nada é lido novamente. As tabelas só são limpas quando a carga recomeça.
+    with execucao.etapa("carga_csv"):
+        carga = carregar_csv_retomavel(
+            conn, caminho, CHAVE_CARGA, converter_linha_notas, gravar_lote_notas, limpar_notas,
+            interromper=interromper, quarentena=quarentena, tabelas=TABELAS_CARGA
         )
+    execucao.contar("linhas_lidas", carga.registros_novos)
+    execucao.contar("bytes_lidos", carga.bytes_lidos)
+    execucao.contar("linhas_gravadas", carga.registros_novos)
+    if quarentena is not None:
+        quarentena.fechar()
+        execucao.contar("linhas_rejeitadas", quarentena.rejeitadas)
+    if not carga.concluida:
+        # Carga interrompida: as estatísticas são calculadas quando ela terminar.
+        return ResultadoNotas(carga, None, False)
+    # Snapshot de memória após a carga do CSV (apenas quando o perfilamento estiver ligado).
+    snapshot_memoria("apos_carga_csv")
+
+    # 3) Calcular estatísticas: Chama a função para calcular as estatísticas gerais.
+    # A distribuição das médias (notas de 0 a 10, em 10 faixas) é calculada junto com as estatísticas.
+    distribuicao = Distribuicao(0.0, 10.0, 10)
+    with execucao.etapa("estatisticas"):
+        qtd, media_geral, maior_media, aluno_maior_media = calcular_estatisticas(cur, proporcao, distribuicao)
+
+    # 4) Limpar e inserir em tb_estatisticas_notas:
+    # Limpa todos os registros existentes na tabela tb_estatisticas_notas.
+    cur.execute("DELETE FROM tb_estatisticas_notas")
+    # Insere as estatísticas calculadas na tabela tb_estatisticas_notas.
+    cur.execute(
+        """INSERT INTO tb_estatisticas_notas
+           (quantidade_de_alunos, media_geral, maior_media, aluno_maior_media)
+           VALUES (?, ?, ?, ?)""",
+        (qtd, media_geral, maior_media, aluno_maior_media)
+    )
+    # Grava a mediana, os percentis e o histograma das médias em tb_estatisticas_distribuicoes.
+    gravar_distribuicao(conn, "exercicio02", "media_aparada", distribuicao)
+
+    # Grava as estatísticas com a impressão digital do CSV obtida antes da carga (confirmadas no mesmo commit).
+    gravar_memo(
+        conn, CHAVE_CARGA, carga.impressao,
+        {
+            "quantidade_de_alunos": qtd, "media_geral": media_geral,
+            "maior_media": maior_media, "aluno_maior_media": aluno_maior_media,
+        },
+        parametros
+    )
+
+    # conn.commit(): Confirma todas as alterações feitas no banco de dados.
+    # Essencial para que as inserções e deleções sejam salvas permanentemente.
+    with execucao.etapa("commit"):
+        conn.commit()
 
-        # 5) Calcular estatísticas: Chama a função para calcular as estatísticas gerais.
-        qtd, media_geral, maior_media, aluno_maior_media = calcular_estatisticas(cur)
-
-        # 6) Limpar e inserir em tb_estatisticas_notas:
-        # Limpa todos os registros existentes na tabela tb_estatisticas_notas.
-        cur.execute("DELETE FROM tb_estatisticas_notas")
-        # Insere as estatísticas calculadas na tabela tb_estatisticas_notas.
-        cur.execute(
-            """INSERT INTO tb_estatisticas_notas
-               (quantidade_de_alunos, media_geral, maior_media, aluno_maior_media)
-               VALUES (?, ?, ?, ?)""",
-            (qtd, media_geral, maior_media, aluno_maior_media)
-        )
+    return ResultadoNotas(carga, (qtd, media_geral, maior_media, aluno_maior_media), False)
 
-        # 7) Exibir estatísticas na tela:
-        # Usa f-strings para formatar e imprimir as estatísticas de forma legível no console.
-        # :.2f formata números de ponto flutuante com duas casas decimais.
-        print(f"Quantidade de alunos: {qtd}")
-        print(f"Média geral (excluindo menor e maior nota de cada aluno): {media_geral:.2f}")
-        print(f"Maior média: {maior_media:.2f}")
-        print(f"Aluno com a maior média: {aluno_maior_media}")
 
-        # conn.commit(): Confirma todas as alterações feitas no banco de dados dentro do bloco 'with'.
-        # Essencial para que as inserções e deleções sejam salvas permanentemente.
-        conn.commit()
+def main(proporcao: float = PROPORCAO_APARADA, forcar: bool = False, quarentena: Optional[Quarentena] = None):
+    """
+    Função principal: conecta ao banco de dados SQLite, executa processar_notas() e exibe as estatísticas.
+    """
+    # Instrumentação: registra o tempo de cada etapa e, ao sair do 'with', grava um registro JSON (se estiver
+    # ligada), inclusive quando a execução termina com erro (status "erro").
+    with iniciar_execucao("exercicio02") as execucao:
+        # Conectar ao banco: Abre uma conexão com o banco de dados SQLite.
+        # O uso de 'with' confirma a transação ao final do bloco (ou a desfaz, em caso de erro).
+        with sqlite3.connect(DB_PATH) as conn:
+            resultado = processar_notas(conn, CSV_PATH, proporcao, forcar, quarentena)
+
+        if quarentena is not None:
+            # Resumo das linhas rejeitadas por tipo de erro (ex: numero_invalido: 3).
+            print(quarentena.texto_resumo())
+        carga = resultado.carga
+        if carga is not None and carga.retomada and carga.registros_novos:
+            print(f"Carga retomada do checkpoint: {carga.registros_novos} de {carga.registros} alunos lidos agora.")
+
+        # Exibir estatísticas na tela.
+        exibir_estatisticas(*resultado.estatisticas, proporcao)
+
+        if resultado.memoizado:
+            execucao.finalizar(memoizado=True)
 
 
 # Bloco de execução principal:
 # Isso garante que a função main() seja chamada apenas quando o script é executado diretamente,
 # e não quando é importado como um módulo em outro script.
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Carga das notas e cálculo das estatísticas")
+    parser.add_argument("--proporcao", type=float, default=PROPORCAO_APARADA,
+                        help="Proporção das notas descartada em cada extremo da média aparada (padrão: 0.2)")
+    parser.add_argument("--forcar", action="store_true",
+                        help="Recarrega o CSV e recalcula as estatísticas, mesmo que o arquivo não tenha mudado")
+    adicionar_argumentos_quarentena(parser)
+    adicionar_argumentos_perfil(parser)
+    args = parser.parse_args()
+
+    # perfilar(): Se o perfilamento estiver desligado, apenas executa main().
+    # quarentena_dos_argumentos(): None se nenhum argumento de quarentena foi informado (primeiro erro interrompe).
+    with perfilar("exercicio02", args.perfil, args.perfil_amostragem):
+        main(args.proporcao, args.forcar, quarentena_dos_argumentos(args))
\ No newline at end of file
@@ -0,0 +1,124 @@
+# FILTRO DE BLOOM
+# Estrutura probabilística que responde à pergunta "este item já foi visto?" usando pouca memória:
+#   - se a resposta for "não", o item com certeza nunca foi adicionado;
+#   - se a resposta for "talvez", o item pode ter sido adicionado (ou é um falso positivo).
+#
+# O tamanho do filtro (m bits) e a quantidade de funções de hash (k) são calculados a partir da quantidade
+# esperada de itens (n) e da taxa de falsos positivos desejada (p):
+#   m = -n * ln(p) / ln(2)^2        k = m / n * ln(2)
+#
+# O filtro pode ser gravado em disco e carregado novamente, para ser reaproveitado entre execuções. Junto com
+# ele é gravada a "origem": um texto livre de quem usa o filtro que identifica o estado dos dados adicionados
+# (ex: a impressão digital da tabela), para saber se o filtro gravado ainda corresponde a esses dados.
+
+import hashlib
+import math
+import os
+import struct
+
+from pathlib import Path
+
+# Cabeçalho do arquivo: identificador, quantidade de bits (m), quantidade de hashes (k),
+# capacidade (n), quantidade de itens adicionados e tamanho da origem (em bytes, gravada logo após o cabeçalho).
+MAGICO = b"PWBLOOM2"
+CABECALHO = struct.Struct("<8sQQQQI")
+
+MASCARA_64 = (1 << 64) - 1
+
+
+class FiltroBloom:
+
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = 0.001):
+        """
+        Args:
+            capacidade (int): Quantidade esperada de itens (n).
+            taxa_falsos_positivos (float): Taxa de falsos positivos desejada (p) quando o filtro estiver cheio.
+
+        Raises:
+            ValueError: Se a capacidade ou a taxa forem inválidas.
+        """
+        if capacidade <= 0:
+            raise ValueError("A capacidade do filtro deve ser maior que zero.")
+        if not 0 < taxa_falsos_positivos < 1:
+            raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1.")
+
+        self.capacidade = capacidade
+        self.m = max(8, math.ceil(-capacidade * math.log(taxa_falsos_positivos) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.m / capacidade * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.quantidade = 0
+        # Identifica os dados adicionados ao filtro (definida e conferida por quem usa o filtro).
+        self.origem = ""
+
+    def _posicoes(self, item: str):
+        # Double hashing: a partir de dois hashes de 64 bits geramos as k posições.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.m
+        return [((h1 + i * h2) & MASCARA_64) % m for i in range(self.k)]
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._posicoes(item))
+
+    def adicionar(self, item: str) -> bool:
+        """
+        Adiciona o item ao filtro.
+
+        Returns:
+            bool: True se o item talvez já estivesse no filtro (todos os bits já estavam ligados),
+                  False se o item com certeza é novo.
+        """
+        bits = self.bits
+        ja_existia = True
+        for p in self._posicoes(item):
+            byte, mascara = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mascara:
+                ja_existia = False
+                bits[byte] |= mascara
+        if not ja_existia:
+            self.quantidade += 1
+        return ja_existia
+
+    def taxa_estimada(self) -> float:
+        """Taxa de falsos positivos estimada para a quantidade atual de itens."""
+        return (1 - math.exp(-self.k * self.quantidade / self.m)) ** self.k
+
+    def salvar(self, caminho: Path) -> None:
+        """Grava o filtro em disco (em um arquivo temporário que depois é renomeado)."""
+        caminho = Path(caminho)
+        temporario = caminho.with_name(caminho.name + f".{os.getpid()}.tmp")
+        origem = self.origem.encode("utf-8")
+        with open(temporario, "wb") as f:
+            f.write(CABECALHO.pack(MAGICO, self.m, self.k, self.capacidade, self.quantidade, len(origem)))
+            f.write(origem)
+            f.write(self.bits)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> "FiltroBloom":
+        """
+        Carrega um filtro gravado com salvar().
+
+        Raises:
+            ValueError: Se o arquivo não for um filtro válido.
+        """
+        with open(caminho, "rb") as f:
+            dados = f.read(CABECALHO.size)
+            if len(dados) != CABECALHO.size:
+                raise ValueError(f"Arquivo de filtro inválido: {caminho}")
+            magico, m, k, capacidade, quantidade, tamanho_origem = CABECALHO.unpack(dados)
+            if magico != MAGICO:
+                raise ValueError(f"Arquivo de filtro inválido: {caminho}")
+            origem = f.read(tamanho_origem)
+            bits = bytearray(f.read())
+
+        if len(origem) != tamanho_origem or len(bits) != (m + 7) // 8:
+            raise ValueError(f"Arquivo de filtro incompleto: {caminho}")
+
+        filtro = cls.__new__(cls)
+        filtro.m, filtro.k, filtro.capacidade, filtro.quantidade = m, k, capacidade, quantidade
+        filtro.origem = origem.decode("utf-8", errors="replace")
+        filtro.bits = bits
+        return filtro
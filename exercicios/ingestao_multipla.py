@@ -0,0 +1,489 @@
+# INGESTÃO DE VÁRIOS ARQUIVOS EM PARALELO - cursos.csv, notas.csv, vendas.csv, vendedores.txt -> db.sqlite3
+# Os scripts de notas, vendas e vendedores gravam no mesmo db.sqlite3. O SQLite permite apenas um escritor por
+# vez: executando os scripts ao mesmo tempo, eles disputam o banco e falham com "database is locked". Por isso
+# hoje eles são executados um depois do outro.
+#
+# Aqui separamos a leitura da gravação:
+#   - processos (ProcessPoolExecutor) leem e convertem os arquivos em paralelo, um arquivo por processo,
+#     e enviam os registros em lotes por uma fila (multiprocessing.Queue) com tamanho máximo;
+#   - uma única thread escritora é dona da conexão com o banco: ela recebe os lotes de todos os arquivos,
+#     executa os INSERTs e agrupa vários lotes em um mesmo commit (por quantidade de linhas ou por tempo).
+#
+# Como só existe um escritor, não há disputa pelo banco, e os processos continuam convertendo os próximos
+# lotes enquanto o escritor grava.
+#
+# Observação: com os commits agrupados, se um arquivo apresentar erro no meio da leitura, os lotes anteriores
+# dele podem já ter sido gravados. O erro é informado no resumo do arquivo. Se o próprio escritor falhar (ex: o
+# banco está bloqueado por outro programa), as leituras são canceladas e o erro é propagado.
+#
+# Os tipos que substituem as tabelas (cursos, notas) aceitam apenas um arquivo por execução: os registros de
+# dois arquivos de notas, por exemplo, teriam os mesmos aluno_id.
+#
+# Cada tipo é gravado no banco do script dono das tabelas: os cursos vão para o db.sqlite3 da raiz do repositório
+# (exercicio01.DB_PATH), onde o exercicio01.py, o servico_jobs.py e o consultas_leitura.py os leem; os demais
+# tipos vão para o db.sqlite3 deste diretório. O escritor mantém uma conexão por banco. Com --banco, todos os
+# tipos são gravados no banco informado.
+#
+# Uso:
+#   python ingestao_multipla.py cursos.csv notas.csv vendas.csv vendedores.txt
+#   python ingestao_multipla.py --tipo vendas exportacao_2024.csv
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import multiprocessing
+import queue
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from checkpoint import invalidar_carga
+from instrumentacao import iniciar_execucao
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+
+TAMANHO_LOTE = 5000
+# Tamanho máximo da fila entre os processos e o escritor, em lotes.
+TAMANHO_FILA = 32
+# Intervalo (segundos) em que um processo de leitura com a fila cheia verifica se as leituras foram canceladas.
+INTERVALO_CANCELAMENTO = 0.5
+# O escritor faz commit quando acumular essa quantidade de linhas ou quando passar esse tempo desde o último.
+LINHAS_POR_COMMIT = 50000
+INTERVALO_COMMIT = 1.0
+
+
+# =====================================
+# TIPOS DE ARQUIVO
+# =====================================
+# Cada tipo de arquivo possui:
+#   - criar: comandos de criação das tabelas;
+#   - limpar: comandos executados uma vez por carga antes do primeiro lote (como os scripts originais, que
+#     apagam a tabela antes de inserir); tipos com limpar aceitam um único arquivo por carga;
+#   - comandos: nome -> INSERT utilizado para os lotes enviados com esse nome;
+#   - ler: função executada no processo de leitura, que retorna lotes (nome do comando, linhas);
+#   - cargas: chaves das cargas com checkpoint (checkpoint.py) que gravam as mesmas tabelas. Como as tabelas são
+#     regravadas aqui, os checkpoints e as estatísticas memoizadas dessas cargas são invalidados;
+#   - banco: banco do script dono das tabelas (padrão: DB_PATH).
+
+class TipoArquivo(NamedTuple):
+    criar: str
+    limpar: Tuple[str, ...]
+    comandos: Dict[str, str]
+    ler: Callable[[Path, int], Iterator[Tuple[str, List[tuple]]]]
+    cargas: Tuple[str, ...] = ()
+    banco: Path = DB_PATH
+
+
+def _em_lotes(registros, tamanho_lote: int) -> Iterator[List[tuple]]:
+    lote = []
+    for registro in registros:
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def ler_cursos(caminho: Path, tamanho_lote: int) -> Iterator[Tuple[str, List[tuple]]]:
+    with open(caminho, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        registros = (
+            (row["curso"], int(row["carga_horaria"]), float(row["preco"]))
+            for row in reader
+        )
+        for lote in _em_lotes(registros, tamanho_lote):
+            yield "cursos", lote
+
+
+def ler_notas(caminho: Path, tamanho_lote: int) -> Iterator[Tuple[str, List[tuple]]]:
+    from exercicio02 import load_csv_notas_variaveis
+
+    alunos = load_csv_notas_variaveis(Path(caminho))
+    completos = (
+        (nome, *(nota for _, nota in notas))
+        for _, nome, notas in alunos
+        if [avaliacao for avaliacao, _ in notas] == [1, 2, 3, 4, 5]
+    )
+    for lote in _em_lotes(completos, tamanho_lote):
+        yield "notas", lote
+
+    longo = (
+        (aluno_id, nome, avaliacao, nota)
+        for aluno_id, nome, notas in alunos
+        for avaliacao, nota in notas
+    )
+    for lote in _em_lotes(longo, tamanho_lote):
+        yield "notas_longo", lote
+
+
+def ler_vendas(caminho: Path, tamanho_lote: int) -> Iterator[Tuple[str, List[tuple]]]:
+    from analise_vendas import COLUNAS_VENDAS, separar_campos
+
+    with open(caminho, encoding="utf-8") as f:
+        cabecalho = tuple(c.strip().lower() for c in f.readline().lstrip("﻿").split(";"))
+        if cabecalho != COLUNAS_VENDAS:
+            raise ValueError(f"O CSV deve conter as colunas: {';'.join(COLUNAS_VENDAS)}")
+
+        def registros():
+            for numero_linha, linha in enumerate(f, start=2):
+                linha = linha.rstrip("\r\n")
+                if not linha:
+                    continue
+                try:
+                    sale_id, produto, quantidade, preco = separar_campos(linha)
+                    yield sale_id, produto, int(quantidade), float(preco)
+                except ValueError as e:
+                    raise ValueError(f"Linha {numero_linha} inválida: {linha}") from e
+
+        for lote in _em_lotes(registros(), tamanho_lote):
+            yield "vendas", lote
+
+
+def ler_vendedores_arquivo(caminho: Path, tamanho_lote: int) -> Iterator[Tuple[str, List[tuple]]]:
+    from vendedores import ErroRegistro, ler_vendedores
+
+    erros: List[ErroRegistro] = []
+    registros = ((v.codigo, v.nome, v.vendas) for v in ler_vendedores(Path(caminho), erros))
+    for lote in _em_lotes(registros, tamanho_lote):
+        yield "vendedores", lote
+    if erros:
+        primeiro = erros[0]
+        raise ValueError(
+            f"{len(erros)} registro(s) inválido(s); primeiro: linha {primeiro.linha}: {primeiro.mensagem}"
+        )
+
+
+def _tipos() -> Dict[str, TipoArquivo]:
+    # Os SQL são importados dos próprios scripts, para que as tabelas sejam sempre as mesmas.
+    from exercicio01 import CHAVE_CARGA as CHAVE_CARGA_CURSOS, CREATE_TB_CURSOS, DB_PATH as DB_CURSOS_PATH
+    from exercicio02 import CHAVE_CARGA as CHAVE_CARGA_NOTAS, CREATE_TB_NOTAS, CREATE_TB_NOTAS_LONGO
+    from ingestao_vendas import CREATE_TB_VENDAS
+    from vendedores import CREATE_TB_VENDEDORES
+
+    return {
+        "cursos": TipoArquivo(
+            criar=CREATE_TB_CURSOS,
+            limpar=("DELETE FROM tb_cursos",),
+            comandos={"cursos": "INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (?, ?, ?)"},
+            ler=ler_cursos,
+            cargas=(CHAVE_CARGA_CURSOS,),
+            banco=Path(DB_CURSOS_PATH).resolve(),
+        ),
+        "notas": TipoArquivo(
+            criar=CREATE_TB_NOTAS + CREATE_TB_NOTAS_LONGO,
+            limpar=("DELETE FROM tb_notas", "DELETE FROM tb_notas_longo"),
+            comandos={
+                "notas": "INSERT INTO tb_notas (nome, nota1, nota2, nota3, nota4, nota5) VALUES (?, ?, ?, ?, ?, ?)",
+                "notas_longo": "INSERT INTO tb_notas_longo (aluno_id, nome, avaliacao, nota) VALUES (?, ?, ?, ?)",
+            },
+            ler=ler_notas,
+            cargas=(CHAVE_CARGA_NOTAS,),
+        ),
+        # Vendas e vendedores são acumulados entre as cargas (a chave primária evita duplicados).
+        "vendas": TipoArquivo(
+            criar=CREATE_TB_VENDAS,
+            limpar=(),
+            comandos={
+                "vendas": "INSERT OR IGNORE INTO tb_vendas (sale_id, produto, quantidade, preco) VALUES (?, ?, ?, ?)"
+            },
+            ler=ler_vendas,
+        ),
+        "vendedores": TipoArquivo(
+            criar=CREATE_TB_VENDEDORES,
+            limpar=(),
+            comandos={
+                "vendedores": "INSERT OR REPLACE INTO tb_vendedores (codigo, vendedor, vendas) VALUES (?, ?, ?)"
+            },
+            ler=ler_vendedores_arquivo,
+        ),
+    }
+
+
+def detectar_tipo(caminho: Path) -> str:
+    """Detecta o tipo pelo nome do arquivo (ex: vendas_2024.csv -> vendas)."""
+    nome = Path(caminho).stem.lower()
+    for tipo in ("vendedores", "vendas", "cursos", "notas"):
+        if nome.startswith(tipo):
+            return tipo
+    raise ValueError(f"Não foi possível detectar o tipo do arquivo {caminho}; utilize --tipo.")
+
+
+# =====================================
+# PROCESSOS DE LEITURA
+# =====================================
+
+_fila: Optional[multiprocessing.Queue] = None
+_cancelar = None
+
+
+class LeituraCancelada(Exception):
+    """O escritor falhou e as leituras em andamento foram canceladas."""
+
+
+def _inicializar_processo(fila: multiprocessing.Queue, cancelar) -> None:
+    # A fila e o evento são recebidos na criação do processo (eles não podem ser enviados como argumento de cada
+    # tarefa).
+    global _fila, _cancelar
+    _fila = fila
+    _cancelar = cancelar
+
+
+def _enviar(mensagem: tuple) -> None:
+    # Com a fila cheia, put() bloquearia para sempre se o escritor tivesse falhado: o cancelamento é verificado
+    # a cada INTERVALO_CANCELAMENTO segundos.
+    while not _cancelar.is_set():
+        try:
+            _fila.put(mensagem, timeout=INTERVALO_CANCELAMENTO)
+            return
+        except queue.Full:
+            continue
+    raise LeituraCancelada("leitura cancelada (falha do escritor)")
+
+
+def _ler_arquivo(caminho: str, tipo: str, tamanho_lote: int) -> Tuple[str, int, Optional[str]]:
+    """Executado em um processo de leitura: envia os lotes do arquivo para o escritor."""
+    linhas = 0
+    try:
+        for comando, lote in _tipos()[tipo].ler(Path(caminho), tamanho_lote):
+            _enviar(("lote", caminho, tipo, comando, lote))
+            linhas += len(lote)
+    except Exception as e:
+        return caminho, linhas, f"{type(e).__name__}: {e}"
+    return caminho, linhas, None
+
+
+# =====================================
+# ESCRITOR
+# =====================================
+
+class Escritor(threading.Thread):
+    """
+    Thread dona das conexões com os bancos (uma por banco, veja TipoArquivo.banco). Recebe os lotes da fila e
+    agrupa vários lotes em cada commit.
+
+    Se o escritor falhar fora da gravação de um arquivo (ex: "database is locked" ao abrir o banco), a exceção
+    fica em falha, o evento cancelar é sinalizado para os processos de leitura e a fila continua sendo consumida
+    (e descartada) até a mensagem "fim", para que nenhum processo fique bloqueado.
+    """
+
+    def __init__(
+            self,
+            caminho_banco: Optional[str],
+            fila,
+            cancelar,
+            linhas_por_commit: int = LINHAS_POR_COMMIT,
+            intervalo_commit: float = INTERVALO_COMMIT
+        ):
+        super().__init__(name="escritor", daemon=True)
+        self.caminho_banco = caminho_banco
+        self.fila = fila
+        self.cancelar = cancelar
+        self.linhas_por_commit = linhas_por_commit
+        self.intervalo_commit = intervalo_commit
+        self.tipos = _tipos()
+        self.gravadas: Dict[str, int] = {}
+        self.erros: Dict[str, str] = {}
+        self.commits = 0
+        self.falha: Optional[BaseException] = None
+
+    def run(self) -> None:
+        # As conexões são criadas dentro da thread: objetos sqlite3 só podem ser usados pela thread que os criou.
+        conexoes: Dict[str, sqlite3.Connection] = {}
+        try:
+            try:
+                self._gravar(conexoes)
+            finally:
+                for conn in conexoes.values():
+                    conn.close()
+        except BaseException as e:
+            self.falha = e
+            self.cancelar.set()
+            self._descartar()
+
+    def _descartar(self) -> None:
+        while self.fila.get() != "fim":
+            pass
+
+    def _conexao(self, conexoes: Dict[str, sqlite3.Connection], tipo: str) -> sqlite3.Connection:
+        caminho = self.caminho_banco or str(self.tipos[tipo].banco)
+        if caminho not in conexoes:
+            conn = sqlite3.connect(caminho)
+            # WAL: leitores (ex: relatórios) não bloqueiam o escritor durante a carga.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conexoes[caminho] = conn
+        return conexoes[caminho]
+
+    def _gravar(self, conexoes: Dict[str, sqlite3.Connection]) -> None:
+        preparados = set()
+        pendentes = 0
+        ultimo_commit = time.monotonic()
+
+        while True:
+            try:
+                mensagem = self.fila.get(timeout=self.intervalo_commit)
+            except queue.Empty:
+                mensagem = None
+
+            if mensagem == "fim":
+                break
+
+            if mensagem is not None:
+                _, caminho, tipo, comando, lote = mensagem
+                if caminho not in self.erros:
+                    try:
+                        definicao = self.tipos[tipo]
+                        conn = self._conexao(conexoes, tipo)
+                        if tipo not in preparados:
+                            conn.executescript(definicao.criar)
+                            for sql in definicao.limpar:
+                                conn.execute(sql)
+                            for chave in definicao.cargas:
+                                invalidar_carga(conn, chave)
+                            preparados.add(tipo)
+                        # rowcount, e não len(lote): com INSERT OR IGNORE (vendas), as linhas com chave já
+                        # existente não são gravadas.
+                        gravadas = conn.executemany(definicao.comandos[comando], lote).rowcount
+                        self.gravadas[caminho] = self.gravadas.get(caminho, 0) + gravadas
+                        pendentes += len(lote)
+                    except sqlite3.Error as e:
+                        # Os próximos lotes deste arquivo são descartados, mas a fila continua sendo consumida
+                        # para que o processo de leitura não fique bloqueado.
+                        self.erros[caminho] = f"{type(e).__name__}: {e}"
+
+            agora = time.monotonic()
+            if pendentes and (pendentes >= self.linhas_por_commit or agora - ultimo_commit >= self.intervalo_commit):
+                self._commit(conexoes)
+                pendentes = 0
+                ultimo_commit = agora
+
+        self._commit(conexoes)
+
+    def _commit(self, conexoes: Dict[str, sqlite3.Connection]) -> None:
+        for conn in conexoes.values():
+            conn.commit()
+        self.commits += 1
+
+
+# =====================================
+# INGESTÃO
+# =====================================
+
+class ResumoArquivo(NamedTuple):
+    arquivo: str
+    tipo: str
+    lidas: int
+    gravadas: int
+    erro: Optional[str]
+
+
+def ingerir_arquivos(
+        arquivos: Sequence[Tuple[Path, str]],
+        caminho_banco: Optional[Path] = None,
+        processos: Optional[int] = None,
+        tamanho_lote: int = TAMANHO_LOTE,
+        linhas_por_commit: int = LINHAS_POR_COMMIT
+    ) -> Tuple[List[ResumoArquivo], int]:
+    """
+    Carrega vários arquivos: leitura em paralelo e um único escritor.
+
+    Args:
+        arquivos (Sequence[Tuple[Path, str]]): Pares (arquivo, tipo). Tipos: cursos, notas, vendas, vendedores.
+        caminho_banco (Optional[Path]): Banco de dados SQLite de todos os tipos. Se None, cada tipo é gravado no
+                                        banco do script dono das tabelas (TipoArquivo.banco).
+        processos (Optional[int]): Quantidade de processos de leitura (padrão: um por arquivo, até os.cpu_count()).
+        tamanho_lote (int): Quantidade de registros por lote enviado ao escritor.
+        linhas_por_commit (int): Quantidade de linhas acumuladas antes de cada commit.
+
+    Returns:
+        Tuple[List[ResumoArquivo], int]: O resumo de cada arquivo e a quantidade de commits executados.
+
+    Raises:
+        ValueError: Se algum tipo for desconhecido ou se houver mais de um arquivo de um tipo que substitui as
+                    tabelas (cursos, notas).
+        sqlite3.Error: Se o escritor falhar (ex: banco bloqueado); as leituras em andamento são canceladas.
+    """
+    tipos = _tipos()
+    por_tipo: Dict[str, List[str]] = {}
+    for caminho, tipo in arquivos:
+        if tipo not in tipos:
+            raise ValueError(f"Tipo desconhecido para {caminho}: {tipo} (opções: {', '.join(tipos)})")
+        por_tipo.setdefault(tipo, []).append(str(caminho))
+    for tipo, caminhos in por_tipo.items():
+        if tipos[tipo].limpar and len(caminhos) > 1:
+            raise ValueError(
+                f"O tipo {tipo} substitui as tabelas e aceita apenas um arquivo por carga: {', '.join(caminhos)}"
+            )
+
+    contexto = multiprocessing.get_context()
+    fila = contexto.Queue(maxsize=TAMANHO_FILA)
+    cancelar = contexto.Event()
+    escritor = Escritor(caminho_banco and str(caminho_banco), fila, cancelar, linhas_por_commit)
+    escritor.start()
+
+    qtd_processos = processos or min(len(arquivos), multiprocessing.cpu_count()) or 1
+    resultados = {}
+    try:
+        with ProcessPoolExecutor(qtd_processos, mp_context=contexto,
+                                 initializer=_inicializar_processo, initargs=(fila, cancelar)) as executor:
+            futuros = [executor.submit(_ler_arquivo, str(caminho), tipo, tamanho_lote) for caminho, tipo in arquivos]
+            for futuro in futuros:
+                caminho, linhas, erro = futuro.result()
+                resultados[caminho] = (linhas, erro)
+    finally:
+        # Todos os processos terminaram: avisa o escritor que não há mais lotes.
+        fila.put("fim")
+        escritor.join()
+    if escritor.falha is not None:
+        raise escritor.falha
+
+    resumos = []
+    for caminho, tipo in arquivos:
+        linhas, erro = resultados.get(str(caminho), (0, "não processado"))
+        erro = erro or escritor.erros.get(str(caminho))
+        resumos.append(ResumoArquivo(str(caminho), tipo, linhas, escritor.gravadas.get(str(caminho), 0), erro))
+    return resumos, escritor.commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de vários arquivos nos bancos SQLite com um único escritor")
+    parser.add_argument("arquivos", nargs="+")
+    parser.add_argument("--tipo", help="Tipo de todos os arquivos (padrão: detectado pelo nome)")
+    parser.add_argument("--banco", help="Banco de todos os tipos (padrão: o banco do script dono de cada tabela)")
+    parser.add_argument("--processos", type=int, help="Quantidade de processos de leitura")
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE)
+    parser.add_argument("--linhas-por-commit", type=int, default=LINHAS_POR_COMMIT)
+    args = parser.parse_args()
+
+    arquivos = [(Path(arquivo), args.tipo or detectar_tipo(Path(arquivo))) for arquivo in args.arquivos]
+
+    inicio = time.perf_counter()
+    with iniciar_execucao("ingestao_multipla") as execucao:
+        with execucao.etapa("ingestao"):
+            resumos, commits = ingerir_arquivos(
+                arquivos, args.banco and Path(args.banco), args.processos, args.tamanho_lote, args.linhas_por_commit
+            )
+        execucao.contar("arquivos", len(resumos))
+        execucao.contar("arquivos_com_erro", sum(1 for r in resumos if r.erro))
+        execucao.contar("linhas_lidas", sum(r.lidas for r in resumos))
+        execucao.contar("linhas_gravadas", sum(r.gravadas for r in resumos))
+        execucao.contar("commits", commits)
+    duracao = time.perf_counter() - inicio
+
+    for resumo in resumos:
+        situacao = f"ERRO: {resumo.erro}" if resumo.erro else "ok"
+        print(f"{resumo.arquivo} ({resumo.tipo}): {resumo.lidas} lidas, {resumo.gravadas} gravadas - {situacao}")
+    print(f"{sum(r.gravadas for r in resumos)} linhas gravadas em {duracao:.2f}s ({commits} commit(s))")
+
+
+if __name__ == "__main__":
+    main()
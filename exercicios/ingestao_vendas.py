@@ -0,0 +1,293 @@
+# INGESTÃO DE VENDAS COM DETECÇÃO DE DUPLICADOS - vendas.csv -> tb_vendas
+# Cada linha do vendas.csv é identificada por um sale_id (UUID). Quando carregamos exportações que se
+# sobrepõem, o mesmo sale_id aparece mais de uma vez. Consultar o banco para cada linha custaria uma consulta
+# por registro, então utilizamos um filtro de Bloom na memória:
+#   - se o filtro diz que o sale_id com certeza é novo, a linha é inserida sem consultar o banco;
+#   - se o filtro diz que o sale_id talvez já exista, ele é verificado no banco, em lotes (WHERE sale_id IN (...)).
+#
+# O filtro é gravado em disco no final da carga e reaproveitado na próxima execução. Se o arquivo do filtro
+# não existir, estiver desatualizado em relação ao banco ou for pequeno demais, ele é recriado a partir da
+# tabela tb_vendas. Para saber se está desatualizado, o filtro guarda a impressão digital da tabela (quantidade
+# de registros, maior rowid e o sale_id desse registro): uma carga feita por outro programa, ou registros
+# apagados e inseridos que mantêm a quantidade, mudam o maior rowid ou o último sale_id.
+#
+# As linhas duplicadas não são inseridas: elas são contadas e gravadas em um arquivo CSV separado.
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import json
+import os
+import sqlite3
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from filtro_bloom import FiltroBloom
+from instrumentacao import execucao_atual, iniciar_execucao
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+CSV_PATH = BASE_DIR / "vendas.csv"
+FILTRO_PATH = BASE_DIR / "vendas.bloom"
+DUPLICADOS_PATH = BASE_DIR / "vendas_duplicadas.csv"
+
+# Quantidade de linhas processadas (e confirmadas no banco) por vez.
+TAMANHO_LOTE = 10000
+
+# Limite de valores em um único "IN (...)". O SQLite aceita no máximo 999 parâmetros em versões antigas.
+LIMITE_PARAMETROS = 900
+
+TAXA_FALSOS_POSITIVOS = 0.001
+
+CREATE_TB_VENDAS = """
+CREATE TABLE IF NOT EXISTS tb_vendas (
+    sale_id TEXT PRIMARY KEY,      -- Identificador único da venda (UUID).
+    produto TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    preco REAL NOT NULL
+);
+"""
+
+INSERT_VENDA = "INSERT INTO tb_vendas (sale_id, produto, quantidade, preco) VALUES (?, ?, ?, ?)"
+
+
+# =====================================
+# FILTRO DE BLOOM
+# =====================================
+
+def estimar_linhas(caminho: Path, amostra: int = 64 * 1024) -> int:
+    """Estima a quantidade de linhas do arquivo a partir do tamanho médio das linhas do início do arquivo."""
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, "rb") as f:
+        dados = f.read(amostra)
+    linhas = dados.count(b"\n") or 1
+    return max(1, tamanho * linhas // max(1, len(dados)))
+
+
+def estado_tabela(conn: sqlite3.Connection) -> Tuple[int, str]:
+    """
+    Retorna a quantidade de registros da tb_vendas e a sua impressão digital (quantidade, maior rowid e o
+    sale_id desse registro), gravada como origem do filtro. O maior rowid vem do fim da chave da tabela, sem
+    percorrê-la.
+    """
+    registros = conn.execute("SELECT COUNT(*) FROM tb_vendas").fetchone()[0]
+    ultimo = conn.execute("SELECT rowid, sale_id FROM tb_vendas ORDER BY rowid DESC LIMIT 1").fetchone()
+    return registros, json.dumps([registros, *(ultimo or (None, None))])
+
+
+def recriar_filtro(conn: sqlite3.Connection, capacidade: int, taxa: float) -> FiltroBloom:
+    """Cria um novo filtro com todos os sale_id já existentes na tabela tb_vendas."""
+    filtro = FiltroBloom(capacidade, taxa)
+    cur = conn.execute("SELECT sale_id FROM tb_vendas")
+    while True:
+        registros = cur.fetchmany(TAMANHO_LOTE)
+        if not registros:
+            break
+        for (sale_id,) in registros:
+            filtro.adicionar(sale_id)
+    # O contador do filtro precisa ser igual à quantidade de registros da tabela (veja abrir_filtro).
+    filtro.quantidade = conn.execute("SELECT COUNT(*) FROM tb_vendas").fetchone()[0]
+    return filtro
+
+
+def abrir_filtro(
+        conn: sqlite3.Connection,
+        caminho_filtro: Path,
+        linhas_esperadas: int,
+        taxa: float = TAXA_FALSOS_POSITIVOS
+    ) -> FiltroBloom:
+    """
+    Carrega o filtro gravado em disco ou o recria a partir do banco.
+
+    O filtro gravado só é reaproveitado se:
+      - a impressão digital gravada no filtro for igual à da tabela e a quantidade de itens do filtro for igual
+        à quantidade de registros (o filtro não está desatualizado, ex: se uma execução anterior terminou antes
+        de gravar o filtro ou se a tabela foi alterada por outro programa);
+      - ainda houver capacidade para as linhas esperadas sem ultrapassar a taxa de falsos positivos.
+    """
+    registros, origem = estado_tabela(conn)
+    necessario = registros + linhas_esperadas
+
+    if Path(caminho_filtro).exists():
+        try:
+            filtro = FiltroBloom.carregar(caminho_filtro)
+            if filtro.origem == origem and filtro.quantidade == registros and filtro.capacidade >= necessario:
+                return filtro
+        except ValueError:
+            pass
+
+    # Folga de 2x para que as próximas cargas ainda caibam no filtro.
+    return recriar_filtro(conn, max(1000, 2 * necessario), taxa)
+
+
+# =====================================
+# INGESTÃO
+# =====================================
+
+def _existentes_no_banco(cur: sqlite3.Cursor, sale_ids: List[str]) -> set:
+    """Retorna quais sale_id já existem na tb_vendas, consultando em lotes de LIMITE_PARAMETROS."""
+    existentes = set()
+    for i in range(0, len(sale_ids), LIMITE_PARAMETROS):
+        parte = sale_ids[i:i + LIMITE_PARAMETROS]
+        marcadores = ", ".join("?" * len(parte))
+        cur.execute(f"SELECT sale_id FROM tb_vendas WHERE sale_id IN ({marcadores})", parte)
+        existentes.update(sale_id for (sale_id,) in cur.fetchall())
+    return existentes
+
+
+def _processar_lote(
+        conn: sqlite3.Connection,
+        filtro: FiltroBloom,
+        lote: List[Tuple[int, tuple]],
+        duplicados: csv.writer,
+        resumo: Dict[str, int]
+    ) -> None:
+    execucao = execucao_atual()
+    cur = conn.cursor()
+    novos: List[tuple] = []
+    suspeitos: List[Tuple[int, tuple]] = []
+
+    for numero_linha, venda in lote:
+        if filtro.adicionar(venda[0]):
+            suspeitos.append((numero_linha, venda))
+        else:
+            novos.append(venda)
+
+    # Primeiro inserimos as vendas que com certeza são novas, assim um suspeito que repete um sale_id deste
+    # mesmo lote também é encontrado na consulta abaixo.
+    with execucao.etapa("gravacao_banco"):
+        cur.executemany(INSERT_VENDA, novos)
+    inseridos = len(novos)
+
+    if suspeitos:
+        with execucao.etapa("verificacao_banco"):
+            existentes = _existentes_no_banco(cur, list({venda[0] for _, venda in suspeitos}))
+        resumo["verificados_no_banco"] += len(suspeitos)
+
+        inseridos_agora = set()
+        for numero_linha, venda in suspeitos:
+            sale_id = venda[0]
+            if sale_id in existentes or sale_id in inseridos_agora:
+                resumo["duplicados"] += 1
+                duplicados.writerow((*venda, numero_linha))
+                continue
+
+            # Falso positivo do filtro: o sale_id era novo.
+            resumo["falsos_positivos"] += 1
+            cur.execute(INSERT_VENDA, venda)
+            inseridos_agora.add(sale_id)
+            filtro.quantidade += 1
+            inseridos += 1
+
+    with execucao.etapa("commit"):
+        conn.commit()
+    resumo["inseridos"] += inseridos
+    execucao.contar("linhas_gravadas", inseridos)
+
+
+def ingerir_vendas(
+        conn: sqlite3.Connection,
+        caminho_csv: Path = CSV_PATH,
+        caminho_filtro: Path = FILTRO_PATH,
+        caminho_duplicados: Path = DUPLICADOS_PATH,
+        taxa: float = TAXA_FALSOS_POSITIVOS,
+        tamanho_lote: int = TAMANHO_LOTE,
+        linhas_esperadas: Optional[int] = None
+    ) -> Dict[str, int]:
+    """
+    Carrega um arquivo de vendas na tb_vendas, ignorando os sale_id que já existem.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        caminho_csv (Path): Arquivo de vendas (sale_id;product;quantity;price).
+        caminho_filtro (Path): Arquivo onde o filtro de Bloom é gravado entre as execuções.
+        caminho_duplicados (Path): Arquivo CSV onde as linhas duplicadas são acrescentadas.
+        taxa (float): Taxa de falsos positivos do filtro, caso ele precise ser criado.
+        tamanho_lote (int): Quantidade de linhas processadas por transação.
+        linhas_esperadas (Optional[int]): Quantidade de linhas do arquivo (estimada pelo tamanho, se None).
+
+    Returns:
+        Dict[str, int]: Resumo da carga (lidos, inseridos, duplicados, verificados_no_banco, falsos_positivos).
+
+    Raises:
+        FileNotFoundError: Se o arquivo de vendas não for encontrado.
+        ValueError: Se o cabeçalho não for o esperado ou se alguma linha não puder ser convertida.
+    """
+    caminho_csv = Path(caminho_csv)
+    if not caminho_csv.exists():
+        raise FileNotFoundError(f"Arquivo CSV não encontrado: {caminho_csv}")
+
+    execucao = execucao_atual()
+    conn.execute(CREATE_TB_VENDAS)
+    with execucao.etapa("abrir_filtro"):
+        filtro = abrir_filtro(conn, caminho_filtro, linhas_esperadas or estimar_linhas(caminho_csv), taxa)
+
+    resumo = {"lidos": 0, "inseridos": 0, "duplicados": 0, "verificados_no_banco": 0, "falsos_positivos": 0}
+
+    with open(caminho_csv, newline="", encoding="utf-8") as f, \
+            open(caminho_duplicados, "a", newline="", encoding="utf-8") as arquivo_duplicados:
+        reader = csv.reader(f, delimiter=";")
+        cabecalho = next(reader, None)
+        if cabecalho is None or [c.strip().lower() for c in cabecalho] != ["sale_id", "product", "quantity", "price"]:
+            raise ValueError("O CSV deve conter as colunas: sale_id;product;quantity;price")
+
+        # O arquivo de duplicados é aberto para extensão (append); o cabeçalho só é escrito se ele estiver vazio.
+        duplicados = csv.writer(arquivo_duplicados, delimiter=";")
+        if arquivo_duplicados.tell() == 0:
+            duplicados.writerow(("sale_id", "product", "quantity", "price", "linha"))
+
+        lote: List[Tuple[int, tuple]] = []
+        for numero_linha, linha in enumerate(reader, start=2):
+            if not linha:
+                continue
+            try:
+                sale_id, produto, quantidade, preco = linha
+                venda = (sale_id, produto, int(quantidade), float(preco))
+            except ValueError as e:
+                raise ValueError(f"Linha {numero_linha} inválida: {linha}") from e
+
+            lote.append((numero_linha, venda))
+            resumo["lidos"] += 1
+            if len(lote) >= tamanho_lote:
+                _processar_lote(conn, filtro, lote, duplicados, resumo)
+                lote.clear()
+
+        if lote:
+            _processar_lote(conn, filtro, lote, duplicados, resumo)
+
+    with execucao.etapa("salvar_filtro"):
+        # Se a quantidade não bater (outro programa gravou na tabela durante a carga), o filtro é gravado sem
+        # origem, e a próxima execução o recria.
+        registros, origem = estado_tabela(conn)
+        filtro.origem = origem if registros == filtro.quantidade else ""
+        filtro.salvar(caminho_filtro)
+
+    execucao.contar("linhas_lidas", resumo["lidos"])
+    execucao.contar("bytes_lidos", caminho_csv.stat().st_size)
+    execucao.contar("duplicados", resumo["duplicados"])
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga do vendas.csv na tb_vendas, descartando sale_id duplicados")
+    parser.add_argument("arquivos", nargs="*", default=[str(CSV_PATH)])
+    parser.add_argument("--banco", default=str(DB_PATH))
+    parser.add_argument("--filtro", default=str(FILTRO_PATH), help="Arquivo do filtro de Bloom")
+    parser.add_argument("--duplicados", default=str(DUPLICADOS_PATH), help="CSV com as linhas duplicadas")
+    parser.add_argument("--taxa-fp", type=float, default=TAXA_FALSOS_POSITIVOS, help="Taxa de falsos positivos")
+    args = parser.parse_args()
+
+    with iniciar_execucao("ingestao_vendas"), sqlite3.connect(args.banco) as conn:
+        for arquivo in args.arquivos:
+            resumo = ingerir_vendas(conn, Path(arquivo), Path(args.filtro), Path(args.duplicados), args.taxa_fp)
+            print(f"{arquivo}: {resumo['lidos']} lidas, {resumo['inseridos']} inseridas, "
+                  f"{resumo['duplicados']} duplicadas ({resumo['verificados_no_banco']} verificadas no banco, "
+                  f"{resumo['falsos_positivos']} falsos positivos)")
+
+
+if __name__ == "__main__":
+    main()
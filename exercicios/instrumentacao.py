@@ -0,0 +1,188 @@
+# INSTRUMENTAÇÃO DAS EXECUÇÕES - tempo por etapa, contadores e pico de memória
+# Os scripts de carga não informam onde o tempo é gasto. Este módulo registra, para cada execução:
+#   - etapas: quanto tempo cada etapa levou (relógio monotônico, time.perf_counter_ns), somando as
+#     repetições de uma mesma etapa (ex: uma etapa "gravacao_banco" para cada lote);
+#   - contadores: linhas, bytes, registros inseridos, etc., e a vazão (quantidade por segundo) de cada um;
+#   - memória: o pico de memória do processo (resource.getrusage), amostrado no fim de cada etapa.
+#
+# No final da execução é gravado um único registro JSON (uma linha), que pode ser coletado para gerar alertas
+# quando a vazão cair.
+#
+# A instrumentação é ligada pela variável de ambiente PROWAY_INSTRUMENTACAO:
+#   - não definida, vazia ou "0": desligada; todas as chamadas são ignoradas (objeto sem efeito);
+#   - "1" ou "stderr": o registro é escrito na saída de erros;
+#   - qualquer outro valor: caminho de um arquivo onde os registros são acrescentados (JSON Lines).
+#
+# Uso:
+#   execucao = iniciar_execucao("exercicio02")
+#   with execucao.etapa("leitura_csv"):
+#       ...
+#   execucao.contar("linhas", 1000)
+#   execucao.finalizar()
+#
+# Funções chamadas durante a execução podem obter a execução atual com execucao_atual(), sem precisar
+# recebê-la como parâmetro.
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import json
+import os
+import socket
+import sys
+import time
+
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # O módulo resource não existe no Windows.
+    resource = None
+
+VARIAVEL_AMBIENTE = "PROWAY_INSTRUMENTACAO"
+
+
+def pico_memoria_kb() -> Optional[int]:
+    """Retorna o pico de memória (RSS) do processo em KB, ou None se não for possível medir."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No macOS o valor é informado em bytes; no Linux, em KB.
+    return pico // 1024 if sys.platform == "darwin" else pico
+
+
+class Execucao:
+    """Registra as etapas, os contadores e o pico de memória de uma execução."""
+
+    ativa = True
+
+    def __init__(self, nome: str, destino: str = "stderr"):
+        self.nome = nome
+        self.destino = destino
+        self.inicio_ns = time.perf_counter_ns()
+        self.iniciada_em = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        # etapa -> [quantidade de vezes, duração total em ns]
+        self.etapas: Dict[str, List[int]] = {}
+        self.contadores: Dict[str, int] = {}
+        self.pico_memoria_kb = pico_memoria_kb()
+        self.finalizada = False
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """Mede o tempo do bloco 'with' e o soma ao total da etapa."""
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter_ns() - inicio
+            etapa = self.etapas.setdefault(nome, [0, 0])
+            etapa[0] += 1
+            etapa[1] += duracao
+            self.amostrar_memoria()
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def amostrar_memoria(self) -> None:
+        pico = pico_memoria_kb()
+        if pico is not None:
+            self.pico_memoria_kb = max(self.pico_memoria_kb or 0, pico)
+
+    def registro(self, status: str = "ok", **extras) -> dict:
+        """Monta o registro da execução (sem gravá-lo)."""
+        duracao_s = (time.perf_counter_ns() - self.inicio_ns) / 1e9
+        return {
+            "execucao": self.nome,
+            "iniciada_em": self.iniciada_em,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "status": status,
+            "duracao_s": round(duracao_s, 6),
+            "etapas": {
+                nome: {"vezes": vezes, "duracao_s": round(total_ns / 1e9, 6)}
+                for nome, (vezes, total_ns) in self.etapas.items()
+            },
+            "contadores": dict(self.contadores),
+            "vazao_por_s": {
+                nome: round(valor / duracao_s, 3) if duracao_s > 0 else None
+                for nome, valor in self.contadores.items()
+            },
+            "pico_memoria_kb": self.pico_memoria_kb,
+            **extras,
+        }
+
+    def finalizar(self, status: str = "ok", **extras) -> Optional[dict]:
+        """Grava o registro da execução (apenas uma vez) e o retorna."""
+        if self.finalizada:
+            return None
+        self.finalizada = True
+        self.amostrar_memoria()
+        registro = self.registro(status, **extras)
+        linha = json.dumps(registro, ensure_ascii=False, separators=(",", ":"))
+
+        if self.destino in ("1", "stderr"):
+            print(linha, file=sys.stderr)
+        else:
+            with open(self.destino, "a", encoding="utf-8") as f:
+                f.write(linha + "\n")
+        return registro
+
+    def __enter__(self) -> "Execucao":
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        if tipo_excecao is None:
+            self.finalizar()
+        else:
+            self.finalizar("erro", erro=f"{tipo_excecao.__name__}: {excecao}")
+
+
+class ExecucaoDesligada:
+    """Mesma interface de Execucao, mas sem nenhum efeito (instrumentação desligada)."""
+
+    ativa = False
+    _contexto = nullcontext()
+
+    def etapa(self, nome: str):
+        return self._contexto
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        pass
+
+    def amostrar_memoria(self) -> None:
+        pass
+
+    def finalizar(self, status: str = "ok", **extras) -> None:
+        return None
+
+    def __enter__(self) -> "ExecucaoDesligada":
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, traceback) -> None:
+        pass
+
+
+DESLIGADA = ExecucaoDesligada()
+_atual = DESLIGADA
+
+
+def iniciar_execucao(nome: str, destino: Optional[str] = None):
+    """
+    Inicia a instrumentação de uma execução e a torna a execução atual.
+
+    Args:
+        nome (str): Nome do script/job (campo "execucao" do registro).
+        destino (Optional[str]): "stderr" ou caminho de arquivo. Se None, utiliza a variável PROWAY_INSTRUMENTACAO.
+
+    Returns:
+        Execucao | ExecucaoDesligada: A execução, ou um objeto sem efeito se a instrumentação estiver desligada.
+    """
+    global _atual
+    destino = os.getenv(VARIAVEL_AMBIENTE, "") if destino is None else destino
+    _atual = Execucao(nome, destino) if destino not in ("", "0") else DESLIGADA
+    return _atual
+
+
+def execucao_atual():
+    """Retorna a execução iniciada por iniciar_execucao() (ou o objeto sem efeito, se não houver)."""
+    return _atual
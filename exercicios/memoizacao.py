@@ -0,0 +1,163 @@
+# MEMOIZAÇÃO DAS ESTATÍSTICAS PELA IMPRESSÃO DIGITAL DO ARQUIVO DE ENTRADA
+# exercicio01.py e exercicio02.py recalculam e regravam tb_estatisticas_cursos e tb_estatisticas_notas a cada
+# execução, mesmo quando o CSV de entrada não mudou. Este módulo guarda, na tabela tb_memo_estatisticas:
+#   - a impressão digital do arquivo de entrada (tamanho, mtime e hash do conteúdo, como no cache_csv);
+#   - os parâmetros do cálculo (ex: a proporção da média aparada);
+#   - as estatísticas calculadas (JSON).
+#
+# Na execução seguinte, se o arquivo e os parâmetros forem os mesmos, o script utiliza as estatísticas gravadas
+# e não lê o CSV, não grava no banco e não recalcula nada. O argumento --forcar dos scripts ignora a memoização.
+#
+# A impressão digital gravada (incluindo o hash) é obtida ANTES da leitura do arquivo (ResultadoCarga.impressao
+# do checkpoint.py): se ele for alterado durante a execução, a próxima execução não reconhecerá a versão
+# memoizada e recalculará. As estatísticas memoizadas têm a mesma chave da carga e só valem enquanto o checkpoint
+# da carga valer (checkpoint.carga_concluida); quando a carga recomeça, elas são apagadas.
+#
+# Uso:
+#   python memoizacao.py                     # lista as estatísticas memoizadas
+#   python memoizacao.py --apagar exercicio02:notas
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import json
+import sqlite3
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from cache_csv import mesmo_arquivo
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+
+# =====================================
+# SQL
+# =====================================
+CREATE_TB_MEMO_ESTATISTICAS = """
+CREATE TABLE IF NOT EXISTS tb_memo_estatisticas (
+    chave TEXT PRIMARY KEY,         -- Identificador do cálculo (ex: "exercicio02:notas").
+    fonte TEXT NOT NULL,            -- Impressão digital do arquivo de entrada (veja cache_csv.impressao_digital).
+    tamanho INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    parametros TEXT NOT NULL,       -- Parâmetros do cálculo (JSON).
+    resultado TEXT NOT NULL,        -- Estatísticas calculadas (JSON).
+    calculado_em TEXT NOT NULL
+);
+"""
+
+
+def _json(valor) -> str:
+    # sort_keys: o mesmo dicionário sempre gera o mesmo texto (os parâmetros são comparados como texto).
+    return json.dumps(valor, ensure_ascii=False, sort_keys=True)
+
+
+def consultar_memo(
+        conn: sqlite3.Connection,
+        chave: str,
+        impressao: Dict[str, object],
+        parametros: Optional[dict] = None
+    ) -> Optional[dict]:
+    """
+    Retorna as estatísticas memoizadas, se o arquivo e os parâmetros forem os mesmos do último cálculo.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+        chave (str): Identificador do cálculo.
+        impressao (Dict[str, object]): Impressão digital atual do arquivo de entrada
+                                       (cache_csv.impressao_digital, o hash pode ser None).
+        parametros (Optional[dict]): Parâmetros do cálculo.
+
+    Returns:
+        Optional[dict]: As estatísticas gravadas por gravar_memo, ou None se for necessário recalcular.
+    """
+    conn.execute(CREATE_TB_MEMO_ESTATISTICAS)
+    linha = conn.execute(
+        "SELECT fonte, tamanho, mtime_ns, hash, parametros, resultado FROM tb_memo_estatisticas WHERE chave = ?",
+        (chave,)
+    ).fetchone()
+    if linha is None:
+        return None
+
+    fonte, tamanho, mtime_ns, hash_, parametros_gravados, resultado = linha
+    if parametros_gravados != _json(parametros or {}):
+        return None
+    # mesmo_arquivo só calcula o hash do conteúdo se o mtime tiver mudado.
+    if not mesmo_arquivo(impressao, {"fonte": fonte, "tamanho": tamanho, "mtime_ns": mtime_ns, "hash": hash_}):
+        return None
+    return json.loads(resultado)
+
+
+def gravar_memo(
+        conn: sqlite3.Connection,
+        chave: str,
+        impressao: Dict[str, object],
+        resultado: dict,
+        parametros: Optional[dict] = None
+    ) -> None:
+    """
+    Grava as estatísticas calculadas (o commit fica a cargo de quem chama, junto com as estatísticas).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco.
+        chave (str): Identificador do cálculo.
+        impressao (Dict[str, object]): Impressão digital do arquivo, com o hash, obtida ANTES da leitura.
+        resultado (dict): Estatísticas (valores que possam ser gravados em JSON).
+        parametros (Optional[dict]): Parâmetros do cálculo.
+
+    Raises:
+        ValueError: Se a impressão digital não tiver o hash do conteúdo (calculado agora, ele poderia ser de uma
+                    versão do arquivo diferente da utilizada no cálculo).
+    """
+    if impressao["hash"] is None:
+        raise ValueError("A impressão digital deve incluir o hash do conteúdo, obtido antes da leitura.")
+    conn.execute(CREATE_TB_MEMO_ESTATISTICAS)
+    conn.execute(
+        """INSERT OR REPLACE INTO tb_memo_estatisticas
+           (chave, fonte, tamanho, mtime_ns, hash, parametros, resultado, calculado_em)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            chave, impressao["fonte"], impressao["tamanho"], impressao["mtime_ns"], impressao["hash"],
+            _json(parametros or {}), _json(resultado),
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+    )
+
+
+def apagar_memo(conn: sqlite3.Connection, chave: str) -> bool:
+    """Apaga as estatísticas memoizadas (a próxima execução recalcula). Retorna False se não existiam."""
+    conn.execute(CREATE_TB_MEMO_ESTATISTICAS)
+    with conn:
+        return conn.execute("DELETE FROM tb_memo_estatisticas WHERE chave = ?", (chave,)).rowcount > 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consulta e apaga as estatísticas memoizadas")
+    parser.add_argument("--banco", default=str(DB_PATH))
+    parser.add_argument("--apagar", metavar="CHAVE", help="Apaga a memoização (a próxima execução recalcula)")
+    args = parser.parse_args()
+
+    with sqlite3.connect(args.banco) as conn:
+        if args.apagar:
+            if apagar_memo(conn, args.apagar):
+                print(f"Memoização apagada: {args.apagar}")
+            else:
+                print(f"Memoização não encontrada: {args.apagar}")
+            return
+
+        conn.execute(CREATE_TB_MEMO_ESTATISTICAS)
+        linhas = conn.execute(
+            "SELECT chave, fonte, parametros, resultado, calculado_em FROM tb_memo_estatisticas ORDER BY chave"
+        ).fetchall()
+        if not linhas:
+            print("Nenhuma estatística memoizada.")
+        for chave, fonte, parametros, resultado, calculado_em in linhas:
+            print(f"{chave}: {fonte} {parametros} -> {resultado} ({calculado_em})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+# ORDENAÇÃO EXTERNA E RANKING (ARQUIVOS MAIORES QUE A MEMÓRIA)
+# O exercicio01_em_aula.py encontra o maior curso com sorted() e o exercicio02.py a maior média com max() sobre
+# uma lista com todos os registros: os dados inteiros ficam na memória. Com o histórico completo de vendas e de
+# notas isso não é possível.
+#
+# A ordenação externa (external merge sort) utiliza uma quantidade fixa de memória:
+#   1) os registros são lidos até atingir o orçamento de memória; esse trecho é ordenado com sorted() e gravado
+#      em um arquivo temporário (um "run" ordenado);
+#   2) os runs são lidos ao mesmo tempo e intercalados com heapq.merge (um heap com o próximo registro de cada
+#      run), que produz a sequência ordenada completa lendo um registro de cada vez.
+# Se houver runs demais para abrir ao mesmo tempo (MAX_RUNS_POR_MERGE), eles são intercalados em etapas.
+# A ordenação é estável: registros com a mesma chave mantêm a ordem original (como no sorted()).
+#
+# O ranking percorre a saída ordenada e informa a posição (empates recebem a mesma posição: 1, 2, 2, 4) e o
+# percentil (PERCENT_RANK, como no SQL: proporção dos demais registros que ficam à frente, de 0 a 1).
+#
+# Uso:
+#   python ordenacao_externa.py ordenar vendas.csv --chave price:float --desc --saida vendas_ordenadas.csv
+#   python ordenacao_externa.py ordenar vendas.csv --chave product,price:float --memoria 16
+#   python ordenacao_externa.py ranking vendas.csv --chave price:float --desc --top 10
+#   python ordenacao_externa.py ranking --banco db.sqlite3 --chave media --desc \
+#       --sql "SELECT nome, AVG(nota) AS media FROM tb_notas_longo GROUP BY aluno_id"
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import heapq
+import itertools
+import pickle
+import sqlite3
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# =====================================
+# CONFIGURAÇÃO
+# =====================================
+# Orçamento de memória padrão para os registros de um run (em MB).
+MEMORIA_MB = 64
+
+# Quantidade máxima de runs intercalados ao mesmo tempo (cada run é um arquivo aberto durante o merge).
+MAX_RUNS_POR_MERGE = 64
+
+# Os runs são gravados em blocos de registros (um pickle por bloco, e não um por registro).
+REGISTROS_POR_BLOCO = 1000
+
+# Tipos aceitos na especificação da chave (coluna:tipo).
+TIPOS = {"str": str, "int": int, "float": float}
+
+# Memória aproximada ocupada pela chave de cada registro durante o sorted() (objeto da chave + tupla).
+TAMANHO_CHAVE = 120
+
+
+def _tamanho(registro: Sequence[Any]) -> int:
+    """Estimativa da memória ocupada por um registro (a sequência e os seus valores)."""
+    return sys.getsizeof(registro) + sum(sys.getsizeof(valor) for valor in registro) + TAMANHO_CHAVE
+
+
+def _gravar_run(registros: Iterable[Sequence[Any]], diretorio: str) -> Path:
+    """Grava registros (já ordenados) em um arquivo temporário e retorna o caminho."""
+    with tempfile.NamedTemporaryFile("wb", dir=diretorio, suffix=".run", delete=False) as arquivo:
+        iterador = iter(registros)
+        while True:
+            bloco = list(itertools.islice(iterador, REGISTROS_POR_BLOCO))
+            if not bloco:
+                break
+            pickle.dump(bloco, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        return Path(arquivo.name)
+
+
+def _ler_run(caminho: Path) -> Iterator[Sequence[Any]]:
+    """Lê os registros de um run, um bloco de cada vez."""
+    with open(caminho, "rb") as arquivo:
+        while True:
+            try:
+                bloco = pickle.load(arquivo)
+            except EOFError:
+                return
+            yield from bloco
+
+
+class OrdenadorExterno:
+    """Ordena uma quantidade qualquer de registros utilizando um orçamento fixo de memória."""
+
+    def __init__(
+            self,
+            chave: Callable[[Sequence[Any]], Any],
+            memoria_mb: float = MEMORIA_MB,
+            reverso: bool = False,
+            diretorio_temp: Optional[str] = None
+        ):
+        """
+        Args:
+            chave (Callable[[Sequence[Any]], Any]): Função que retorna a chave de ordenação de um registro.
+            memoria_mb (float): Orçamento de memória (aproximado) para os registros de cada run, em MB.
+            reverso (bool): Se True, ordena do maior para o menor.
+            diretorio_temp (Optional[str]): Diretório dos arquivos temporários (padrão: o do sistema).
+
+        Raises:
+            ValueError: Se o orçamento de memória não for positivo.
+        """
+        if memoria_mb <= 0:
+            raise ValueError("memoria_mb deve ser maior que zero.")
+        self.chave = chave
+        self.memoria = int(memoria_mb * 1024 * 1024)
+        self.reverso = reverso
+        self._diretorio = tempfile.TemporaryDirectory(prefix="ordenacao_", dir=diretorio_temp)
+        self._buffer: List[Sequence[Any]] = []
+        self._ocupado = 0
+        self._runs: List[Path] = []
+        self.quantidade = 0
+        # Quantidade de runs gravados e de etapas de merge intermediárias (para o resumo).
+        self.runs_gravados = 0
+        self.etapas_merge = 0
+
+    def adicionar(self, registro: Sequence[Any]) -> None:
+        self._buffer.append(registro)
+        self._ocupado += _tamanho(registro)
+        self.quantidade += 1
+        if self._ocupado >= self.memoria:
+            self._descarregar()
+
+    def adicionar_varios(self, registros: Iterable[Sequence[Any]]) -> None:
+        for registro in registros:
+            self.adicionar(registro)
+
+    def _descarregar(self) -> None:
+        """Ordena os registros da memória e os grava como um novo run."""
+        if not self._buffer:
+            return
+        self._buffer.sort(key=self.chave, reverse=self.reverso)
+        self._runs.append(_gravar_run(self._buffer, self._diretorio.name))
+        self.runs_gravados += 1
+        self._buffer = []
+        self._ocupado = 0
+
+    def _intercalar(self, runs: Sequence[Path]) -> Iterator[Sequence[Any]]:
+        # heapq.merge desempata pela ordem dos iteráveis: com os runs na ordem de gravação, a ordem é estável.
+        return heapq.merge(*(_ler_run(run) for run in runs), key=self.chave, reverse=self.reverso)
+
+    def ordenados(self) -> Iterator[Sequence[Any]]:
+        """
+        Retorna os registros adicionados, ordenados pela chave.
+
+        Se todos os registros couberem no orçamento de memória, nenhum arquivo temporário é gravado.
+        """
+        if not self._runs:
+            self._buffer.sort(key=self.chave, reverse=self.reverso)
+            return iter(self._buffer)
+
+        self._descarregar()
+        while len(self._runs) > MAX_RUNS_POR_MERGE:
+            # Intercala grupos de runs consecutivos (mantendo a ordem entre eles) em runs maiores.
+            novos = []
+            for i in range(0, len(self._runs), MAX_RUNS_POR_MERGE):
+                grupo = self._runs[i:i + MAX_RUNS_POR_MERGE]
+                novos.append(_gravar_run(self._intercalar(grupo), self._diretorio.name))
+                for run in grupo:
+                    run.unlink()
+            self._runs = novos
+            self.etapas_merge += 1
+        return self._intercalar(self._runs)
+
+    def fechar(self) -> None:
+        """Remove os arquivos temporários."""
+        self._buffer = []
+        self._runs = []
+        self._diretorio.cleanup()
+
+    def __enter__(self) -> "OrdenadorExterno":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+def ordenar_externo(
+        registros: Iterable[Sequence[Any]],
+        chave: Callable[[Sequence[Any]], Any],
+        memoria_mb: float = MEMORIA_MB,
+        reverso: bool = False,
+        diretorio_temp: Optional[str] = None
+    ) -> Iterator[Sequence[Any]]:
+    """
+    Equivalente a sorted(registros, key=chave, reverse=reverso), mas com um orçamento fixo de memória.
+
+    Os arquivos temporários são removidos quando a iteração termina (ou quando o gerador é fechado).
+    """
+    with OrdenadorExterno(chave, memoria_mb, reverso, diretorio_temp) as ordenador:
+        ordenador.adicionar_varios(registros)
+        yield from ordenador.ordenados()
+
+
+def ranquear(
+        ordenados: Iterable[Sequence[Any]],
+        chave: Callable[[Sequence[Any]], Any],
+        total: int
+    ) -> Iterator[Tuple[int, float, Sequence[Any]]]:
+    """
+    Calcula a posição e o percentil de cada registro de uma sequência já ordenada.
+
+    Args:
+        ordenados (Iterable[Sequence[Any]]): Registros ordenados pela chave.
+        chave (Callable[[Sequence[Any]], Any]): A mesma função de chave utilizada na ordenação.
+        total (int): Quantidade de registros.
+
+    Returns:
+        Iterator[Tuple[int, float, Sequence[Any]]]: (posição, percentil, registro). Registros com a mesma chave
+        recebem a mesma posição (1, 2, 2, 4); o percentil é (posição - 1) / (total - 1).
+    """
+    posicao = 0
+    chave_anterior = object()
+    for indice, registro in enumerate(ordenados, start=1):
+        valor = chave(registro)
+        if valor != chave_anterior:
+            posicao = indice
+            chave_anterior = valor
+        yield posicao, (posicao - 1) / (total - 1) if total > 1 else 0.0, registro
+
+
+# =====================================
+# CHAVES E FONTES DE DADOS
+# =====================================
+
+def criar_chave(
+        especificacao: str,
+        colunas: Sequence[str],
+        reverso: bool = False
+    ) -> Callable[[Sequence[Any]], Any]:
+    """
+    Cria a função de chave a partir de uma especificação como "price:float" ou "product,price:float".
+
+    Sem o tipo, o valor é comparado como está (texto no CSV; o tipo da coluna no banco). Valores vazios
+    (NULL ou "") ficam depois dos demais, também na ordem reversa (informe o mesmo reverso da ordenação).
+
+    Raises:
+        ValueError: Se uma coluna não existir ou o tipo for desconhecido.
+    """
+    partes = []
+    for item in especificacao.split(","):
+        nome, _, tipo = item.strip().partition(":")
+        if nome not in colunas:
+            raise ValueError(f"Coluna '{nome}' não encontrada (colunas: {', '.join(colunas)})")
+        if tipo and tipo not in TIPOS:
+            raise ValueError(f"Tipo '{tipo}' desconhecido (tipos: {', '.join(TIPOS)})")
+        partes.append((colunas.index(nome), TIPOS[tipo] if tipo else None))
+
+    # O primeiro item da tupla separa os valores vazios dos demais (e evita comparar None com números).
+    vazio = not reverso
+
+    def valor(registro: Sequence[Any], indice: int, converter) -> Tuple[bool, Any]:
+        bruto = registro[indice]
+        if bruto is None or bruto == "":
+            return (vazio, 0)
+        return (not vazio, converter(bruto) if converter else bruto)
+
+    if len(partes) == 1:
+        indice, converter = partes[0]
+        return lambda registro: valor(registro, indice, converter)
+    return lambda registro: tuple(valor(registro, indice, converter) for indice, converter in partes)
+
+
+def ler_csv(caminho: Path, delimitador: str = ";") -> Tuple[List[str], Iterator[List[str]]]:
+    """Retorna as colunas do cabeçalho e um iterador com as demais linhas do CSV."""
+    arquivo = open(caminho, "r", newline="", encoding="utf-8-sig")
+    leitor = csv.reader(arquivo, delimiter=delimitador)
+    colunas = [coluna.strip() for coluna in next(leitor, [])]
+
+    def linhas() -> Iterator[List[str]]:
+        with arquivo:
+            yield from leitor
+
+    return colunas, linhas()
+
+
+def ler_consulta(caminho_banco: str, sql: str) -> Tuple[List[str], Iterator[tuple]]:
+    """Retorna as colunas e um iterador com as linhas de uma consulta SQL (lidas sob demanda pelo cursor)."""
+    conn = sqlite3.connect(caminho_banco)
+    cursor = conn.execute(sql)
+    colunas = [descricao[0] for descricao in cursor.description]
+
+    def linhas() -> Iterator[tuple]:
+        try:
+            yield from cursor
+        finally:
+            conn.close()
+
+    return colunas, linhas()
+
+
+def main():
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("arquivo", nargs="?", help="Arquivo CSV (delimitado por ';', com cabeçalho)")
+    comum.add_argument("--banco", help="Lê os registros de uma consulta a este banco SQLite (com --sql)")
+    comum.add_argument("--sql", help="Consulta SQL cujas linhas serão ordenadas")
+    comum.add_argument("--chave", required=True, help="Colunas da chave, ex: price:float ou product,price:float")
+    comum.add_argument("--desc", action="store_true", help="Ordem decrescente")
+    comum.add_argument("--memoria", type=float, default=MEMORIA_MB, help="Orçamento de memória em MB")
+    comum.add_argument("--diretorio-temp", help="Diretório dos arquivos temporários")
+    comum.add_argument("--top", type=int, help="Exibe apenas os N primeiros registros")
+    comum.add_argument("--saida", help="Grava o resultado neste arquivo CSV (padrão: a tela)")
+
+    parser = argparse.ArgumentParser(description="Ordenação externa e ranking de CSVs e consultas SQLite")
+    subparsers = parser.add_subparsers(dest="modo", required=True)
+    subparsers.add_parser("ordenar", parents=[comum], help="Ordena os registros pela chave")
+    subparsers.add_parser("ranking", parents=[comum], help="Ordena e informa a posição e o percentil")
+    args = parser.parse_args()
+
+    if (args.arquivo is None) == (args.banco is None) or (args.banco is None) != (args.sql is None):
+        parser.error("informe um arquivo CSV ou --banco com --sql")
+    colunas, registros = ler_csv(Path(args.arquivo)) if args.arquivo else ler_consulta(args.banco, args.sql)
+    try:
+        chave = criar_chave(args.chave, colunas, args.desc)
+    except ValueError as e:
+        parser.error(str(e))
+
+    inicio = time.perf_counter()
+    saida = open(args.saida, "w", newline="", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        with OrdenadorExterno(chave, args.memoria, args.desc, args.diretorio_temp) as ordenador:
+            ordenador.adicionar_varios(registros)
+            ordenados = itertools.islice(ordenador.ordenados(), args.top)
+
+            writer = csv.writer(saida, delimiter=";", lineterminator="\n")
+            if args.modo == "ranking":
+                writer.writerow(["posicao", "percentil", *colunas])
+                for posicao, percentil, registro in ranquear(ordenados, chave, ordenador.quantidade):
+                    writer.writerow([posicao, f"{percentil:.6f}", *registro])
+            else:
+                writer.writerow(colunas)
+                writer.writerows(ordenados)
+            resumo = (
+                f"{ordenador.quantidade} registros ordenados em {time.perf_counter() - inicio:.2f}s "
+                f"({ordenador.runs_gravados} runs em disco, {ordenador.etapas_merge} etapas de merge intermediárias)"
+            )
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    # O resumo vai para a saída de erros para não misturar com o CSV exibido na tela.
+    print(resumo, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
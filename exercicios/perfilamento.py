@@ -0,0 +1,197 @@
+# MODO DE PERFILAMENTO (PROFILING) DOS SCRIPTS
+# Quando uma execução está lenta, em vez de editar o script para adicionar o cProfile, ligamos este modo:
+#   - cProfile: tempo gasto em cada função, gravado em um arquivo .pstats (pode ser aberto com o módulo pstats
+#     ou ferramentas como snakeviz) e em um relatório texto com as N funções mais custosas;
+#   - tracemalloc: snapshots das alocações de memória (arquivos .tracemalloc, abertos com
+#     tracemalloc.Snapshot.load) e as linhas que mais alocaram memória no relatório texto.
+#
+# O modo é ligado pelo argumento --perfil DIRETORIO dos scripts ou pela variável de ambiente
+# PROWAY_PERFIL=DIRETORIO. Como o perfilamento deixa a execução mais lenta, é possível perfilar apenas uma a
+# cada N execuções (--perfil-amostragem N ou PROWAY_PERFIL_AMOSTRAGEM=N), então ele pode ficar ligado em produção.
+#
+# Qualquer script também pode ser executado com o perfilamento, sem nenhuma alteração:
+#   python perfilamento.py --diretorio perfis exercicio01.py
+#
+# Arquivos gerados (prefixo = nome-AAAAMMDD-HHMMSS-pid):
+#   prefixo.pstats, prefixo.txt (relatório), prefixo-<rótulo>.tracemalloc (um por snapshot)
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import random
+import runpy
+import sys
+import tracemalloc
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+VARIAVEL_DIRETORIO = "PROWAY_PERFIL"
+VARIAVEL_AMOSTRAGEM = "PROWAY_PERFIL_AMOSTRAGEM"
+
+TOP_PADRAO = 30
+# Quantidade de chamadas guardadas para cada alocação do tracemalloc (mais quadros = mais memória e tempo).
+QUADROS_TRACEMALLOC = 10
+
+
+class Perfil:
+    """Estado de uma execução perfilada (profiler, snapshots de memória e arquivos gerados)."""
+
+    def __init__(self, nome: str, diretorio: Path, top: int = TOP_PADRAO):
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.prefixo = self.diretorio / f"{nome}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        self.top = top
+        self.profiler = cProfile.Profile()
+        # (rótulo, snapshot) na ordem em que foram tirados.
+        self.snapshots: List[Tuple[str, tracemalloc.Snapshot]] = []
+        self.arquivos: List[Path] = []
+
+    def snapshot(self, rotulo: str) -> None:
+        """Tira um snapshot das alocações de memória e grava em prefixo-<rótulo>.tracemalloc."""
+        snapshot = tracemalloc.take_snapshot()
+        caminho = Path(f"{self.prefixo}-{rotulo}.tracemalloc")
+        snapshot.dump(str(caminho))
+        self.snapshots.append((rotulo, snapshot))
+        self.arquivos.append(caminho)
+
+    def gravar(self) -> None:
+        """Grava o .pstats e o relatório texto."""
+        caminho_pstats = Path(f"{self.prefixo}.pstats")
+        self.profiler.dump_stats(str(caminho_pstats))
+        self.arquivos.append(caminho_pstats)
+
+        relatorio = io.StringIO()
+        atual, pico = tracemalloc.get_traced_memory()
+        relatorio.write(f"Memória alocada no final: {atual / 1024:.1f} KB | pico: {pico / 1024:.1f} KB\n\n")
+
+        for ordem in ("cumulative", "tottime"):
+            relatorio.write(f"===== {self.top} funções com maior tempo ({ordem}) =====\n")
+            pstats.Stats(self.profiler, stream=relatorio).strip_dirs().sort_stats(ordem).print_stats(self.top)
+
+        for rotulo, snapshot in self.snapshots:
+            relatorio.write(f"===== {self.top} linhas que mais alocaram memória ({rotulo}) =====\n")
+            for estatistica in snapshot.statistics("lineno")[:self.top]:
+                relatorio.write(f"{estatistica}\n")
+            relatorio.write("\n")
+
+        caminho_relatorio = Path(f"{self.prefixo}.txt")
+        caminho_relatorio.write_text(relatorio.getvalue(), encoding="utf-8")
+        self.arquivos.append(caminho_relatorio)
+
+
+_atual: Optional[Perfil] = None
+
+
+def deve_perfilar(diretorio: Optional[str] = None, amostragem: Optional[int] = None) -> Optional[str]:
+    """
+    Decide se esta execução deve ser perfilada.
+
+    Args:
+        diretorio (Optional[str]): Diretório dos arquivos. Se None, utiliza a variável PROWAY_PERFIL.
+        amostragem (Optional[int]): Perfilar uma a cada N execuções. Se None, utiliza PROWAY_PERFIL_AMOSTRAGEM
+                                    (ou 1, todas as execuções).
+
+    Returns:
+        Optional[str]: O diretório, se a execução deve ser perfilada, ou None.
+
+    Raises:
+        ValueError: Se a amostragem não for um inteiro positivo.
+    """
+    diretorio = diretorio or os.getenv(VARIAVEL_DIRETORIO)
+    if not diretorio:
+        return None
+
+    if amostragem is None:
+        try:
+            amostragem = int(os.getenv(VARIAVEL_AMOSTRAGEM) or 1)
+        except ValueError:
+            raise ValueError(f"{VARIAVEL_AMOSTRAGEM} deve ser um número inteiro.") from None
+    if amostragem < 1:
+        raise ValueError("A amostragem deve ser um inteiro maior ou igual a 1.")
+
+    # Sorteio independente a cada execução: em média, uma a cada N é perfilada.
+    return diretorio if amostragem == 1 or random.randrange(amostragem) == 0 else None
+
+
+@contextmanager
+def perfilar(
+        nome: str,
+        diretorio: Optional[str] = None,
+        amostragem: Optional[int] = None,
+        top: int = TOP_PADRAO
+    ) -> Iterator[Optional[Perfil]]:
+    """
+    Executa o bloco 'with' com o cProfile e o tracemalloc, se o perfilamento estiver ligado (veja deve_perfilar).
+
+    Returns:
+        Optional[Perfil]: O perfil da execução, ou None se ela não estiver sendo perfilada.
+    """
+    global _atual
+    diretorio = deve_perfilar(diretorio, amostragem)
+    if diretorio is None or _atual is not None:
+        # Desligado (ou já existe um perfilamento em andamento neste processo).
+        yield None
+        return
+
+    perfil = _atual = Perfil(nome, Path(diretorio), top)
+    tracemalloc.start(QUADROS_TRACEMALLOC)
+    perfil.profiler.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.profiler.disable()
+        perfil.snapshot("final")
+        perfil.gravar()
+        tracemalloc.stop()
+        _atual = None
+        print(f"Perfil gravado em: {perfil.prefixo}.*", file=sys.stderr)
+
+
+def snapshot_memoria(rotulo: str) -> None:
+    """Tira um snapshot de memória intermediário, se a execução estiver sendo perfilada (senão não faz nada)."""
+    if _atual is not None:
+        # O profiler é pausado para que o custo do snapshot não apareça no relatório de tempo.
+        _atual.profiler.disable()
+        _atual.snapshot(rotulo)
+        _atual.profiler.enable()
+
+
+def adicionar_argumentos_perfil(parser: argparse.ArgumentParser) -> None:
+    """Adiciona os argumentos --perfil e --perfil-amostragem a um parser de linha de comando."""
+    parser.add_argument("--perfil", metavar="DIRETORIO",
+                        help=f"Perfila a execução e grava os arquivos no diretório (ou variável {VARIAVEL_DIRETORIO})")
+    parser.add_argument("--perfil-amostragem", type=int, metavar="N",
+                        help=f"Perfila apenas uma a cada N execuções (ou variável {VARIAVEL_AMOSTRAGEM})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa um script Python com o cProfile e o tracemalloc")
+    parser.add_argument("--diretorio", default=os.getenv(VARIAVEL_DIRETORIO) or "perfis",
+                        help="Diretório dos arquivos gerados")
+    parser.add_argument("--amostragem", type=int, help="Perfila apenas uma a cada N execuções")
+    parser.add_argument("--top", type=int, default=TOP_PADRAO, help="Quantidade de linhas dos relatórios")
+    parser.add_argument("script", help="Script a ser executado")
+    parser.add_argument("argumentos", nargs=argparse.REMAINDER, help="Argumentos do script")
+    args = parser.parse_args()
+
+    # Scripts que também utilizam perfilar() importam este módulo pelo nome; registrando-o evitamos uma segunda
+    # cópia (com outro _atual), o que ligaria dois profilers ao mesmo tempo.
+    sys.modules.setdefault("perfilamento", sys.modules[__name__])
+
+    script = Path(args.script).resolve()
+    # O script é executado como se tivesse sido chamado diretamente: mesmo sys.argv e a sua pasta no sys.path.
+    sys.argv = [str(script), *args.argumentos]
+    sys.path.insert(0, str(script.parent))
+
+    with perfilar(script.stem, args.diretorio, args.amostragem, args.top):
+        runpy.run_path(str(script), run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,687 @@
+# PIPELINE DE ETL COM ETAPAS CONCORRENTES
+# Os scripts exercicio01.py, exercicio01_em_aula.py, exercicio02.py e aula05/prog02.py repetem a mesma
+# sequência: extrair (ler o CSV / chamar a API) -> transformar (converter os valores) -> carregar (inserir no
+# banco) -> estatísticas. Cada passo só começa quando o anterior termina.
+#
+# Aqui um job é declarado como:
+#   - fonte: função que retorna os itens (linhas do CSV, ids da API, ...);
+#   - etapas: transformações aplicadas a cada item, cada uma com a sua quantidade de threads (paralelismo);
+#   - destino: função que recebe os itens transformados em lotes (ex: executemany no banco);
+#   - agregações: estatísticas calculadas enquanto os itens passam (contagem, média, máximo, ...).
+#
+# Cada etapa roda na sua própria thread (ou threads) e as etapas são ligadas por filas com tamanho máximo
+# (queue.Queue(maxsize)). Assim a leitura, a transformação e a gravação acontecem ao mesmo tempo e, se uma
+# etapa for mais lenta, as anteriores ficam bloqueadas esperando espaço na fila (backpressure), sem acumular
+# o arquivo inteiro na memória. Os itens trafegam em lotes, para diminuir o custo de sincronização das filas.
+#
+# Observação: por causa do GIL, threads aceleram etapas que esperam por E/S (rede, disco, banco); para
+# etapas que só usam CPU em código Python o ganho vem apenas de sobrepor essas etapas com a E/S.
+# Com paralelismo > 1 a ordem dos itens não é preservada.
+#
+# Nos jobs de CSV (cursos, notas) quase todo o trabalho é CPU (csv, conversões e o executemany), então
+# --paralelismo não os acelera. O ganho em relação aos scripts vem de fazer o trabalho por lote: o CSV é lido
+# com csv.reader (sem um dicionário por linha), a conversão é uma compreensão por lote e as agregações usam
+# adicionar_lote. Medido com 300 mil cursos em uma máquina de 1 CPU:
+#   - exercicio01.processar_cursos (com checkpoint): 2,57s;
+#   - pipeline.py cursos antes do processamento por lote: 2,41s (--paralelismo 1 ou 4);
+#   - pipeline.py cursos: 1,67s (--paralelismo 1) e 1,57s (--paralelismo 4).
+# O executemany do SQLite (~0,8s nesse arquivo) é o limite: com vários núcleos, a leitura e a conversão
+# acontecem enquanto ele grava, mas o job não fica mais rápido do que ele.
+#
+# Uso:
+#   python pipeline.py cursos        (mesmo resultado do exercicio01.py, no mesmo banco: o db.sqlite3 da raiz)
+#   python pipeline.py notas         (mesmo resultado do exercicio02.py)
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import csv
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import requests
+except ImportError:  # Só é necessário para as fontes HTTP.
+    requests = None
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+
+TAMANHO_LOTE = 500
+# Tamanho máximo de cada fila, em lotes.
+TAMANHO_FILA = 8
+# Intervalo (em segundos) em que as threads bloqueadas verificam se o pipeline foi cancelado.
+INTERVALO_CANCELAMENTO = 0.1
+
+# Marca o fim dos itens em uma fila.
+FIM = object()
+
+
+class _Cancelado(Exception):
+    """Interrompe uma thread quando outra etapa do pipeline falhou."""
+
+
+# =====================================
+# AGREGAÇÕES
+# =====================================
+
+class Agregacao(ABC):
+    """Estatística calculada sobre os itens que chegam ao destino. Executada sempre na mesma thread."""
+
+    @abstractmethod
+    def reiniciar(self) -> None:
+        """Prepara a agregação para uma nova execução do pipeline."""
+
+    @abstractmethod
+    def adicionar(self, item: Any) -> None:
+        """Recebe um item gravado no destino."""
+
+    @abstractmethod
+    def resultado(self) -> Any:
+        """Retorna o valor da agregação."""
+
+    def adicionar_lote(self, itens: List[Any]) -> None:
+        """Recebe um lote de itens gravados no destino (as subclasses podem evitar uma chamada por item)."""
+        for item in itens:
+            self.adicionar(item)
+
+
+class Contagem(Agregacao):
+    def reiniciar(self) -> None:
+        self.total = 0
+
+    def adicionar(self, item: Any) -> None:
+        self.total += 1
+
+    def adicionar_lote(self, itens: List[Any]) -> None:
+        self.total += len(itens)
+
+    def resultado(self) -> int:
+        return self.total
+
+
+class Media(Agregacao):
+    def __init__(self, valor: Callable[[Any], float]):
+        self.valor = valor
+
+    def reiniciar(self) -> None:
+        self.soma = 0.0
+        self.quantidade = 0
+
+    def adicionar(self, item: Any) -> None:
+        self.soma += self.valor(item)
+        self.quantidade += 1
+
+    def adicionar_lote(self, itens: List[Any]) -> None:
+        # Soma na mesma ordem de adicionar() (somar o lote antes mudaria o arredondamento).
+        soma = self.soma
+        for valor in map(self.valor, itens):
+            soma += valor
+        self.soma = soma
+        self.quantidade += len(itens)
+
+    def resultado(self) -> float:
+        return self.soma / self.quantidade if self.quantidade else 0.0
+
+
+class Maximo(Agregacao):
+    """
+    Item com o maior valor. Em caso de empate, fica o item com o MENOR desempate (ex: a linha do arquivo), o que
+    mantém o resultado igual ao do script original mesmo quando as etapas paralelas mudam a ordem dos itens.
+    """
+
+    def __init__(self, valor: Callable[[Any], Any], desempate: Optional[Callable[[Any], Any]] = None):
+        self.valor = valor
+        self.desempate = desempate
+
+    def reiniciar(self) -> None:
+        self.item = None
+        self.chave = None
+
+    def adicionar(self, item: Any) -> None:
+        valor = self.valor(item)
+        desempate = self.desempate(item) if self.desempate else 0
+        if self.chave is None or valor > self.chave[0] or (valor == self.chave[0] and desempate < self.chave[1]):
+            self.item = item
+            self.chave = (valor, desempate)
+
+    def adicionar_lote(self, itens: List[Any]) -> None:
+        if not itens:
+            return
+        # max() percorre o lote em C; o desempate só é calculado para os itens com o maior valor do lote.
+        maior = max(map(self.valor, itens))
+        if self.chave is None or maior >= self.chave[0]:
+            for item in itens:
+                if self.valor(item) == maior:
+                    self.adicionar(item)
+
+    def resultado(self) -> Any:
+        return self.item
+
+
+# =====================================
+# PIPELINE
+# =====================================
+
+@dataclass
+class Etapa:
+    nome: str
+    # Recebe um item e retorna o item transformado (None descarta o item).
+    # Com em_lote=True, recebe a lista de itens do lote e retorna a lista transformada.
+    funcao: Callable[[Any], Any]
+    paralelismo: int = 1
+    em_lote: bool = False
+
+
+@dataclass
+class ResultadoPipeline:
+    lidos: int
+    gravados: int
+    agregacoes: Dict[str, Any]
+    duracao_s: float
+    # Tempo (somado entre as threads) em que cada etapa ficou processando itens.
+    tempo_etapas_s: Dict[str, float]
+
+
+class _EstadoEtapa:
+    def __init__(self, ativos: int):
+        self.ativos = ativos
+        self.tempo_s = 0.0
+        self.trava = threading.Lock()
+
+
+@dataclass
+class Pipeline:
+    nome: str
+    fonte: Callable[[], Iterable[Any]]
+    etapas: Sequence[Etapa] = ()
+    # Recebe cada lote de itens transformados. Executado na thread que chamou executar().
+    destino: Optional[Callable[[List[Any]], None]] = None
+    agregacoes: Dict[str, Agregacao] = field(default_factory=dict)
+    tamanho_lote: int = TAMANHO_LOTE
+    tamanho_fila: int = TAMANHO_FILA
+
+    def _colocar(self, fila: queue.Queue, item: Any) -> None:
+        while True:
+            if self._cancelado.is_set():
+                raise _Cancelado()
+            try:
+                fila.put(item, timeout=INTERVALO_CANCELAMENTO)
+                return
+            except queue.Full:
+                pass
+
+    def _obter(self, fila: queue.Queue) -> Any:
+        while True:
+            if self._cancelado.is_set():
+                raise _Cancelado()
+            try:
+                return fila.get(timeout=INTERVALO_CANCELAMENTO)
+            except queue.Empty:
+                pass
+
+    def _falhar(self, erro: BaseException) -> None:
+        with self._trava_erro:
+            if self._erro is None:
+                self._erro = erro
+        self._cancelado.set()
+
+    def _ler_fonte(self, saida: queue.Queue) -> None:
+        try:
+            itens = iter(self.fonte())
+            while True:
+                lote = list(itertools.islice(itens, self.tamanho_lote))
+                if not lote:
+                    break
+                self._lidos += len(lote)
+                self._colocar(saida, lote)
+            self._colocar(saida, FIM)
+        except _Cancelado:
+            pass
+        except BaseException as e:
+            self._falhar(e)
+
+    def _trabalhador(self, etapa: Etapa, entrada: queue.Queue, saida: queue.Queue, estado: _EstadoEtapa) -> None:
+        tempo = 0.0
+        try:
+            while True:
+                lote = self._obter(entrada)
+                if lote is FIM:
+                    # Devolve o marcador para que as outras threads desta etapa também terminem.
+                    self._colocar(entrada, FIM)
+                    break
+
+                inicio = time.perf_counter()
+                if etapa.em_lote:
+                    resultado = list(etapa.funcao(lote))
+                else:
+                    resultado = [item for item in map(etapa.funcao, lote) if item is not None]
+                tempo += time.perf_counter() - inicio
+
+                if resultado:
+                    self._colocar(saida, resultado)
+        except _Cancelado:
+            pass
+        except BaseException as e:
+            self._falhar(e)
+        finally:
+            with estado.trava:
+                estado.tempo_s += tempo
+                estado.ativos -= 1
+                ultimo = estado.ativos == 0
+            # A última thread da etapa avisa a etapa seguinte que os itens acabaram.
+            if ultimo and not self._cancelado.is_set():
+                try:
+                    self._colocar(saida, FIM)
+                except _Cancelado:
+                    pass
+
+    def executar(self) -> ResultadoPipeline:
+        """
+        Executa o pipeline e espera todas as etapas terminarem.
+
+        Returns:
+            ResultadoPipeline: Quantidade de itens lidos e gravados, resultados das agregações e tempos.
+
+        Raises:
+            Exception: A primeira exceção levantada por qualquer etapa (as demais etapas são canceladas).
+        """
+        self._cancelado = threading.Event()
+        self._trava_erro = threading.Lock()
+        self._erro: Optional[BaseException] = None
+        self._lidos = 0
+        for agregacao in self.agregacoes.values():
+            agregacao.reiniciar()
+
+        inicio = time.perf_counter()
+        filas = [queue.Queue(maxsize=self.tamanho_fila) for _ in range(len(self.etapas) + 1)]
+        threads = [threading.Thread(target=self._ler_fonte, args=(filas[0],), name=f"{self.nome}-fonte", daemon=True)]
+        estados: Dict[str, _EstadoEtapa] = {}
+
+        for i, etapa in enumerate(self.etapas):
+            estado = estados[etapa.nome] = _EstadoEtapa(max(1, etapa.paralelismo))
+            for n in range(estado.ativos):
+                threads.append(threading.Thread(
+                    target=self._trabalhador, args=(etapa, filas[i], filas[i + 1], estado),
+                    name=f"{self.nome}-{etapa.nome}-{n}", daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        # Destino e agregações: executados nesta thread (conexões de banco normalmente não podem ser
+        # compartilhadas entre threads).
+        gravados = 0
+        tempo_destino = 0.0
+        try:
+            while True:
+                lote = self._obter(filas[-1])
+                if lote is FIM:
+                    break
+                inicio_destino = time.perf_counter()
+                if self.destino is not None:
+                    self.destino(lote)
+                for agregacao in self.agregacoes.values():
+                    agregacao.adicionar_lote(lote)
+                tempo_destino += time.perf_counter() - inicio_destino
+                gravados += len(lote)
+        except _Cancelado:
+            pass
+        except BaseException as e:
+            self._falhar(e)
+
+        for thread in threads:
+            thread.join()
+        if self._erro is not None:
+            raise self._erro
+
+        tempos = {nome: estado.tempo_s for nome, estado in estados.items()}
+        tempos["destino"] = tempo_destino
+        return ResultadoPipeline(
+            lidos=self._lidos,
+            gravados=gravados,
+            agregacoes={nome: agregacao.resultado() for nome, agregacao in self.agregacoes.items()},
+            duracao_s=time.perf_counter() - inicio,
+            tempo_etapas_s=tempos,
+        )
+
+
+# =====================================
+# FONTES
+# =====================================
+
+def linhas_arquivo(caminho: Path) -> Callable[[], Iterable[str]]:
+    """Fonte: linhas de um arquivo texto, lidas sob demanda."""
+    def fonte():
+        with open(caminho, newline="", encoding="utf-8") as f:
+            yield from f
+    return fonte
+
+
+def linhas_http(url: str, timeout: float = 30) -> Callable[[], Iterable[str]]:
+    """Fonte: linhas de um arquivo baixado por HTTP, lidas enquanto o download acontece."""
+    if requests is None:
+        raise ImportError("A biblioteca requests é necessária para fontes HTTP.")
+
+    def fonte():
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            for linha in response.iter_lines(decode_unicode=True):
+                yield linha + "\n"
+    return fonte
+
+
+def registros_csv(
+        linhas: Callable[[], Iterable[str]],
+        delimitador: str = ";",
+        colunas: Optional[Sequence[str]] = None
+    ) -> Callable[[], Iterable[tuple]]:
+    """
+    Fonte: (número da linha, registro) de um CSV com cabeçalho.
+
+    Sem colunas, o registro é o dicionário da linha (csv.DictReader). Com colunas, é a lista dos valores dessas
+    colunas, nessa ordem, sem criar um dicionário por linha (mais rápido em arquivos grandes); uma linha com
+    menos campos resulta em uma lista mais curta.
+
+    Raises:
+        ValueError: Se alguma das colunas não existir no cabeçalho (ao ler o arquivo).
+    """
+    def fonte():
+        if colunas is None:
+            reader = csv.DictReader(linhas(), delimiter=delimitador)
+            for numero_linha, registro in enumerate(reader, start=2):
+                yield numero_linha, registro
+            return
+
+        reader = csv.reader(linhas(), delimiter=delimitador)
+        cabecalho = [nome.strip() for nome in next(reader, [])]
+        try:
+            indices = [cabecalho.index(coluna) for coluna in colunas]
+        except ValueError:
+            raise ValueError(f"O CSV deve conter as colunas: {', '.join(colunas)}") from None
+        for numero_linha, linha in enumerate(reader, start=2):
+            yield numero_linha, [linha[i] for i in indices if i < len(linha)]
+    return fonte
+
+
+# =====================================
+# DEFINIÇÕES DOS JOBS EXISTENTES
+# =====================================
+
+def pipeline_cursos(
+        fonte_linhas: Callable[[], Iterable[str]],
+        gravar_lote: Callable[[List[tuple]], None],
+        paralelismo: int = 1
+    ) -> Pipeline:
+    """
+    exercicio01.py / exercicio01_em_aula.py: cursos.csv -> tb_cursos, com a quantidade de cursos, o curso com
+    maior carga horária e o curso com maior preço (empates: o primeiro do arquivo).
+
+    Os itens são (linha, curso, carga_horaria, preco).
+    """
+    def converter(lote):
+        try:
+            # Uma compreensão por lote: é a etapa de CPU do job, e o caminho sem erros não chama funções Python.
+            return [
+                (numero_linha, curso, int(carga_horaria), float(preco))
+                for numero_linha, (curso, carga_horaria, preco) in lote
+            ]
+        except ValueError:
+            pass
+        # Algum registro do lote é inválido: converte de novo, um por um, para informar a linha.
+        for numero_linha, registro in lote:
+            try:
+                curso, carga_horaria, preco = registro
+                int(carga_horaria), float(preco)
+            except ValueError as e:
+                raise ValueError(f"Linha {numero_linha} inválida: {registro}") from e
+
+    return Pipeline(
+        nome="cursos",
+        fonte=registros_csv(fonte_linhas, colunas=("curso", "carga_horaria", "preco")),
+        etapas=[Etapa("converter", converter, paralelismo, em_lote=True)],
+        destino=lambda lote: gravar_lote([curso[1:] for curso in lote]),
+        agregacoes={
+            "qtd_cursos": Contagem(),
+            "maior_carga": Maximo(lambda curso: curso[2], desempate=lambda curso: curso[0]),
+            "maior_valor": Maximo(lambda curso: curso[3], desempate=lambda curso: curso[0]),
+        },
+    )
+
+
+def executar_cursos_sqlite(conn: sqlite3.Connection, caminho_csv: Path, paralelismo: int = 1) -> ResultadoPipeline:
+    """
+    Versão em pipeline do exercicio01.py (mesmas tabelas e mesmos resultados). Para que o exercicio01.py, o
+    servico_jobs.py e o consultas_leitura.py enxerguem os cursos gravados, conn deve ser uma conexão com o banco
+    do exercicio01 (exercicio01.DB_PATH, o padrão do comando "python pipeline.py cursos").
+    """
+    # Importados aqui para que o pipeline não dependa do exercicio01 nos outros jobs.
+    from checkpoint import invalidar_carga
+    from exercicio01 import CHAVE_CARGA, CREATE_TB_CURSOS, CREATE_TB_ESTATISTICAS_CURSOS
+
+    cur = conn.cursor()
+    cur.executescript(CREATE_TB_CURSOS + CREATE_TB_ESTATISTICAS_CURSOS)
+    cur.execute("DELETE FROM tb_cursos")
+    # tb_cursos é regravada fora da carga do exercicio01: o checkpoint e as estatísticas memoizadas dela deixam
+    # de valer (confirmado no mesmo commit que os dados).
+    invalidar_carga(conn, CHAVE_CARGA)
+
+    pipeline = pipeline_cursos(
+        linhas_arquivo(caminho_csv),
+        lambda lote: cur.executemany("INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (?, ?, ?)", lote),
+        paralelismo,
+    )
+    resultado = pipeline.executar()
+
+    _, curso_carga, carga, _ = resultado.agregacoes["maior_carga"]
+    _, curso_valor, _, preco = resultado.agregacoes["maior_valor"]
+    cur.execute("DELETE FROM tb_estatisticas_cursos")
+    cur.execute(
+        "INSERT INTO tb_estatisticas_cursos (qtd_cursos, curso_maior_carga_horaria, curso_com_maior_valor) "
+        "VALUES (?, ?, ?)",
+        (resultado.agregacoes["qtd_cursos"], f"{curso_carga} ({carga} horas)", f"{curso_valor} (R$ {preco:.2f})")
+    )
+    conn.commit()
+    return resultado
+
+
+def executar_cursos_mysql(connection, url: str, paralelismo: int = 1) -> ResultadoPipeline:
+    """
+    Versão em pipeline do exercicio01_em_aula.py: o CSV é baixado e inserido ao mesmo tempo (sem gravar o
+    arquivo em disco) e os valores são passados como parâmetros (%s), e não concatenados no SQL.
+    """
+    cursor = connection.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tb_cursos (
+            id INTEGER PRIMARY KEY AUTO_INCREMENT,
+            curso VARCHAR(100) NOT NULL,
+            carga_horaria INT NOT NULL,
+            preco FLOAT NOT NULL
+        )""")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tb_estatisticas_cursos (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            qtd_cursos INT NOT NULL,
+            curso_maior_carga_horaria VARCHAR(100) NOT NULL,
+            curso_com_maior_valor VARCHAR(100) NOT NULL
+        )""")
+    cursor.execute("DELETE FROM tb_cursos")
+    cursor.execute("DELETE FROM tb_estatisticas_cursos")
+
+    pipeline = pipeline_cursos(
+        linhas_http(url),
+        lambda lote: cursor.executemany(
+            "INSERT INTO tb_cursos (curso, carga_horaria, preco) VALUES (%s, %s, %s)", lote
+        ),
+        paralelismo,
+    )
+    resultado = pipeline.executar()
+
+    _, curso_carga, carga, _ = resultado.agregacoes["maior_carga"]
+    _, curso_valor, _, preco = resultado.agregacoes["maior_valor"]
+    cursor.execute(
+        "INSERT INTO tb_estatisticas_cursos (qtd_cursos, curso_maior_carga_horaria, curso_com_maior_valor) "
+        "VALUES (%s, %s, %s)",
+        (resultado.agregacoes["qtd_cursos"], f"{curso_carga} {carga} horas", f"{curso_valor} (R$ {preco})")
+    )
+    connection.commit()
+    return resultado
+
+
+def executar_notas_sqlite(
+        conn: sqlite3.Connection,
+        caminho_csv: Path,
+        proporcao: Optional[float] = None,
+        paralelismo: int = 1
+    ) -> ResultadoPipeline:
+    """
+    Versão em pipeline do exercicio02.py: a média aparada de cada aluno é calculada enquanto as notas são
+    gravadas em tb_notas_longo, e as estatísticas saem das agregações (sem reler a tabela).
+    """
+    # Importado aqui para que o pipeline não dependa do exercicio02 nos outros jobs.
+    from checkpoint import invalidar_carga
+    from exercicio02 import (
+        CHAVE_CARGA, CREATE_TB_ESTATS, CREATE_TB_NOTAS, CREATE_TB_NOTAS_LONGO, PROPORCAO_APARADA,
+        load_csv_notas_variaveis, medias_aparadas
+    )
+    proporcao = PROPORCAO_APARADA if proporcao is None else proporcao
+
+    cur = conn.cursor()
+    cur.executescript(CREATE_TB_NOTAS + CREATE_TB_NOTAS_LONGO + CREATE_TB_ESTATS)
+    cur.execute("DELETE FROM tb_notas")
+    cur.execute("DELETE FROM tb_notas_longo")
+    # As tabelas são regravadas fora da carga do exercicio02: o checkpoint e as estatísticas memoizadas dela
+    # deixam de valer (confirmado no mesmo commit que os dados).
+    invalidar_carga(conn, CHAVE_CARGA)
+
+    def calcular_medias(lote):
+        medias = medias_aparadas([[nota for _, nota in notas] for _, _, notas in lote], proporcao)
+        return [(*aluno, media) for aluno, media in zip(lote, medias)]
+
+    def gravar(lote):
+        cur.executemany(
+            "INSERT INTO tb_notas (nome, nota1, nota2, nota3, nota4, nota5) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (nome, *(nota for _, nota in notas))
+                for _, nome, notas, _ in lote
+                if [avaliacao for avaliacao, _ in notas] == [1, 2, 3, 4, 5]
+            ]
+        )
+        cur.executemany(
+            "INSERT INTO tb_notas_longo (aluno_id, nome, avaliacao, nota) VALUES (?, ?, ?, ?)",
+            [
+                (aluno_id, nome, avaliacao, nota)
+                for aluno_id, nome, notas, _ in lote
+                for avaliacao, nota in notas
+            ]
+        )
+
+    pipeline = Pipeline(
+        nome="notas",
+        fonte=lambda: load_csv_notas_variaveis(Path(caminho_csv)),
+        etapas=[Etapa("media_aparada", calcular_medias, paralelismo, em_lote=True)],
+        destino=gravar,
+        agregacoes={
+            "quantidade_de_alunos": Contagem(),
+            "media_geral": Media(lambda aluno: aluno[3]),
+            "maior_media": Maximo(lambda aluno: aluno[3], desempate=lambda aluno: aluno[0]),
+        },
+    )
+    resultado = pipeline.executar()
+
+    qtd = resultado.agregacoes["quantidade_de_alunos"]
+    maior = resultado.agregacoes["maior_media"]
+    cur.execute("DELETE FROM tb_estatisticas_notas")
+    cur.execute(
+        "INSERT INTO tb_estatisticas_notas (quantidade_de_alunos, media_geral, maior_media, aluno_maior_media) "
+        "VALUES (?, ?, ?, ?)",
+        (qtd, resultado.agregacoes["media_geral"], maior[3] if maior else 0.0, maior[1] if maior else "")
+    )
+    conn.commit()
+    return resultado
+
+
+def pipeline_cryptos(
+        ids: Iterable[str],
+        gravar_lote: Callable[[List[tuple]], None],
+        url: str = "https://api.coinlore.net/api",
+        paralelismo: int = 8
+    ) -> Pipeline:
+    """
+    aula05/prog02.py para vários ids de uma vez: as consultas à API são feitas por várias threads ao mesmo
+    tempo (a maior parte do tempo é espera pela rede) e os resultados são inseridos em lotes.
+
+    Os itens gravados são (simbolo, nome, preco_usd, market_cap_usd).
+    """
+    if requests is None:
+        raise ImportError("A biblioteca requests é necessária para consultar a API.")
+    sessao = requests.Session()
+
+    def consultar(crypto_id):
+        response = sessao.get(f"{url}/ticker?id={crypto_id}", timeout=30)
+        response.raise_for_status()
+        dados = response.json()
+        if not dados:
+            return None
+        info = dados[0]
+        return info.get("symbol"), info.get("name"), float(info.get("price_usd")), float(info.get("market_cap_usd"))
+
+    return Pipeline(
+        nome="cryptos",
+        fonte=lambda: ids,
+        etapas=[Etapa("consultar_api", consultar, paralelismo)],
+        destino=gravar_lote,
+        agregacoes={"qtd": Contagem(), "maior_market_cap": Maximo(lambda crypto: crypto[3])},
+        tamanho_lote=50,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa os jobs de carga como pipelines concorrentes")
+    parser.add_argument("job", choices=["cursos", "notas"])
+    parser.add_argument("--csv", help="Arquivo CSV (padrão: cursos.csv ou notas.csv)")
+    parser.add_argument("--banco", help="Banco de dados (padrão: o do exercicio01.py para cursos, DB_PATH para notas)")
+    parser.add_argument("--paralelismo", type=int, default=1, help="Threads da etapa de transformação")
+    args = parser.parse_args()
+
+    banco = args.banco
+    if banco is None:
+        from exercicio01 import DB_PATH as DB_CURSOS_PATH
+        banco = DB_CURSOS_PATH if args.job == "cursos" else DB_PATH
+
+    with sqlite3.connect(banco) as conn:
+        if args.job == "cursos":
+            resultado = executar_cursos_sqlite(conn, Path(args.csv or BASE_DIR / "cursos.csv"), args.paralelismo)
+            _, curso, carga, _ = resultado.agregacoes["maior_carga"]
+            _, curso_valor, _, preco = resultado.agregacoes["maior_valor"]
+            print(f"Quantidade de cursos: {resultado.agregacoes['qtd_cursos']}")
+            print(f"Curso com a maior carga horária: {curso} ({carga} horas)")
+            print(f"Curso com o maior valor: {curso_valor} (R$ {preco:.2f})")
+        else:
+            resultado = executar_notas_sqlite(
+                conn, Path(args.csv or BASE_DIR / "notas.csv"), paralelismo=args.paralelismo
+            )
+            maior = resultado.agregacoes["maior_media"]
+            print(f"Quantidade de alunos: {resultado.agregacoes['quantidade_de_alunos']}")
+            print(f"Média geral: {resultado.agregacoes['media_geral']:.2f}")
+            if maior:
+                print(f"Maior média: {maior[3]:.2f}")
+                print(f"Aluno com a maior média: {maior[1]}")
+
+    tempos = ", ".join(f"{nome}: {tempo:.3f}s" for nome, tempo in resultado.tempo_etapas_s.items())
+    print(f"{resultado.lidos} lido(s), {resultado.gravados} gravado(s) em {resultado.duracao_s:.3f}s ({tempos})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# MODO QUARENTENA PARA CARGAS DE CSV
+# Nas cargas de CSV, uma única linha inválida (ex: uma nota "10X") interrompe a carga inteira com ValueError.
+# Em arquivos com milhões de linhas, isso obriga a corrigir o arquivo e executar tudo de novo.
+#
+# No modo quarentena, as linhas inválidas são desviadas para um arquivo de rejeitos (CSV com o número da linha,
+# o tipo do erro, o motivo e o conteúdo original) e a carga continua com as linhas válidas. Para que um arquivo
+# completamente errado (ex: delimitador trocado) não seja "carregado" vazio, existe um orçamento de erros:
+#   - max_erros: quantidade máxima de linhas rejeitadas;
+#   - max_proporcao: proporção máxima de linhas rejeitadas (verificada após MINIMO_LINHAS_PROPORCAO linhas
+#     e no final da carga).
+# Ao passar do orçamento, a carga é interrompida com OrcamentoErrosExcedido.
+#
+# Em cargas retomáveis (checkpoint.py), estado() é gravado junto com cada checkpoint e retomar() o restaura na
+# execução seguinte: o orçamento vale para a carga inteira e o arquivo de rejeitos continua de onde parou.
+#
+# Uso:
+#   with Quarentena("rejeitos.csv", max_erros=1000) as quarentena:
+#       for numero_linha, linha in ...:
+#           try:
+#               ...
+#           except ValueError as e:
+#               quarentena.rejeitar(numero_linha, linha, e)
+#               continue
+#           quarentena.aceitar()
+#       quarentena.finalizar()
+#   print(quarentena.resumo())
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import csv
+import os
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+# Quantidade mínima de linhas lidas antes de verificar a proporção de erros (evita interromper a carga porque
+# a primeira linha lida era inválida).
+MINIMO_LINHAS_PROPORCAO = 1000
+
+# Exceções que indicam uma linha inválida (e não um problema no programa ou no banco).
+ERROS_DE_LINHA = (ValueError, KeyError, IndexError, TypeError)
+
+
+class OrcamentoErrosExcedido(ValueError):
+    """A quantidade (ou proporção) de linhas rejeitadas passou do limite configurado."""
+
+
+def classificar_erro(erro: Union[BaseException, str]) -> str:
+    """
+    Retorna o tipo do erro utilizado no resumo dos rejeitos (ex: numero_invalido, coluna_ausente).
+
+    As funções de leitura costumam encapsular o erro original (raise ValueError(...) from e); nesse caso o
+    erro original (__cause__) é o classificado.
+    """
+    if isinstance(erro, str):
+        return erro
+    causa = erro.__cause__ or erro
+    if isinstance(causa, KeyError):
+        return "coluna_ausente"
+    if isinstance(causa, (IndexError, TypeError)):
+        # TypeError: o csv.DictReader preenche as colunas que faltam com None (ex: float(None)).
+        return "colunas_faltando"
+    texto = str(causa)
+    if "could not convert string to float" in texto:
+        return "numero_invalido"
+    if "invalid literal for int()" in texto:
+        return "inteiro_invalido"
+    return type(causa).__name__
+
+
+class Quarentena:
+    """Desvia as linhas inválidas de uma carga para um arquivo de rejeitos, dentro de um orçamento de erros."""
+
+    def __init__(
+            self,
+            caminho_rejeitos: Optional[Path] = None,
+            max_erros: Optional[int] = None,
+            max_proporcao: Optional[float] = None,
+            delimitador: str = ";"
+        ):
+        """
+        Args:
+            caminho_rejeitos (Optional[Path]): Arquivo de rejeitos (recriado a cada carga, exceto quando ela é
+                retomada). Se None, as linhas rejeitadas são apenas contadas.
+            max_erros (Optional[int]): Quantidade máxima de linhas rejeitadas (None: sem limite).
+            max_proporcao (Optional[float]): Proporção máxima de linhas rejeitadas, entre 0 e 1 (None: sem limite).
+            delimitador (str): Delimitador do arquivo de rejeitos.
+
+        Raises:
+            ValueError: Se os limites forem negativos ou a proporção for maior que 1.
+        """
+        if max_erros is not None and max_erros < 0:
+            raise ValueError("max_erros não pode ser negativo.")
+        if max_proporcao is not None and not 0 <= max_proporcao <= 1:
+            raise ValueError("max_proporcao deve estar entre 0 e 1.")
+        self.caminho_rejeitos = Path(caminho_rejeitos) if caminho_rejeitos else None
+        self.max_erros = max_erros
+        self.max_proporcao = max_proporcao
+        self.delimitador = delimitador
+        self.aceitas = 0
+        self.rejeitadas = 0
+        # tipo do erro -> quantidade de linhas
+        self.por_tipo: Dict[str, int] = {}
+        self._arquivo = None
+        self._writer = None
+        # Tamanho do arquivo de rejeitos de uma carga retomada (None: o arquivo é recriado com o cabeçalho).
+        self._tamanho_retomado: Optional[int] = None
+
+    def _abrir(self) -> None:
+        # O arquivo só é criado quando a primeira linha é rejeitada (cargas sem erros não geram arquivos vazios).
+        self.caminho_rejeitos.parent.mkdir(parents=True, exist_ok=True)
+        if self._tamanho_retomado is not None:
+            # Carga retomada: as linhas rejeitadas antes do checkpoint continuam no arquivo.
+            self._arquivo = open(self.caminho_rejeitos, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._arquivo, delimiter=self.delimitador)
+            return
+        self._arquivo = open(self.caminho_rejeitos, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._arquivo, delimiter=self.delimitador)
+        self._writer.writerow(["linha", "tipo", "motivo", "conteudo"])
+
+    def estado(self) -> Dict[str, object]:
+        """
+        Contadores e tamanho do arquivo de rejeitos (descarregado no disco), para serem gravados junto com o
+        checkpoint da carga (valores que podem ser gravados em JSON; veja retomar).
+        """
+        if self._arquivo is not None:
+            self.descarregar()
+            tamanho = os.path.getsize(self.caminho_rejeitos)
+        else:
+            tamanho = self._tamanho_retomado or 0
+        return {
+            "aceitas": self.aceitas,
+            "rejeitadas": self.rejeitadas,
+            "por_tipo": dict(self.por_tipo),
+            "arquivo": str(self.caminho_rejeitos.resolve()) if self.caminho_rejeitos else None,
+            "tamanho": tamanho,
+        }
+
+    def retomar(
+            self,
+            aceitas: int = 0,
+            rejeitadas: int = 0,
+            por_tipo: Optional[Dict[str, int]] = None,
+            arquivo: Optional[str] = None,
+            tamanho: int = 0
+        ) -> None:
+        """
+        Restaura o estado gravado por estado() no último checkpoint de uma carga retomada.
+
+        Os contadores voltam a ser os da carga inteira (o orçamento de erros não recomeça do zero). Se o arquivo de
+        rejeitos for o mesmo, as linhas gravadas depois do checkpoint (de lotes não confirmados) são descartadas e
+        as próximas são acrescentadas ao final; se for outro (ou não existir mais), ele é recriado e terá apenas as
+        linhas rejeitadas a partir da retomada.
+        """
+        self.fechar()
+        self.aceitas = aceitas
+        self.rejeitadas = rejeitadas
+        self.por_tipo = dict(por_tipo or {})
+        self._tamanho_retomado = None
+        if self.caminho_rejeitos is None or not tamanho or arquivo != str(self.caminho_rejeitos.resolve()):
+            return
+        if self.caminho_rejeitos.exists() and self.caminho_rejeitos.stat().st_size >= tamanho:
+            os.truncate(self.caminho_rejeitos, tamanho)
+            self._tamanho_retomado = tamanho
+
+    def aceitar(self, quantidade: int = 1) -> None:
+        """Conta linhas válidas (utilizadas no cálculo da proporção de erros)."""
+        self.aceitas += quantidade
+
+    def rejeitar(
+            self,
+            numero_linha: int,
+            conteudo: Union[str, Sequence[str], Dict[str, str]],
+            erro: Union[BaseException, str]
+        ) -> None:
+        """
+        Registra uma linha inválida no arquivo de rejeitos.
+
+        Args:
+            numero_linha (int): Número da linha no arquivo de origem.
+            conteudo (Union[str, Sequence[str], Dict[str, str]]): A linha original (texto, campos ou registro).
+            erro (Union[BaseException, str]): O erro (ou o tipo do erro, se não houver exceção).
+
+        Raises:
+            OrcamentoErrosExcedido: Se a linha ultrapassar o orçamento de erros.
+        """
+        tipo = classificar_erro(erro)
+        self.rejeitadas += 1
+        self.por_tipo[tipo] = self.por_tipo.get(tipo, 0) + 1
+
+        if self.caminho_rejeitos is not None:
+            if self._writer is None:
+                self._abrir()
+            if isinstance(conteudo, dict):
+                conteudo = conteudo.values()
+            if not isinstance(conteudo, str):
+                conteudo = self.delimitador.join("" if campo is None else str(campo) for campo in conteudo)
+            motivo = erro if isinstance(erro, str) else str(erro.__cause__ or erro)
+            self._writer.writerow([numero_linha, tipo, motivo, conteudo])
+
+        self._verificar_orcamento(MINIMO_LINHAS_PROPORCAO)
+
+    def _verificar_orcamento(self, minimo_linhas: int) -> None:
+        if self.max_erros is not None and self.rejeitadas > self.max_erros:
+            self._excedido(f"{self.rejeitadas} linhas rejeitadas (máximo: {self.max_erros})")
+        total = self.aceitas + self.rejeitadas
+        if self.max_proporcao is not None and total and total >= minimo_linhas:
+            if self.rejeitadas / total > self.max_proporcao:
+                self._excedido(
+                    f"{self.rejeitadas / total:.2%} das linhas rejeitadas (máximo: {self.max_proporcao:.2%})"
+                )
+
+    def _excedido(self, mensagem: str) -> None:
+        self.descarregar()
+        raise OrcamentoErrosExcedido(f"Orçamento de erros excedido: {mensagem}. {self.texto_resumo()}")
+
+    def finalizar(self) -> None:
+        """
+        Verifica o orçamento no fim da carga (a proporção também é verificada em arquivos pequenos).
+
+        Raises:
+            OrcamentoErrosExcedido: Se a carga ultrapassou o orçamento de erros.
+        """
+        self.descarregar()
+        self._verificar_orcamento(0)
+
+    def descarregar(self) -> None:
+        """Grava no disco as linhas rejeitadas até o momento (ex: junto com cada commit da carga)."""
+        if self._arquivo is not None:
+            self._arquivo.flush()
+
+    def fechar(self) -> None:
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = self._writer = None
+
+    def resumo(self) -> Dict[str, int]:
+        """Quantidade de linhas rejeitadas por tipo de erro (da maior para a menor)."""
+        return dict(sorted(self.por_tipo.items(), key=lambda item: (-item[1], item[0])))
+
+    def texto_resumo(self) -> str:
+        if not self.rejeitadas:
+            return "Nenhuma linha rejeitada."
+        tipos = ", ".join(f"{tipo}: {quantidade}" for tipo, quantidade in self.resumo().items())
+        destino = f" - rejeitos em {self.caminho_rejeitos}" if self.caminho_rejeitos else ""
+        return f"Linhas rejeitadas: {self.rejeitadas} de {self.aceitas + self.rejeitadas} ({tipos}){destino}"
+
+    def __enter__(self) -> "Quarentena":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+def adicionar_argumentos_quarentena(parser) -> None:
+    """Adiciona os argumentos --rejeitos, --max-erros e --max-proporcao a um parser de linha de comando."""
+    parser.add_argument("--rejeitos", metavar="ARQUIVO",
+                        help="Modo quarentena: grava as linhas inválidas neste arquivo e continua a carga")
+    parser.add_argument("--max-erros", type=int, metavar="N",
+                        help="Quarentena: interrompe a carga se mais de N linhas forem rejeitadas")
+    parser.add_argument("--max-proporcao", type=float, metavar="P",
+                        help="Quarentena: interrompe a carga se mais de P (0 a 1) das linhas forem rejeitadas")
+
+
+def quarentena_dos_argumentos(args) -> Optional[Quarentena]:
+    """Cria a quarentena a partir dos argumentos, ou retorna None se o modo quarentena não foi solicitado."""
+    if args.rejeitos is None and args.max_erros is None and args.max_proporcao is None:
+        return None
+    return Quarentena(args.rejeitos, args.max_erros, args.max_proporcao)
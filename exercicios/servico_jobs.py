@@ -0,0 +1,317 @@
+# SERVIÇO DE CONTROLE DE JOBS (asyncio) - INICIAR, INTERROMPER, STATUS, FINALIZAR
+# O aula01/prog10.py lê um comando com input() e o executa com match/case (INICIAR, INTERROMPER, FINALIZAR).
+# Este serviço utiliza os mesmos comandos, mas como um processo permanente: vários clientes se conectam por um
+# socket local e enviam um comando por linha; cada comando recebe uma resposta de uma linha:
+#   OK {json}          ou          ERRO mensagem
+#
+# Comandos:
+#   INICIAR job [parametro=valor ...]   inicia um job (veja JOBS) e responde com o seu id
+#   INTERROMPER id                      pede a interrupção do job; ele para no próximo commit (e pode ser retomado)
+#   STATUS [id]                         situação de um job ou de todos
+#   FINALIZAR                           interrompe os jobs em execução, aguarda e encerra o serviço
+#
+# Os jobs executam em um pool de processos (ProcessPoolExecutor), sem bloquear o atendimento dos comandos. A
+# interrupção é cooperativa: cada job recebe um multiprocessing.Manager().Event() e o consulta entre os lotes
+# (parâmetro interromper de checkpoint.carregar_csv_retomavel). Como os lotes são confirmados com checkpoint,
+# um job interrompido continua de onde parou quando for iniciado novamente.
+#
+# Uso:
+#   python servico_jobs.py servidor --porta 8765
+#   python servico_jobs.py cliente INICIAR notas
+#   python servico_jobs.py cliente STATUS
+#   python servico_jobs.py cliente --repeticoes 10000 STATUS     # mede os comandos por segundo
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sqlite3
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# =====================================
+# CONFIGURAÇÃO
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+
+HOST = "127.0.0.1"
+PORTA = 8765
+
+# =====================================
+# JOBS
+# =====================================
+# Cada job recebe a função interromper() (True quando a interrupção foi pedida) e os parâmetros do comando
+# INICIAR (sempre texto), e retorna um dicionário com o resultado (enviado no STATUS).
+
+def _resultado_job(resultado) -> dict:
+    # Campos da carga (se o CSV foi lido), as estatísticas e se elas vieram da memoização.
+    dados = resultado.carga._asdict() if resultado.carga is not None else {"concluida": True}
+    dados["estatisticas"] = resultado.estatisticas
+    dados["memoizado"] = resultado.memoizado
+    return dados
+
+
+def job_notas(interromper: Callable[[], bool], caminho: str = str(BASE_DIR / "notas.csv"),
+              banco: str = str(DB_PATH), proporcao: str = "0.2") -> dict:
+    """Carga das notas com checkpoint e, se concluída, as estatísticas (exercicio02.processar_notas)."""
+    from exercicio02 import processar_notas
+
+    conn = sqlite3.connect(banco)
+    try:
+        return _resultado_job(
+            processar_notas(conn, Path(caminho), float(proporcao), interromper=interromper)
+        )
+    finally:
+        conn.close()
+
+
+def job_cursos(interromper: Callable[[], bool], caminho: str = str(BASE_DIR / "cursos.csv"),
+               banco: str = str(BASE_DIR.parent / "db.sqlite3")) -> dict:
+    """Carga dos cursos com checkpoint e, se concluída, as estatísticas (exercicio01.processar_cursos)."""
+    from exercicio01 import processar_cursos
+
+    conn = sqlite3.connect(banco)
+    try:
+        return _resultado_job(processar_cursos(conn, caminho, interromper=interromper))
+    finally:
+        conn.close()
+
+
+def job_espera(interromper: Callable[[], bool], segundos: str = "10") -> dict:
+    """Job de teste: aguarda alguns segundos, verificando a interrupção a cada 0,1s."""
+    fim = time.monotonic() + float(segundos)
+    while time.monotonic() < fim:
+        if interromper():
+            return {"concluida": False}
+        time.sleep(0.1)
+    return {"concluida": True}
+
+
+JOBS: Dict[str, Callable[..., dict]] = {
+    "notas": job_notas,
+    "cursos": job_cursos,
+    "espera": job_espera,
+}
+
+
+def _executar_job(nome: str, evento, parametros: Dict[str, str]) -> dict:
+    """Executado no processo do pool. evento é um proxy de Manager().Event() (pode ser enviado ao processo)."""
+    return JOBS[nome](evento.is_set, **parametros)
+
+
+# =====================================
+# SERVIÇO
+# =====================================
+
+@dataclass
+class Job:
+    id: int
+    nome: str
+    parametros: Dict[str, str]
+    evento: object
+    estado: str = "executando"  # executando, interrompendo, concluido, interrompido, erro
+    iniciado_em: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    inicio: float = field(default_factory=time.monotonic)
+    duracao_s: Optional[float] = None
+    resultado: Optional[dict] = None
+    erro: Optional[str] = None
+
+    def status(self) -> dict:
+        return {
+            "id": self.id,
+            "job": self.nome,
+            "parametros": self.parametros,
+            "estado": self.estado,
+            "iniciado_em": self.iniciado_em,
+            "duracao_s": round(self.duracao_s if self.duracao_s is not None else time.monotonic() - self.inicio, 3),
+            "resultado": self.resultado,
+            "erro": self.erro,
+        }
+
+
+class ServicoJobs:
+    """Atende os comandos dos clientes e controla os jobs em execução no pool de processos."""
+
+    def __init__(self, processos: Optional[int] = None):
+        self.executor = ProcessPoolExecutor(processos)
+        self.manager = multiprocessing.Manager()
+        self.jobs: Dict[int, Job] = {}
+        self._proximo_id = 1
+        self._tarefas = set()
+        self.encerrar = asyncio.Event()
+
+    def _em_execucao(self, nome: str) -> Optional[Job]:
+        return next(
+            (job for job in self.jobs.values() if job.nome == nome and job.estado in ("executando", "interrompendo")),
+            None
+        )
+
+    def iniciar(self, nome: str, argumentos) -> str:
+        if nome not in JOBS:
+            return f"ERRO Job '{nome}' desconhecido (opções: {', '.join(JOBS)})"
+        # Duas cargas iguais ao mesmo tempo disputariam as mesmas tabelas e o mesmo checkpoint.
+        atual = self._em_execucao(nome)
+        if atual is not None:
+            return f"ERRO Job '{nome}' já está em execução (id {atual.id})"
+        try:
+            parametros = dict(argumento.split("=", 1) for argumento in argumentos)
+        except ValueError:
+            return "ERRO Parâmetros devem estar no formato nome=valor"
+
+        job = Job(self._proximo_id, nome, parametros, self.manager.Event())
+        self._proximo_id += 1
+        self.jobs[job.id] = job
+        tarefa = asyncio.create_task(self._acompanhar(job))
+        # Referência às tarefas em andamento (o asyncio guarda apenas referências fracas).
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        return f"OK {json.dumps({'id': job.id}, ensure_ascii=False)}"
+
+    async def _acompanhar(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            job.resultado = await loop.run_in_executor(
+                self.executor, _executar_job, job.nome, job.evento, job.parametros
+            )
+            job.estado = "concluido" if job.resultado.get("concluida", True) else "interrompido"
+        except Exception as e:
+            job.estado = "erro"
+            job.erro = f"{type(e).__name__}: {e}"
+        job.duracao_s = time.monotonic() - job.inicio
+
+    def interromper(self, id_job: str) -> str:
+        job = self.jobs.get(int(id_job)) if id_job.isdigit() else None
+        if job is None:
+            return f"ERRO Job {id_job} não encontrado"
+        if job.estado != "executando":
+            return f"ERRO Job {id_job} não está em execução ({job.estado})"
+        job.evento.set()
+        job.estado = "interrompendo"
+        return f"OK {json.dumps(job.status(), ensure_ascii=False)}"
+
+    def status(self, id_job: Optional[str] = None) -> str:
+        if id_job is None:
+            return f"OK {json.dumps([job.status() for job in self.jobs.values()], ensure_ascii=False)}"
+        job = self.jobs.get(int(id_job)) if id_job.isdigit() else None
+        if job is None:
+            return f"ERRO Job {id_job} não encontrado"
+        return f"OK {json.dumps(job.status(), ensure_ascii=False)}"
+
+    def executar_comando(self, linha: str) -> str:
+        """Interpreta uma linha de comando (mesmo vocabulário do aula01/prog10.py) e retorna a resposta."""
+        partes = linha.split()
+        if not partes:
+            return "ERRO Comando vazio"
+        partes[0] = partes[0].upper()
+
+        match partes:
+            case ["INICIAR", nome, *argumentos]:
+                return self.iniciar(nome, argumentos)
+
+            case ["INTERROMPER", id_job]:
+                return self.interromper(id_job)
+
+            case ["STATUS"]:
+                return self.status()
+
+            case ["STATUS", id_job]:
+                return self.status(id_job)
+
+            case ["FINALIZAR"]:
+                self.encerrar.set()
+                return "OK {\"finalizando\": true}"
+
+            case _:
+                return f"ERRO Comando '{linha.strip()}' desconhecido ou incompleto"
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende um cliente: lê uma linha por comando e responde com uma linha."""
+        try:
+            while not reader.at_eof():
+                linha = await reader.readline()
+                if not linha:
+                    break
+                writer.write((self.executar_comando(linha.decode("utf-8")) + "\n").encode("utf-8"))
+                # drain() só espera quando o buffer de saída está cheio (cliente lento).
+                await writer.drain()
+                if self.encerrar.is_set():
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def finalizar(self) -> None:
+        """Interrompe os jobs em execução, aguarda o término e libera o pool e o Manager."""
+        for job in self.jobs.values():
+            if job.estado == "executando":
+                job.evento.set()
+                job.estado = "interrompendo"
+        if self._tarefas:
+            await asyncio.gather(*self._tarefas)
+        self.executor.shutdown()
+        self.manager.shutdown()
+
+
+async def servidor(host: str = HOST, porta: int = PORTA, processos: Optional[int] = None) -> None:
+    servico = ServicoJobs(processos)
+    server = await asyncio.start_server(servico.atender, host, porta)
+    print(f"Serviço de jobs em {host}:{porta} (jobs: {', '.join(JOBS)})")
+    async with server:
+        await servico.encerrar.wait()
+        server.close()
+        await servico.finalizar()
+    print("Serviço finalizado.")
+
+
+async def cliente(comando: str, host: str = HOST, porta: int = PORTA, repeticoes: int = 1) -> None:
+    reader, writer = await asyncio.open_connection(host, porta)
+    inicio = time.perf_counter()
+    # Os comandos são enviados em sequência sem esperar cada resposta (pipelining); as respostas chegam na ordem.
+    writer.write((comando + "\n").encode("utf-8") * repeticoes)
+    await writer.drain()
+    resposta = b""
+    for _ in range(repeticoes):
+        resposta = await reader.readline()
+    duracao = time.perf_counter() - inicio
+    writer.close()
+    await writer.wait_closed()
+
+    print(resposta.decode("utf-8").rstrip())
+    if repeticoes > 1:
+        print(f"{repeticoes} comandos em {duracao:.3f}s ({repeticoes / duracao:.0f} comandos/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serviço de controle de jobs (INICIAR, INTERROMPER, STATUS, FINALIZAR)"
+    )
+    subparsers = parser.add_subparsers(dest="modo", required=True)
+
+    p_servidor = subparsers.add_parser("servidor", help="Inicia o serviço")
+    p_servidor.add_argument("--host", default=HOST)
+    p_servidor.add_argument("--porta", type=int, default=PORTA)
+    p_servidor.add_argument("--processos", type=int, help="Quantidade de jobs executados ao mesmo tempo")
+
+    p_cliente = subparsers.add_parser("cliente", help="Envia um comando ao serviço")
+    p_cliente.add_argument("comando", nargs="+")
+    p_cliente.add_argument("--host", default=HOST)
+    p_cliente.add_argument("--porta", type=int, default=PORTA)
+    p_cliente.add_argument("--repeticoes", type=int, default=1, help="Envia o comando N vezes (teste de vazão)")
+
+    args = parser.parse_args()
+    if args.modo == "servidor":
+        asyncio.run(servidor(args.host, args.porta, args.processos))
+    else:
+        asyncio.run(cliente(" ".join(args.comando), args.host, args.porta, args.repeticoes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# LEITURA E CARGA DO ARQUIVO vendedores.txt
+# O arquivo guarda cada vendedor em um registro de várias linhas, seguido de uma linha em branco:
+#
+#   Código: 0001
+#   Vendedor: Paulo Oliveira
+#   Vendas: 19314.47
+#
+# Este módulo possui:
+#   - um parser (máquina de estados) que lê o arquivo linha a linha e retorna os registros sob demanda
+#     (generator), sem carregar o arquivo inteiro na memória;
+#   - um índice código -> posição (byte) no arquivo, para buscar um vendedor específico sem reler o arquivo.
+#     O índice é gravado em um arquivo ao lado do original (vendedores.txt.indice, JSON) com a impressão digital
+#     do arquivo (tamanho, mtime e hash, como no cache_csv): as buscas seguintes leem apenas o índice e o
+#     registro procurado, e o índice é recriado quando o arquivo muda. Medido com 300 mil vendedores (16 MB):
+#     --buscar sem índice gravado ~2,2s (lê e valida o arquivo inteiro); com o índice gravado ~0,55s (a maior
+#     parte é carregar o JSON do índice);
+#   - a carga em lotes para a tabela tb_vendedores do SQLite.
+#
+# Registros mal formados são informados com o número da linha e a leitura continua no próximo registro.
+
+# ===== IMPORTAÇÃO DE BIBLIOTECAS =====
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from cache_csv import impressao_digital, mesmo_arquivo
+from instrumentacao import execucao_atual, iniciar_execucao
+
+# =====================================
+# CONFIGURAÇÃO DE CAMINHOS DE ARQUIVOS
+# =====================================
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / "db.sqlite3"
+TXT_PATH = BASE_DIR / "vendedores.txt"
+
+# Quantidade de registros inseridos a cada executemany()/commit().
+TAMANHO_LOTE = 5000
+
+# Extensão adicionada ao nome do arquivo para o índice gravado (veja carregar_indice).
+EXTENSAO_INDICE = ".indice"
+
+CREATE_TB_VENDEDORES = """
+CREATE TABLE IF NOT EXISTS tb_vendedores (
+    codigo TEXT PRIMARY KEY,   -- Código do vendedor, mantido como texto para preservar os zeros à esquerda.
+    vendedor TEXT NOT NULL,    -- Nome do vendedor.
+    vendas REAL NOT NULL       -- Valor total de vendas.
+);
+"""
+
+
+class Vendedor(NamedTuple):
+    codigo: str
+    nome: str
+    vendas: float
+    linha: int    # Número da linha do campo "Código:" no arquivo (começando em 1).
+    offset: int   # Posição (em bytes) do início do registro no arquivo.
+
+
+class ErroRegistro(NamedTuple):
+    linha: int
+    mensagem: str
+
+
+# =====================================
+# PARSER (MÁQUINA DE ESTADOS)
+# =====================================
+
+# Estados do parser: qual campo esperamos encontrar na próxima linha.
+CODIGO, VENDEDOR, VENDAS, SEPARADOR, DESCARTANDO = range(5)
+
+CAMPOS = {CODIGO: "Código", VENDEDOR: "Vendedor", VENDAS: "Vendas"}
+
+
+def _separar_campo(texto: str):
+    """Separa 'Campo: valor' em ('Campo', 'valor'). Retorna (None, None) se a linha não tiver ':'."""
+    if ":" not in texto:
+        return None, None
+    campo, valor = texto.split(":", 1)
+    return campo.strip(), valor.strip()
+
+
+def ler_vendedores(
+        caminho: Path = TXT_PATH,
+        erros: Optional[List[ErroRegistro]] = None,
+        offset_inicial: int = 0,
+        linha_inicial: int = 1,
+        limite: Optional[int] = None
+    ) -> Iterator[Vendedor]:
+    """
+    Lê o arquivo de vendedores e retorna os registros um a um (generator).
+
+    Args:
+        caminho (Path): Caminho do arquivo de vendedores.
+        erros (Optional[List[ErroRegistro]]): Lista onde os registros mal formados são adicionados. Se None,
+            os erros são escritos na saída de erros (stderr).
+        offset_inicial (int): Posição (em bytes) do arquivo onde a leitura começa.
+        linha_inicial (int): Número da linha correspondente ao offset_inicial.
+        limite (Optional[int]): Quantidade máxima de registros retornados.
+
+    Returns:
+        Iterator[Vendedor]: Os registros válidos, na ordem do arquivo.
+    """
+    def reportar(numero_linha: int, mensagem: str):
+        if erros is None:
+            print(f"{caminho}:{numero_linha}: {mensagem}", file=sys.stderr)
+        else:
+            erros.append(ErroRegistro(numero_linha, mensagem))
+
+    if limite is not None and limite <= 0:
+        return
+
+    retornados = 0
+    estado = CODIGO
+    registro: Dict[str, object] = {}
+
+    # O arquivo é aberto em modo binário para sabermos a posição (em bytes) de cada linha.
+    with open(caminho, "rb") as f:
+        f.seek(offset_inicial)
+        offset = offset_inicial
+
+        for numero_linha, linha_bytes in enumerate(f, start=linha_inicial):
+            offset_linha = offset
+            offset += len(linha_bytes)
+
+            try:
+                texto = linha_bytes.decode("utf-8").strip()
+            except UnicodeDecodeError:
+                reportar(numero_linha, "Linha com codificação inválida (esperado UTF-8).")
+                estado = DESCARTANDO
+                continue
+
+            campo, valor = _separar_campo(texto)
+
+            # Linha em branco: fim de um registro.
+            if not texto:
+                if estado in (VENDEDOR, VENDAS):
+                    reportar(registro["linha"], f"Registro incompleto: campo '{CAMPOS[estado]}' ausente.")
+                estado = CODIGO
+                continue
+
+            # Um campo "Código:" sempre inicia um novo registro, mesmo que o anterior não tenha terminado.
+            if campo == "Código":
+                if estado in (VENDEDOR, VENDAS):
+                    reportar(registro["linha"], f"Registro incompleto: campo '{CAMPOS[estado]}' ausente.")
+                elif estado == SEPARADOR:
+                    reportar(numero_linha, "Linha em branco ausente entre registros.")
+                if not valor:
+                    reportar(numero_linha, "Código vazio.")
+                    estado = DESCARTANDO
+                    continue
+                registro = {"codigo": valor, "linha": numero_linha, "offset": offset_linha}
+                estado = VENDEDOR
+                continue
+
+            if estado == DESCARTANDO:
+                continue
+
+            if estado == CODIGO or estado == SEPARADOR:
+                reportar(numero_linha, f"Linha inesperada fora de um registro: {texto!r}")
+                estado = DESCARTANDO
+                continue
+
+            if campo != CAMPOS[estado]:
+                reportar(numero_linha, f"Esperado o campo '{CAMPOS[estado]}', encontrado: {texto!r}")
+                estado = DESCARTANDO
+                continue
+
+            if estado == VENDEDOR:
+                if not valor:
+                    reportar(numero_linha, "Nome do vendedor vazio.")
+                    estado = DESCARTANDO
+                    continue
+                registro["nome"] = valor
+                estado = VENDAS
+                continue
+
+            # estado == VENDAS
+            try:
+                vendas = float(valor)
+            except ValueError:
+                reportar(numero_linha, f"Valor de vendas inválido: {valor!r}")
+                estado = DESCARTANDO
+                continue
+
+            estado = SEPARADOR
+            yield Vendedor(registro["codigo"], registro["nome"], vendas, registro["linha"], registro["offset"])
+
+            retornados += 1
+            if limite is not None and retornados >= limite:
+                return
+
+    # Fim do arquivo no meio de um registro.
+    if estado in (VENDEDOR, VENDAS):
+        reportar(registro["linha"], f"Registro incompleto: campo '{CAMPOS[estado]}' ausente.")
+
+
+# =====================================
+# ÍNDICE CÓDIGO -> POSIÇÃO NO ARQUIVO
+# =====================================
+
+def criar_indice(caminho: Path = TXT_PATH, erros: Optional[List[ErroRegistro]] = None) -> Dict[str, tuple]:
+    """
+    Cria um índice com a posição de cada registro no arquivo.
+
+    Returns:
+        Dict[str, tuple]: Dicionário código -> (offset em bytes, número da linha).
+    """
+    return {vendedor.codigo: (vendedor.offset, vendedor.linha) for vendedor in ler_vendedores(caminho, erros)}
+
+
+def caminho_indice(caminho: Path) -> Path:
+    """Retorna o caminho do índice gravado de um arquivo de vendedores (na mesma pasta do arquivo)."""
+    caminho = Path(caminho)
+    return caminho.with_name(caminho.name + EXTENSAO_INDICE)
+
+
+def _ler_indice_gravado(caminho: Path, arquivo_indice: Path) -> Optional[dict]:
+    try:
+        with open(arquivo_indice, encoding="utf-8") as f:
+            gravado = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(gravado, dict) or not mesmo_arquivo(impressao_digital(caminho, calcular_hash=False), gravado):
+        return None
+    return gravado
+
+
+def carregar_indice(caminho: Path = TXT_PATH, erros: Optional[List[ErroRegistro]] = None) -> Dict[str, tuple]:
+    """
+    Retorna o índice do arquivo (como criar_indice), lendo-o do arquivo de índice gravado quando a impressão
+    digital do arquivo de vendedores for a mesma. Caso contrário, cria o índice e o grava.
+
+    Args:
+        caminho (Path): Caminho do arquivo de vendedores.
+        erros (Optional[List[ErroRegistro]]): Recebe os registros mal formados encontrados quando o índice foi
+            criado (também gravados no índice).
+
+    Returns:
+        Dict[str, tuple]: Dicionário código -> (offset em bytes, número da linha).
+    """
+    caminho = Path(caminho)
+    arquivo_indice = caminho_indice(caminho)
+    gravado = _ler_indice_gravado(caminho, arquivo_indice)
+    if gravado is not None:
+        if erros is not None:
+            erros.extend(ErroRegistro(*erro) for erro in gravado["erros"])
+        return {codigo: tuple(posicao) for codigo, posicao in gravado["indice"].items()}
+
+    # A impressão digital (com o hash) é obtida ANTES da leitura: se o arquivo mudar durante a criação do
+    # índice, a próxima busca não o reconhecerá e o recriará.
+    digital = impressao_digital(caminho)
+    erros_indice: List[ErroRegistro] = []
+    indice = criar_indice(caminho, erros_indice)
+    if erros is not None:
+        erros.extend(erros_indice)
+
+    # Arquivo temporário + rename, como em cache_csv.criar_sidecar: um leitor nunca encontra um índice pela
+    # metade. Se não for possível gravar (ex: pasta somente leitura), o índice vale apenas para esta execução.
+    gravado = dict(digital, indice=indice, erros=[list(erro) for erro in erros_indice])
+    temporario = arquivo_indice.with_name(arquivo_indice.name + f".{os.getpid()}.tmp")
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(gravado, f, ensure_ascii=False)
+        os.replace(temporario, arquivo_indice)
+    except OSError:
+        pass
+    return indice
+
+
+def buscar_vendedor(caminho: Path, indice: Dict[str, tuple], codigo: str) -> Optional[Vendedor]:
+    """Busca um vendedor pelo código, lendo apenas o registro correspondente no arquivo."""
+    posicao = indice.get(codigo)
+    if posicao is None:
+        return None
+
+    offset, linha = posicao
+    for vendedor in ler_vendedores(caminho, erros=[], offset_inicial=offset, linha_inicial=linha, limite=1):
+        return vendedor
+    return None
+
+
+# =====================================
+# CARGA NO BANCO DE DADOS
+# =====================================
+
+def carregar_vendedores(
+        conn: sqlite3.Connection,
+        vendedores: Iterable[Vendedor],
+        tamanho_lote: int = TAMANHO_LOTE
+    ) -> int:
+    """
+    Insere os vendedores na tabela tb_vendedores em lotes. Um código já existente é substituído.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        vendedores (Iterable[Vendedor]): Os registros (normalmente o generator de ler_vendedores).
+        tamanho_lote (int): Quantidade de registros por executemany()/commit().
+
+    Returns:
+        int: A quantidade de registros inseridos.
+    """
+    execucao = execucao_atual()
+    cur = conn.cursor()
+    cur.execute(CREATE_TB_VENDEDORES)
+
+    comando = "INSERT OR REPLACE INTO tb_vendedores (codigo, vendedor, vendas) VALUES (?, ?, ?)"
+    quantidade = 0
+    lote = []
+    for vendedor in vendedores:
+        lote.append((vendedor.codigo, vendedor.nome, vendedor.vendas))
+        if len(lote) >= tamanho_lote:
+            with execucao.etapa("gravacao_banco"):
+                cur.executemany(comando, lote)
+                conn.commit()
+            quantidade += len(lote)
+            lote.clear()
+
+    with execucao.etapa("gravacao_banco"):
+        if lote:
+            cur.executemany(comando, lote)
+            quantidade += len(lote)
+        conn.commit()
+    execucao.contar("linhas_gravadas", quantidade)
+    return quantidade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leitura e carga do arquivo vendedores.txt")
+    parser.add_argument("arquivo", nargs="?", default=str(TXT_PATH))
+    parser.add_argument("--banco", default=str(DB_PATH), help="Caminho do banco de dados SQLite")
+    parser.add_argument("--buscar", metavar="CODIGO", help="Apenas busca e exibe o vendedor com esse código")
+    args = parser.parse_args()
+
+    caminho = Path(args.arquivo)
+    erros: List[ErroRegistro] = []
+
+    if args.buscar:
+        indice = carregar_indice(caminho, erros)
+        vendedor = buscar_vendedor(caminho, indice, args.buscar)
+        if vendedor is None:
+            print(f"Vendedor com código '{args.buscar}' não encontrado.")
+        else:
+            print(f"{vendedor.codigo} - {vendedor.nome}: R$ {vendedor.vendas:.2f} (linha {vendedor.linha})")
+    else:
+        with iniciar_execucao("vendedores") as execucao, sqlite3.connect(args.banco) as conn:
+            quantidade = carregar_vendedores(conn, ler_vendedores(caminho, erros))
+            execucao.contar("bytes_lidos", caminho.stat().st_size)
+            execucao.contar("registros_com_erro", len(erros))
+        print(f"Vendedores carregados: {quantidade}")
+
+    for erro in erros:
+        print(f"Linha {erro.linha}: {erro.mensagem}")
+    if erros:
+        print(f"Registros com erro: {len(erros)}")
+
+
+if __name__ == "__main__":
+    main()